@@ -1,30 +1,214 @@
 import argparse
+import collections
+import functools
+import itertools
+import json
 import os
 import shutil
 import sys
 import logging 
+import math
+import time
 from logging import getLogger
-from typing import List
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
 
 import concurrent.futures
 import yaml  # type: ignore
 from tqdm import tqdm
 
 from src import (
-    BuildFailedError,
+    BuildStats,
     ComboGenerator,
+    Config,
+    CostEstimator,
     ConfigValidator,
-    DAGBuilderFactory,
-    DAGExporter,
-    PropertySetterBase,
-    PropertySetterFactory,
+    DAGSetGenerator,
+    Instrumentation,
+    Manifest,
+    Shard,
+    ShardMerger,
+    StructureCache,
 )
+from src.generation.manifest import ManifestRecord
 
 logger = getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 logging.disable(logging.DEBUG)
 
-def main(config_path, dest_dir):
+EXECUTORS = {
+    "thread": concurrent.futures.ThreadPoolExecutor,
+    "process": concurrent.futures.ProcessPoolExecutor,
+}
+
+
+Task = List[Tuple[str, Config, Sequence[int]]]
+
+
+def generate_dags(
+    task: Task,
+    stage_workers: Optional[Sequence[int]] = None,
+    queue_size: int = 1,
+    instrument: bool = False,
+    min_success_rate: Optional[float] = None,
+) -> Tuple[List[ManifestRecord], Dict[str, dict], Dict[str, dict]]:
+    """Generate a chunk of the DAG sets of combinations sharing a structure index.
+
+    Each structure is built once and shared among the combinations of the task.
+    This function is defined at module level so that it can be sent to worker processes.
+
+    Parameters
+    ----------
+    task : Task
+        [(combo_dest_dir, combo_config, dag_indices)] yielded by get_task_iter.
+    stage_workers : Optional[Sequence[int]], optional
+        Number of worker threads for building, property setting and exporting,
+        by default None (i.e., the stages are not pipelined).
+    queue_size : int, optional
+        Maximum number of DAGs waiting in front of each pipeline stage, by default 1.
+    instrument : bool, optional
+        Whether to record the instrumentation of each combination, by default False.
+    min_success_rate : Optional[float], optional
+        Minimum probability that a DAG can be built,
+        below which the remaining DAGs of a combination are skipped,
+        by default None (i.e., every DAG is tried).
+
+    Returns
+    -------
+    Tuple[List[ManifestRecord], Dict[str, dict], Dict[str, dict]]
+        Manifest records of the DAGs in the chunk,
+        instrumentation summary and build statistics of each combination directory.
+
+    """
+    structure_cache = StructureCache(
+        collections.Counter(i for _, _, dag_indices in task for i in dag_indices)
+    )
+    records: List[ManifestRecord] = []
+    summaries: Dict[str, dict] = {}
+    build_summaries: Dict[str, dict] = {}
+    for combo_dest_dir, config, dag_indices in task:
+        instrumentation = Instrumentation() if instrument else None
+        dag_set_generator = DAGSetGenerator(
+            config, stage_workers, queue_size, structure_cache, instrumentation, min_success_rate
+        )
+        exported = dag_set_generator.export(combo_dest_dir, dag_indices)
+        records += Manifest.create_records(combo_dest_dir, exported)
+        if instrumentation:
+            summaries[combo_dest_dir] = instrumentation.to_dict()
+        build_summaries[combo_dest_dir] = dag_set_generator.build_stats.to_dict()
+
+    return records, summaries, build_summaries
+
+
+def get_task_iter(
+    combo_iter: Iterator[Tuple[str, dict, Config]],
+    dest_dir: str,
+    dag_chunk_size: int,
+    shard: Optional[Shard] = None,
+    manifest: Optional[Manifest] = None,
+) -> Iterator[Task]:
+    """Get iterator of tasks.
+
+    The combination directory and its log are created before the tasks are yielded.
+    Combinations that differ only in 'Properties' parameters share the structures of their DAGs,
+    so they are grouped into the same tasks,
+    and the DAG indices of each group are split into chunks of about dag_chunk_size DAGs.
+    Since each DAG index has its own random number stream,
+    the chunks can be generated in any worker and in any order.
+
+    Parameters
+    ----------
+    combo_iter : Iterator[Tuple[str, dict, Config]]
+        Iterator yielded by ComboGenerator.get_combo_iter.
+    dest_dir : str
+        Destination directory.
+    dag_chunk_size : int
+        Approximate maximum number of DAGs in a task.
+        The DAGs with the same index are never split into different tasks.
+    shard : Optional[Shard], optional
+        Shard to be generated, by default all DAGs.
+    manifest : Optional[Manifest], optional
+        Manifest of a previous generation.
+        DAGs finished in the previous generation are skipped.
+
+    Yields
+    ------
+    Iterator[Task]
+        [(combo_dest_dir, combo_config, dag_indices)]
+
+    """
+    for _, group in itertools.groupby(combo_iter, key=lambda combo: combo[2].structure_index):
+        combos: List[Tuple[str, Config, Set[int]]] = []
+        for dir_name, log, config in group:
+            combo_dest_dir = f"{dest_dir}/{dir_name}"
+            os.makedirs(combo_dest_dir, exist_ok=True)
+            with open(f"{combo_dest_dir}/combination_log.yaml", "w") as f:
+                yaml.dump(log, f)
+
+            if shard:
+                dag_indices = shard.get_dag_indices(
+                    config.combination_index, config.number_of_dags
+                )
+            else:
+                dag_indices = range(config.number_of_dags)
+            if manifest:
+                dag_indices = [i for i in dag_indices if not manifest.is_finished(dir_name, i)]
+            combos.append((combo_dest_dir, config, set(dag_indices)))
+
+        def create_task(task_dag_indices: List[int]) -> Task:
+            return [
+                (combo_dest_dir, config, [i for i in task_dag_indices if i in dag_index_set])
+                for combo_dest_dir, config, dag_index_set in combos
+                if not dag_index_set.isdisjoint(task_dag_indices)
+            ]
+
+        task_dag_indices: List[int] = []
+        num_task_dags = 0
+        for i in sorted(set().union(*(dag_index_set for _, _, dag_index_set in combos))):
+            task_dag_indices.append(i)
+            num_task_dags += sum(i in dag_index_set for _, _, dag_index_set in combos)
+            if num_task_dags >= dag_chunk_size:
+                yield create_task(task_dag_indices)
+                task_dag_indices = []
+                num_task_dags = 0
+        if task_dag_indices:
+            yield create_task(task_dag_indices)
+
+
+def get_default_dag_chunk_size(num_dags: int, max_workers: int) -> int:
+    """Get the maximum number of DAGs in a task.
+
+    All DAGs of all combinations are split into about four tasks per worker,
+    so that even a single combination with many DAGs uses all workers.
+
+    """
+    return max(1, math.ceil(num_dags / (max_workers * 4)))
+
+
+def get_default_chunksize(num_tasks: int, max_workers: int) -> int:
+    """Get the number of tasks sent to a worker at once.
+
+    Each worker receives about four chunks,
+    which keeps the IPC overhead small while balancing the load.
+
+    """
+    return max(1, math.ceil(num_tasks / (max_workers * 4)))
+
+
+def main(
+    config_path,
+    dest_dir,
+    executor="thread",
+    max_workers=None,
+    chunksize=None,
+    dag_chunk_size=None,
+    shard=None,
+    resume=False,
+    stage_workers=None,
+    queue_size=1,
+    instrument=False,
+    min_success_rate=None,
+):
+    start_time = time.perf_counter()
     with open(config_path) as f:
         config_raw = yaml.safe_load(f)
 
@@ -35,66 +219,131 @@ def main(config_path, dest_dir):
     combo_gen = ComboGenerator(config_raw)
     combo_iter = combo_gen.get_combo_iter()
     num_combo = combo_gen.get_num_combos()
+    num_dags = max(1, num_combo) * config_raw["Number of DAGs"]
+    if shard:
+        num_dags = len(range(shard.index, num_dags, shard.count))
 
-    def really_do(iterable):
-        dir_name, log, config = iterable
-
-        combo_dest_dir = f"{dest_dir}/{dir_name}"
-        os.mkdir(combo_dest_dir)
-        with open(f"{combo_dest_dir}/combination_log.yaml", "w") as f:
-            yaml.dump(log, f)
-
-        dag_builder = DAGBuilderFactory().create_instance(config)
-        dag_iter = dag_builder.build()
-
-        # ---- Create all setters ----
-        all_setter: List[PropertySetterBase] = []
-        # Create setters for utilization, period, execution time and communication time.
-        if config.multi_rate:
-            all_setter.append(PropertySetterFactory.create_utilization_setter(config))
-        elif config.execution_time:
-            all_setter.append(
-                PropertySetterFactory.create_random_setter(config, "Execution time", "node")
+    max_workers = max_workers or os.cpu_count()
+    if dag_chunk_size is None:
+        dag_chunk_size = get_default_dag_chunk_size(num_dags, max_workers)
+
+    # Skip DAGs finished in the previous generation.
+    manifest = Manifest(dest_dir, shard)
+    if resume:
+        manifest.load()
+    tasks = list(
+        get_task_iter(combo_iter, dest_dir, dag_chunk_size, shard, manifest if resume else None)
+    )
+    num_remaining = sum(len(dag_indices) for task in tasks for _, _, dag_indices in task)
+    if chunksize is None:
+        chunksize = get_default_chunksize(len(tasks), max_workers)
+
+    # Loop for each chunk of DAGs.
+    run_instrumentation = Instrumentation()
+    combo_instrumentations: Dict[str, Instrumentation] = collections.defaultdict(Instrumentation)
+    combo_build_stats: Dict[str, BuildStats] = {}
+    with EXECUTORS[executor](max_workers=max_workers) as pool:
+        with tqdm(
+            total=num_dags, initial=num_dags - num_remaining, desc="Generated DAGs"
+        ) as progress_bar:
+            for records, summaries, build_summaries in pool.map(
+                functools.partial(
+                    generate_dags,
+                    stage_workers=stage_workers,
+                    queue_size=queue_size,
+                    instrument=instrument,
+                    min_success_rate=min_success_rate,
+                ),
+                tasks,
+                chunksize=chunksize,
+            ):
+                manifest.add(records)
+                progress_bar.update(len(records))
+                for combo_dest_dir, summary in summaries.items():
+                    combo_instrumentations[combo_dest_dir].merge(summary)
+                    run_instrumentation.merge(summary)
+                for combo_dest_dir, build_summary in build_summaries.items():
+                    combo_build_stats.setdefault(combo_dest_dir, BuildStats(0)).merge(build_summary)
+
+    # Report combinations with failed DAGs.
+    for combo_dest_dir, build_stats in sorted(combo_build_stats.items()):
+        if build_stats.num_failures or build_stats.num_skipped:
+            expected = build_stats.expected_builds_per_success
+            logger.warning(
+                f"{os.path.basename(combo_dest_dir)}: "
+                f"{build_stats.num_failures} of {build_stats.num_dags} DAGs failed to build"
+                + (f" and {build_stats.num_skipped} were skipped" if build_stats.num_skipped else "")
+                + ". Expected builds per success: "
+                + (f"{expected:.1f}." if expected else "infinite.")
             )
-        # HACK: RD-Gen assumes that 'Multi-rate' and 'CCR' are never specified at the same time.
-        #       If 'Multi-rate' and 'CCR' are specified at the same time,
-        #       the utilization rate is not protected.
-        if config.ccr:
-            all_setter.append(PropertySetterFactory.create_ccr_setter(config))
-        elif config.communication_time:
-            all_setter.append(
-                PropertySetterFactory.create_random_setter(config, "Communication time", "edge")
+
+    # Write instrumentation summaries.
+    if instrument:
+        for combo_dest_dir, instrumentation in combo_instrumentations.items():
+            with open(f"{combo_dest_dir}/instrumentation.json", "w") as f:
+                json.dump(
+                    {
+                        **instrumentation.to_dict(),
+                        "build": combo_build_stats[combo_dest_dir].to_dict(),
+                    },
+                    f,
+                    indent=2,
+                )
+        with open(f"{dest_dir}/instrumentation.json", "w") as f:
+            json.dump(
+                {
+                    "run": {
+                        "wall_time": time.perf_counter() - start_time,
+                        "executor": executor,
+                        "max_workers": max_workers,
+                        "stage_workers": stage_workers,
+                        "number_of_tasks": len(tasks),
+                        "number_of_dags": num_remaining,
+                    },
+                    **run_instrumentation.to_dict(),
+                },
+                f,
+                indent=2,
             )
-        # Create setter for end-to-end deadline.
-        if config.end_to_end_deadline:
-            all_setter.append(PropertySetterFactory.create_deadline_setter(config))
-        # Create setter for offset.
-        if config.offset:
-            all_setter.append(PropertySetterFactory.create_random_setter(config, "Offset", "node"))
-        # Create setter for additional properties.
-        if config.additional_properties:
-            all_setter.append(PropertySetterFactory.create_additional_setter(config))
 
-        dag_exporter = DAGExporter(config)
-        # Loop for each dag.
-        for i, dag in enumerate(dag_iter):
-            try:
-                # Set all properties.
-                for setter in all_setter:
-                    setter.set(dag)
-                # Export DAG.
 
-                dag_exporter.export(dag, combo_dest_dir, f"dag_{i}")
-            except BuildFailedError as e:
-                logger.warning(e.message)
+def verify(config_path: str, dest_dir: str, shard_dirs: Optional[List[str]] = None) -> bool:
+    """Verify that every expected DAG exists exactly once in dest_dir.
 
+    If shard_dirs is specified, the outputs of the shards are merged into dest_dir beforehand.
 
-    # Loop for each combination.
-    with concurrent.futures.ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
-        results = list(tqdm(executor.map(really_do, combo_iter), total=num_combo, desc="Generated combinations"))
+    """
+    with open(config_path) as f:
+        config_raw = yaml.safe_load(f)
+    ConfigValidator(config_raw).validate()
+
+    shard_merger = ShardMerger(config_raw)
+    if shard_dirs:
+        shard_merger.merge(shard_dirs, dest_dir)
+    errors = shard_merger.verify(dest_dir)
+    for error in errors:
+        logger.error(error)
+
+    return not errors
+
+
+def dry_run(config_path: str, num_samples: int = 3, max_workers: Optional[int] = None) -> dict:
+    """Estimate the cost of the generation without generating it.
+
+    The estimate is printed in YAML and pathological settings are logged as warnings.
+
+    """
+    with open(config_path) as f:
+        config_raw = yaml.safe_load(f)
+    ConfigValidator(config_raw).validate()
 
+    estimate = CostEstimator(config_raw, num_samples).estimate(max_workers or os.cpu_count())
+    print(yaml.dump(estimate, sort_keys=False))
+    for warning in estimate["warnings"]:
+        logger.warning(warning)
+
+    return estimate
 
-        
 
 def option_parser():
     arg_parser = argparse.ArgumentParser()
@@ -109,13 +358,113 @@ def option_parser():
         type=str,
         help="path to destination directory.",
     )
+    arg_parser.add_argument(
+        "-e",
+        "--executor",
+        required=False,
+        default="thread",
+        choices=list(EXECUTORS.keys()),
+        help="executor used to generate combinations in parallel.",
+    )
+    arg_parser.add_argument(
+        "-w",
+        "--max_workers",
+        required=False,
+        default=None,
+        type=int,
+        help="maximum number of workers, by default the number of CPUs.",
+    )
+    arg_parser.add_argument(
+        "--chunksize",
+        required=False,
+        default=None,
+        type=int,
+        help="number of tasks sent to a worker process at once.",
+    )
+    arg_parser.add_argument(
+        "--dag_chunk_size",
+        required=False,
+        default=None,
+        type=int,
+        help="approximate maximum number of DAGs generated in a task.",
+    )
+    arg_parser.add_argument(
+        "--shard",
+        required=False,
+        default=None,
+        type=Shard.parse,
+        help="generate only the K-th of N disjoint slices of the DAGs ('K/N', 0 <= K < N).",
+    )
+    arg_parser.add_argument(
+        "--merge",
+        required=False,
+        default=None,
+        nargs="+",
+        metavar="SHARD_DIR",
+        help="merge the outputs of shards into dest_dir instead of generating.",
+    )
+    arg_parser.add_argument(
+        "--verify",
+        required=False,
+        action="store_true",
+        help="verify that every expected DAG exists exactly once in dest_dir.",
+    )
+    arg_parser.add_argument(
+        "--resume",
+        required=False,
+        action="store_true",
+        help="resume an interrupted generation in dest_dir, skipping finished DAGs.",
+    )
+    arg_parser.add_argument(
+        "--stage_workers",
+        required=False,
+        default=None,
+        nargs=3,
+        type=int,
+        metavar=("BUILD", "SET", "EXPORT"),
+        help="pipeline building, property setting and exporting with these numbers of threads.",
+    )
+    arg_parser.add_argument(
+        "--queue_size",
+        required=False,
+        default=1,
+        type=int,
+        help="maximum number of DAGs waiting in front of each pipeline stage.",
+    )
+    arg_parser.add_argument(
+        "--instrument",
+        required=False,
+        action="store_true",
+        help="write time and counters of each stage to instrumentation.json.",
+    )
+    arg_parser.add_argument(
+        "--dry_run",
+        required=False,
+        action="store_true",
+        help="estimate nodes, edges, time, disk and memory from sample DAGs without generating.",
+    )
+    arg_parser.add_argument(
+        "--samples",
+        required=False,
+        default=3,
+        type=int,
+        help="number of sample DAGs per combination used by --dry_run.",
+    )
+    arg_parser.add_argument(
+        "--min_success_rate",
+        required=False,
+        type=float,
+        help="skip the remaining DAGs of a combination "
+        "once the probability that a DAG can be built is estimated below this rate.",
+    )
     args = arg_parser.parse_args()
 
-    return args.config_path, args.dest_dir
+    return args
 
 
 if __name__ == "__main__":
-    config_path, dest_dir = option_parser()
+    args = option_parser()
+    config_path, dest_dir = args.config_path, args.dest_dir
 
     # Check whether config_path exists.
     if not os.path.isfile(config_path):
@@ -123,8 +472,25 @@ if __name__ == "__main__":
         logger.error(f"{config_path} not found.")
         sys.exit(1)
 
+    # Estimate the cost.
+    if args.dry_run:
+        dry_run(config_path, args.samples, args.max_workers)
+        sys.exit(0)
+
+    # Merge and verify the outputs.
+    if args.merge or args.verify:
+        if args.merge:
+            os.makedirs(dest_dir, exist_ok=True)
+        if not verify(config_path, dest_dir, args.merge):
+            sys.exit(1)
+        logger.info("Verification successfully completed.")
+        sys.exit(0)
+
     # Check whether dest_dir already exists.
-    if os.path.isdir(dest_dir):
+    if args.shard or args.resume:
+        # Shards share dest_dir, and a resumed generation reuses it.
+        os.makedirs(dest_dir, exist_ok=True)
+    elif os.path.isdir(dest_dir):
         logger.warning(
             "The following directory is already existing. Do you overwrite? "
             f"DIRECTORY: {dest_dir}"
@@ -150,5 +516,18 @@ if __name__ == "__main__":
         os.mkdir(dest_dir)
 
     # Start generation.
-    main(config_path, dest_dir)
+    main(
+        config_path,
+        dest_dir,
+        args.executor,
+        args.max_workers,
+        args.chunksize,
+        args.dag_chunk_size,
+        args.shard,
+        args.resume,
+        args.stage_workers,
+        args.queue_size,
+        args.instrument,
+        args.min_success_rate,
+    )
     logger.info("Generation successfully completed.")
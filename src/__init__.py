@@ -1,10 +1,21 @@
 from logging import DEBUG, Formatter, StreamHandler, getLogger
 
 from .branching_validator import BranchingValidator, BranchingConstraintError
+from .common import Instrumentation
 from .config import ComboGenerator, Config, ConfigValidator
 from .dag_builder import DAGBuilderFactory
 from .dag_exporter import DAGExporter
 from .exceptions import BuildFailedError
+from .generation import (
+    BuildStats,
+    CostEstimator,
+    DAGSetGenerator,
+    Manifest,
+    Shard,
+    ShardMerger,
+    StructureCache,
+    generate,
+)
 from .property_setter import PropertySetterBase, PropertySetterFactory
 
 __all__ = [
@@ -15,9 +26,18 @@ __all__ = [
     "PropertySetterBase",
     "PropertySetterFactory",
     "DAGExporter",
+    "BuildStats",
+    "CostEstimator",
+    "DAGSetGenerator",
+    "Manifest",
+    "Shard",
+    "ShardMerger",
+    "StructureCache",
+    "generate",
     "BuildFailedError",
     "BranchingValidator",
     "BranchingConstraintError",
+    "Instrumentation",
 ]
 
 
@@ -1,4 +1,4 @@
-from typing import Dict, List, Set
+from typing import Dict, Iterable, List, Tuple
 
 import networkx as nx
 
@@ -26,13 +26,42 @@ class BranchingValidator:
 
     @staticmethod
     def assert_valid(dag: nx.DiGraph, firing: str) -> None:
-        BranchingValidator._check_melani_def_iii_1(dag)
-        if firing == "probabilistic":
-            BranchingValidator._check_zhao_p_dag(dag)
+        """Check all units in O(n + m) for DAGs built by node replacement.
+
+        The units are checked innermost first, labeling the branch bodies with
+        per-node (unit, branch) tags, so a shared vertex is detected on first conflict.
+        A checked unit whose bodies can only be entered from its v_ent and left
+        to its v_ext is "sealed": the traversals of enclosing units step over it
+        from v_ent to v_ext, so every vertex is traversed about once.
+        """
+        units = BranchingValidator._collect_units(dag)
+        if not units:
+            return
+        topo_k = {n: k for k, n in enumerate(nx.topological_sort(dag))}
+        tags: Dict[int, Tuple[int, int]] = {}
+        sealed: Dict[int, int] = {}
+        sealed_vexts: Dict[int, int] = {}
+        for uid, (vent, vext) in sorted(units.items(), key=lambda u: -topo_k[u[1][0]]):
+            if BranchingValidator._check_unit(dag, uid, vent, vext, firing,
+                                              tags, sealed, sealed_vexts):
+                sealed[vent] = vext
+                sealed_vexts[vext] = uid
 
     @staticmethod
-    def _collect_units(dag: nx.DiGraph) -> Dict[int, Dict[str, List[int]]]:
-        units: Dict[int, Dict[str, List[int]]] = {}
+    def assert_valid_unit(dag: nx.DiGraph, vent: int, vext: int, firing: str) -> None:
+        """Check a single unit, e.g. right after it has been inserted.
+
+        The unit must not share vertices with other units' branch bodies other than
+        through nesting, which holds for units inserted by node replacement,
+        so only the unit itself is checked.
+        """
+        uid = dag.nodes[vent].get("branch_unit_id")
+        BranchingValidator._check_unit(dag, uid, vent, vext, firing, {}, {}, {})
+
+    @staticmethod
+    def _collect_units(dag: nx.DiGraph) -> Dict[int, Tuple[int, int]]:
+        """Collect (v_ent, v_ext) of every unit in one node scan."""
+        members: Dict[int, Dict[str, List[int]]] = {}
         for n, attr in dag.nodes(data=True):
             t = attr.get("node_type", "regular")
             if t not in ("v_ent", "v_ext"):
@@ -42,79 +71,100 @@ class BranchingValidator:
                 raise BranchingConstraintError(
                     f"node {n} of type {t} has no branch_unit_id"
                 )
-            units.setdefault(uid, {"v_ent": [], "v_ext": []})[t].append(n)
-        return units
+            members.setdefault(uid, {"v_ent": [], "v_ext": []})[t].append(n)
 
-    @staticmethod
-    def _check_melani_def_iii_1(dag: nx.DiGraph) -> None:
-        units = BranchingValidator._collect_units(dag)
-        for uid, members in units.items():
-            srcs, snks = members["v_ent"], members["v_ext"]
+        units: Dict[int, Tuple[int, int]] = {}
+        for uid, unit_members in members.items():
+            srcs, snks = unit_members["v_ent"], unit_members["v_ext"]
             if len(srcs) != 1 or len(snks) != 1:
                 raise BranchingConstraintError(
                     f"unit {uid} must have exactly one v_ent and one v_ext; "
                     f"got v_ent={srcs}, v_ext={snks}"
                 )
-            vent, vext = srcs[0], snks[0]
-            out_edges = list(dag.out_edges(vent, data=True))
-            raw_ids = [d.get("branch_id") for _, _, d in out_edges]
-            if any(bid is None for bid in raw_ids):
-                raise BranchingConstraintError(
-                    f"unit {uid}: one or more v_ent out-edges missing branch_id"
-                )
-            branch_ids = sorted(raw_ids)
-            if branch_ids != list(range(len(out_edges))):
-                raise BranchingConstraintError(
-                    f"unit {uid}: branch_id on v_ent out-edges must be "
-                    f"{{0, ..., k-1}}; got {branch_ids}"
-                )
-
-            bodies: List[Set[int]] = []
-            for _, succ, _ in out_edges:
-                body = BranchingValidator._branch_body(dag, succ, vext)
-                bodies.append(body)
-            for i in range(len(bodies)):
-                for j in range(i + 1, len(bodies)):
-                    overlap = bodies[i] & bodies[j]
-                    if overlap:
-                        raise BranchingConstraintError(
-                            f"unit {uid}: branches {i} and {j} share vertices {overlap}"
-                        )
+            units[uid] = (srcs[0], snks[0])
+        return units
 
     @staticmethod
-    def _branch_body(dag: nx.DiGraph, start: int, vext: int) -> Set[int]:
-        """All vertices reachable from `start` without traversing `vext`."""
-        if start == vext:
-            return set()
-        body: Set[int] = {start}
-        stack = [start]
-        while stack:
-            u = stack.pop()
-            for v in dag.successors(u):
-                if v == vext or v in body:
+    def _check_unit(dag: nx.DiGraph, uid: int, vent: int, vext: int, firing: str,
+                    tags: Dict[int, Tuple[int, int]],
+                    sealed: Dict[int, int], sealed_vexts: Dict[int, int]) -> bool:
+        """Check one unit and label its branch bodies in `tags`.
+
+        `sealed` maps the v_ent of each sealed unit to its v_ext,
+        and `sealed_vexts` maps the v_ext of each sealed unit to its unit id.
+        Returns whether this unit is sealed.
+        """
+        out_edges = list(dag.out_edges(vent, data=True))
+        raw_ids = [d.get("branch_id") for _, _, d in out_edges]
+        if any(bid is None for bid in raw_ids):
+            raise BranchingConstraintError(
+                f"unit {uid}: one or more v_ent out-edges missing branch_id"
+            )
+        branch_ids = sorted(raw_ids)
+        if branch_ids != list(range(len(out_edges))):
+            raise BranchingConstraintError(
+                f"unit {uid}: branch_id on v_ent out-edges must be "
+                f"{{0, ..., k-1}}; got {branch_ids}"
+            )
+        if firing == "probabilistic":
+            BranchingValidator._check_firing_probs(uid, vent, out_edges)
+
+        # Label the bodies B_j(u): all vertices reachable from the head of branch j
+        # without traversing v_ext, stepping over sealed units.
+        body: List[int] = []
+        for _, head, d in out_edges:
+            if head == vext:
+                continue
+            tag = (uid, d["branch_id"])
+            stack = [head]
+            BranchingValidator._tag(tags, head, tag)
+            while stack:
+                u = stack.pop()
+                body.append(u)
+                succs = (sealed[u],) if u in sealed else dag.successors(u)
+                for w in succs:
+                    if w == vext or tags.get(w) == tag:
+                        continue
+                    BranchingValidator._tag(tags, w, tag)
+                    stack.append(w)
+
+        # The unit is sealed if its body is entered only from v_ent.
+        # The v_ext of a stepped-over unit is entered from that unit's body.
+        for u in body:
+            for p in dag.predecessors(u):
+                if p == vent or tags.get(p) == tags[u]:
                     continue
-                body.add(v)
-                stack.append(v)
-        return body
+                if u in sealed_vexts and tags.get(p, (None,))[0] == sealed_vexts[u]:
+                    continue
+                return False
+        return True
 
     @staticmethod
-    def _check_zhao_p_dag(dag: nx.DiGraph) -> None:
-        units = BranchingValidator._collect_units(dag)
-        for uid in units.keys():
-            vent = units[uid]["v_ent"][0]
-            total = 0.0
-            for _, _, d in dag.out_edges(vent, data=True):
-                p = d.get("firing_prob")
-                if p is None:
-                    raise BranchingConstraintError(
-                        f"unit {uid}: out-edge of v_ent {vent} missing firing_prob"
-                    )
-                if not (0.0 <= p <= 1.0):
-                    raise BranchingConstraintError(
-                        f"unit {uid}: firing_prob {p} out of [0, 1]"
-                    )
-                total += p
-            if abs(total - 1.0) > BranchingValidator._TOLERANCE:
+    def _tag(tags: Dict[int, Tuple[int, int]], n: int, tag: Tuple[int, int]) -> None:
+        """Tag n with (unit id, branch id), raising if another branch of the unit has it."""
+        old = tags.get(n)
+        if old is not None and old[0] == tag[0] and old != tag:
+            raise BranchingConstraintError(
+                f"unit {tag[0]}: branches {old[1]} and {tag[1]} share vertex {n}"
+            )
+        tags[n] = tag
+
+    @staticmethod
+    def _check_firing_probs(uid: int, vent: int,
+                            out_edges: Iterable[Tuple[int, int, dict]]) -> None:
+        total = 0.0
+        for _, _, d in out_edges:
+            p = d.get("firing_prob")
+            if p is None:
+                raise BranchingConstraintError(
+                    f"unit {uid}: out-edge of v_ent {vent} missing firing_prob"
+                )
+            if not (0.0 <= p <= 1.0):
                 raise BranchingConstraintError(
-                    f"unit {uid}: sum of firing_prob = {total}, expected 1"
+                    f"unit {uid}: firing_prob {p} out of [0, 1]"
                 )
+            total += p
+        if abs(total - 1.0) > BranchingValidator._TOLERANCE:
+            raise BranchingConstraintError(
+                f"unit {uid}: sum of firing_prob = {total}, expected 1"
+            )
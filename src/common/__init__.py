@@ -1,3 +1,4 @@
+from .instrumentation import NULL_INSTRUMENTATION, Instrumentation
 from .util import Util
 
-__all__ = ["Util"]
+__all__ = ["Util", "Instrumentation", "NULL_INSTRUMENTATION"]
@@ -0,0 +1,125 @@
+import contextlib
+import threading
+import time
+from typing import Dict, Iterator, List
+
+
+class Instrumentation:
+    """Instrumentation class.
+
+    Record wall time, CPU time and number of calls of each measured section,
+    grouped by category (e.g., 'stages', 'builders', 'setters', 'formats'),
+    and counters such as the number of retries of builders.
+    Since the sections run in pipeline threads, the records are protected by a lock.
+
+    Notes
+    -----
+    Classes that can be instrumented hold NULL_INSTRUMENTATION by default,
+    which records nothing and has almost no overhead.
+
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._timers: Dict[str, Dict[str, List[float]]] = {}
+        self._counters: Dict[str, int] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return True
+
+    @contextlib.contextmanager
+    def measure(self, category: str, name: str) -> Iterator[None]:
+        """Measure the section in the with statement.
+
+        Parameters
+        ----------
+        category : str
+            Category of the section.
+        name : str
+            Name of the section in the category.
+
+        """
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            yield
+        finally:
+            wall_time = time.perf_counter() - wall_start
+            cpu_time = time.thread_time() - cpu_start
+            with self._lock:
+                timer = self._timers.setdefault(category, {}).setdefault(name, [0, 0.0, 0.0])
+                timer[0] += 1
+                timer[1] += wall_time
+                timer[2] += cpu_time
+
+    def count(self, name: str, n: int = 1) -> None:
+        """Add n to the counter.
+
+        Parameters
+        ----------
+        name : str
+            Name of the counter.
+        n : int, optional
+            Value to be added, by default 1.
+
+        """
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    def merge(self, summary: dict) -> None:
+        """Add a summary created by to_dict().
+
+        Parameters
+        ----------
+        summary : dict
+            Summary of another instrumentation (e.g., of a worker process).
+
+        """
+        with self._lock:
+            for category, timers in summary.get("timers", {}).items():
+                for name, record in timers.items():
+                    timer = self._timers.setdefault(category, {}).setdefault(name, [0, 0.0, 0.0])
+                    timer[0] += record["calls"]
+                    timer[1] += record["wall_time"]
+                    timer[2] += record["cpu_time"]
+            for name, n in summary.get("counters", {}).items():
+                self._counters[name] = self._counters.get(name, 0) + n
+
+    def to_dict(self) -> dict:
+        """Get the machine-readable summary.
+
+        Returns
+        -------
+        dict
+            {'timers': {category: {name: {'calls', 'wall_time', 'cpu_time'}}},
+            'counters': {name: value}}
+
+        """
+        with self._lock:
+            return {
+                "timers": {
+                    category: {
+                        name: {"calls": calls, "wall_time": wall_time, "cpu_time": cpu_time}
+                        for name, (calls, wall_time, cpu_time) in sorted(timers.items())
+                    }
+                    for category, timers in sorted(self._timers.items())
+                },
+                "counters": dict(sorted(self._counters.items())),
+            }
+
+
+class _NullInstrumentation(Instrumentation):
+    @property
+    def enabled(self) -> bool:
+        return False
+
+    @contextlib.contextmanager
+    def measure(self, category: str, name: str) -> Iterator[None]:
+        yield
+
+    def count(self, name: str, n: int = 1) -> None:
+        pass
+
+
+NULL_INSTRUMENTATION: Instrumentation = _NullInstrumentation()
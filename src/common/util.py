@@ -1,13 +1,22 @@
+import functools
 import random
 import sys
-from typing import Any, Collection, List, Optional, Union
+from typing import Any, Collection, List, Optional, Tuple, Union
 
 import networkx as nx
+import numpy as np
 
 
 class Util:
     """Utilization class."""
 
+    # Generator used when no generator is passed. Config.set_random_seed() seeds it.
+    DEFAULT_RNG = random.Random()
+
+    # Maximum number of pairs of the upper triangle kept in the cache per number of nodes
+    # (8 MiB as int32 arrays, about 1,450 nodes).
+    MAX_CACHED_PAIRS = 2**20
+
     @staticmethod
     def ambiguous_equals(s: str, comparison: str) -> bool:
         return s.lower().replace(" ", "") == comparison.lower().replace(" ", "")
@@ -17,15 +26,52 @@ class Util:
         return param_name.lower().replace(" ", "_").replace("-", "_")
 
     @staticmethod
-    def random_choice(target: Union[Any, list]):
+    def create_rng(seed: int, *keys: int) -> random.Random:
+        """Create random number generator of an independent stream.
+
+        The stream is derived from 'seed' and 'keys' via numpy.random.SeedSequence,
+        so the generated values depend only on them and not on the execution order.
+
+        Parameters
+        ----------
+        seed : int
+            Seed.
+            A negative seed gives the stream of its absolute value with an extra key.
+        *keys : int
+            Keys identifying the stream (e.g., index of combination and index of DAG).
+
+        Returns
+        -------
+        random.Random
+            Random number generator.
+
+        """
+        # SeedSequence only accepts non-negative entropy.
+        if seed < 0:
+            seed, keys = -seed, (*keys, 1)
+        seed_seq = np.random.SeedSequence(seed, spawn_key=keys)
+        return random.Random(int.from_bytes(seed_seq.generate_state(4).tobytes(), "little"))
+
+    @staticmethod
+    def create_numpy_rng(rng: Optional[random.Random] = None) -> np.random.Generator:
+        """Create NumPy random number generator seeded from 'rng'."""
+        return np.random.default_rng(Util.get_rng(rng).getrandbits(128))
+
+    @staticmethod
+    def get_rng(rng: Optional[random.Random] = None) -> random.Random:
+        """Get 'rng', or 'DEFAULT_RNG' if 'rng' is None."""
+        return rng if rng is not None else Util.DEFAULT_RNG
+
+    @staticmethod
+    def random_choice(target: Union[Any, list], rng: Optional[random.Random] = None):
         if isinstance(target, list):
-            return random.choice(target)
+            return Util.get_rng(rng).choice(target)
         else:
             return target
 
     @staticmethod
-    def true_or_false() -> bool:
-        if random.choice([0, 1]) == 1:
+    def true_or_false(rng: Optional[random.Random] = None) -> bool:
+        if Util.get_rng(rng).choice([0, 1]) == 1:
             return True
         else:
             return False
@@ -86,3 +132,30 @@ class Util:
                 break
 
         return min_out_node_i
+
+    @staticmethod
+    def get_upper_triangle(num_nodes: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Get (i, j) of all pairs i < j of 'num_nodes' nodes in row-major order.
+
+        The arrays are read-only.
+        Triangles of up to 'MAX_CACHED_PAIRS' pairs are computed once per number of nodes,
+        and larger triangles on each call, so the cache holds at most 32 MiB.
+
+        """
+        if num_nodes * (num_nodes - 1) // 2 <= Util.MAX_CACHED_PAIRS:
+            return Util._get_cached_upper_triangle(num_nodes)
+        return Util._compute_upper_triangle(num_nodes)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=4)
+    def _get_cached_upper_triangle(num_nodes: int) -> Tuple[np.ndarray, np.ndarray]:
+        return Util._compute_upper_triangle(num_nodes)
+
+    @staticmethod
+    def _compute_upper_triangle(num_nodes: int) -> Tuple[np.ndarray, np.ndarray]:
+        dtype = np.int32 if num_nodes <= np.iinfo(np.int32).max else np.int64
+        src, dst = (indices.astype(dtype) for indices in np.triu_indices(num_nodes, k=1))
+        src.flags.writeable = False
+        dst.flags.writeable = False
+
+        return src, dst
@@ -17,6 +17,7 @@ class ComboGenerator:
         self._combo_params: List[str] = []
         self._combo_values: List[Union[List[int], List[float]]] = []
         self._search_combo_and_format_tuple(config_raw["Graph structure"])
+        self._num_structure_params = len(self._combo_params)
         self._search_combo_and_format_tuple(config_raw["Properties"])
         self._config = Config(config_raw)
 
@@ -30,8 +31,6 @@ class ComboGenerator:
         """
         if not self._combo_values:
             return 0
-        if len(self._combo_values) == 1:
-            return 1
 
         num_combos = len(self._combo_values[0])
         for v in self._combo_values[1:]:
@@ -39,6 +38,21 @@ class ComboGenerator:
 
         return num_combos
 
+    def get_num_structures(self) -> int:
+        """Get number of combinations of 'Graph structure' parameters.
+
+        Returns
+        -------
+        int
+            Number of distinct graph structure settings among the combinations.
+
+        """
+        num_structures = 1
+        for v in self._combo_values[: self._num_structure_params]:
+            num_structures *= len(v)
+
+        return num_structures
+
     def get_combo_iter(self) -> Generator[Tuple[str, dict, Config], None, None]:
         """Get iterator for combinations.
 
@@ -54,8 +68,16 @@ class ComboGenerator:
             - combo_config:
                 Configuration in which the chosen value is stored
                 for the parameter specified as 'Combination'.
+                Its 'combination_index' keys the random number generators of the combination,
+                and its 'structure_index' keys those of the graph structures.
+                Since 'Graph structure' parameters vary slowest,
+                combinations sharing a structure index are consecutive.
 
         """
+        num_property_combos = 1
+        for v in self._combo_values[self._num_structure_params :]:
+            num_property_combos *= len(v)
+
         for i, combo in enumerate(itertools.product(*self._combo_values)):
             combo_dir_name = self._create_combo_dir_name(combo, i) or "DAGs"  # type: ignore
             combo_log = {}
@@ -64,7 +86,8 @@ class ComboGenerator:
                 combo_log[k] = v
                 combo_config.update_param_value(k, {"Fixed": v})
             combo_config.optimize()
-            combo_config.set_random_seed()
+            combo_config.combination_index = i
+            combo_config.structure_index = i // num_property_combos
 
             yield (combo_dir_name, combo_log, combo_config)
 
@@ -22,6 +22,8 @@ class Config:
         self.graph_structure = config_raw["Graph structure"]
         self.properties = config_raw["Properties"]
         self.output_formats = config_raw["Output formats"]
+        self.combination_index = 0
+        self.structure_index = 0
 
     def update_param_value(self, param_name: str, value: Any) -> None:
         """Update parameter value.
@@ -44,8 +46,51 @@ class Config:
                 self.edge_properties[param_name] = value
 
     def set_random_seed(self) -> None:
+        """Seed 'Util.DEFAULT_RNG' and the 'random' module.
+
+        Notes
+        -----
+        Builders and setters use the generators created by 'create_structure_rng'
+        and 'create_property_rng', so this seed only affects callers without them.
+
+        """
+        Util.DEFAULT_RNG.seed(self.seed)
         random.seed(self.seed)
 
+    def create_structure_rng(self, dag_index: int) -> random.Random:
+        """Create random number generator used to build the DAG.
+
+        Parameters
+        ----------
+        dag_index : int
+            Index of DAG in the combination.
+
+        Returns
+        -------
+        random.Random
+            Random number generator keyed by 'Seed', structure index and DAG index.
+            Combinations that differ only in 'Properties' share the structure index,
+            so they share the structures of their DAGs.
+
+        """
+        return Util.create_rng(self.seed, self.structure_index, dag_index, 0)
+
+    def create_property_rng(self, dag_index: int) -> random.Random:
+        """Create random number generator used to set the properties of the DAG.
+
+        Parameters
+        ----------
+        dag_index : int
+            Index of DAG in the combination.
+
+        Returns
+        -------
+        random.Random
+            Random number generator keyed by 'Seed', combination index and DAG index.
+
+        """
+        return Util.create_rng(self.seed, self.combination_index, dag_index, 1)
+
     def optimize(self) -> None:
         """Remove 'Random' and 'Fixed'"""
         self._remove_random_fixed(self.graph_structure)
@@ -1,13 +1,14 @@
 import random
-from typing import List
+from typing import Callable, Dict, List, Optional, Tuple
 
 import networkx as nx
 import numpy as np
 
 from ..branching_validator import BranchingConstraintError, BranchingValidator
-from ..common import Util
+from ..common import NULL_INSTRUMENTATION, Util
 from ..config import Config
 from ..exceptions import BuildFailedError
+from .chain_based_builder import ChainBasedDAG
 
 
 class BranchingAugmentor:
@@ -18,43 +19,43 @@ class BranchingAugmentor:
         self._max_try = max_try
         self._next_node_id: int = 0
         self._next_unit_id: int = 0
+        self.instrumentation = NULL_INSTRUMENTATION
+        self.num_tries = 0
 
-    def augment(self, dag: nx.DiGraph, layout_hint: str) -> nx.DiGraph:
-        for try_i in range(1, self._max_try + 1):
-            self._next_unit_id = 0
-            work = dag.copy()
-            self._next_node_id = max(work.nodes(), default=-1) + 1
-            for n in list(work.nodes()):
-                work.nodes[n].setdefault("node_type", "regular")
-            if layout_hint == "chain":
-                result = self._augment_chain(work, current_depth=0)
-            elif layout_hint in ("gnp", "fanin"):
-                # Per the "1 logical node" framing in the paper, the augmentation
-                # is orthogonal to the host construction method, so Fan-in/Fan-out
-                # shares the gnp node-replacement strategy.
-                result = self._augment_gnp(work, current_depth=0,
-                                           initial_size=work.number_of_nodes())
-            else:
-                raise ValueError(f"unknown layout_hint: {layout_hint}")
-            try:
-                BranchingValidator.assert_valid(result, self._config.firing)
-                return result
-            except BranchingConstraintError:
-                if try_i == self._max_try:
-                    raise BuildFailedError(
-                        f"Branching augmentation failed after {self._max_try} tries"
-                    )
-                continue
+    def augment(self, dag: nx.DiGraph, layout_hint: str,
+                rng: Optional[random.Random] = None) -> nx.DiGraph:
+        """Insert branching units into `dag` in place and return it.
+
+        If `dag` is a ChainBasedDAG, its chains are kept up to date with the units.
+        Each unit is validated as soon as it is inserted and, on a violation,
+        only that unit is undone and inserted again, up to `max_try` times.
+        `num_tries` is 1 plus the number of such unit retries.
+        """
+        if layout_hint not in ("chain", "gnp", "fanin"):
+            raise ValueError(f"unknown layout_hint: {layout_hint}")
+        rng = Util.get_rng(rng)
+        self.num_tries = 1
+        self._next_unit_id = 0
+        self._next_node_id = max(dag.nodes(), default=-1) + 1
+        for n in dag.nodes():
+            dag.nodes[n].setdefault("node_type", "regular")
+        if layout_hint == "chain":
+            return self._augment_chain(dag, rng, current_depth=0)
+        # Per the "1 logical node" framing in the paper, the augmentation
+        # is orthogonal to the host construction method, so Fan-in/Fan-out
+        # shares the gnp node-replacement strategy.
+        return self._augment_gnp(dag, rng, current_depth=0,
+                                 initial_size=dag.number_of_nodes())
 
     # ---------- chain mode ----------
 
-    def _augment_chain(self, dag: nx.DiGraph, current_depth: int,
+    def _augment_chain(self, dag: nx.DiGraph, rng: random.Random, current_depth: int,
                        candidate_filter=None) -> nx.DiGraph:
-        max_depth = Util.random_choice(self._config.maximum_nesting_depth)
+        max_depth = Util.random_choice(self._config.maximum_nesting_depth, rng)
         if current_depth >= max_depth:
             return dag
-        p_b = Util.random_choice(self._config.probability_of_branching)
-        max_branches = Util.random_choice(self._config.maximum_branches)
+        p_b = Util.random_choice(self._config.probability_of_branching, rng)
+        max_branches = Util.random_choice(self._config.maximum_branches, rng)
 
         topo = list(nx.topological_sort(dag))
         if candidate_filter is not None:
@@ -65,35 +66,44 @@ class BranchingAugmentor:
             candidates = [n for n in topo
                           if dag.nodes[n].get("node_type") == "regular"]
 
+        # Replacing a node never changes what follows the nodes after it in
+        # topological order, so the lengths of one level stay exact.
+        remaining = self._remaining_chain_lengths(dag, topo)
         newly_added_at_next_depth = []
         for v in candidates:
             if v not in dag.nodes():
                 continue
-            if random.random() >= p_b:
+            if rng.random() >= p_b:
                 continue
-            k = random.randint(2, max(2, max_branches))
-            remaining = self._chain_position_remaining(dag, v)
-            L_sub = max(1, remaining)
-            new_subs = self._replace_node_with_branches(dag, v, k, L_sub)
+            k = rng.randint(2, max(2, max_branches))
+            L_sub = max(1, remaining[v])
+            new_subs = self._insert_unit(dag, self._replace_node_with_branches,
+                                         v, k, L_sub, rng)
             newly_added_at_next_depth.extend(new_subs)
 
         if newly_added_at_next_depth:
-            self._augment_chain(dag, current_depth + 1,
-                                 candidate_filter=set(newly_added_at_next_depth))
+            self._augment_chain(dag, rng, current_depth + 1,
+                                candidate_filter=set(newly_added_at_next_depth))
         return dag
 
-    def _chain_position_remaining(self, dag: nx.DiGraph, v: int) -> int:
-        """Approximate remaining chain length at v, used as subsequence length."""
-        try:
-            descendants = nx.descendants(dag, v)
-            return max(1, len(descendants))
-        except nx.NetworkXError:
-            return 1
+    @staticmethod
+    def _remaining_chain_lengths(dag: nx.DiGraph, topo: List[int]) -> Dict[int, int]:
+        """Remaining chain length at every node, used as subsequence length.
+
+        The remaining chain length is the number of nodes on the longest path
+        from the node (exclusive) to a sink. It equals the number of descendants
+        on a chain and is computed in one reverse topological pass.
+        """
+        remaining: Dict[int, int] = {}
+        for n in reversed(topo):
+            remaining[n] = max((remaining[s] + 1 for s in dag.successors(n)), default=0)
+        return remaining
 
     def _replace_node_with_branches(self, dag: nx.DiGraph, v: int, k: int,
-                                    L_sub: int) -> list:
-        """Replace v with [v_ent, sub_seq_1..k, v_ext] in place.
-        Returns the list of newly added regular sub-nodes (for next-depth processing)."""
+                                    L_sub: int, rng: random.Random) -> Tuple[int, int, list]:
+        """Add [v_ent, sub_seq_1..k, v_ext] with the edges of v, which is kept.
+        Returns v_ent, v_ext and the list of newly added regular sub-nodes
+        (for next-depth processing)."""
         unit_id = self._take_unit_id()
         vent = self._take_node_id()
         vext = self._take_node_id()
@@ -101,12 +111,11 @@ class BranchingAugmentor:
         dag.add_node(vext, node_type="v_ext", branch_unit_id=unit_id, execution_time=0)
         in_edges = [(p, dict(dag.edges[p, v])) for p in dag.predecessors(v)]
         succs = list(dag.successors(v))
-        dag.remove_node(v)
         for p, edge_attrs in in_edges:
             dag.add_edge(p, vent, **edge_attrs)
         for s in succs:
             dag.add_edge(vext, s)
-        probs = self._sample_categorical(k)
+        probs = self._sample_categorical(k, rng)
         new_subs = []
         for j in range(k):
             sub_nodes = [self._take_node_id() for _ in range(L_sub)]
@@ -120,17 +129,17 @@ class BranchingAugmentor:
                 attrs["firing_prob"] = float(probs[j])
             dag.add_edge(vent, sub_nodes[0], **attrs)
             dag.add_edge(sub_nodes[-1], vext)
-        return new_subs
+        return vent, vext, new_subs
 
     # ---------- gnp mode (Task 4) ----------
 
-    def _augment_gnp(self, dag: nx.DiGraph, current_depth: int,
+    def _augment_gnp(self, dag: nx.DiGraph, rng: random.Random, current_depth: int,
                      initial_size: int, candidate_filter=None) -> nx.DiGraph:
-        max_depth = Util.random_choice(self._config.maximum_nesting_depth)
+        max_depth = Util.random_choice(self._config.maximum_nesting_depth, rng)
         if current_depth >= max_depth:
             return dag
-        p_b = Util.random_choice(self._config.probability_of_branching)
-        max_branches = Util.random_choice(self._config.maximum_branches)
+        p_b = Util.random_choice(self._config.probability_of_branching, rng)
+        max_branches = Util.random_choice(self._config.maximum_branches, rng)
         depth_remaining = max(0, max_depth - current_depth)
 
         topo = list(nx.topological_sort(dag))
@@ -146,22 +155,24 @@ class BranchingAugmentor:
         for v in candidates:
             if v not in dag.nodes():
                 continue
-            if random.random() >= p_b:
+            if rng.random() >= p_b:
                 continue
-            k = random.randint(2, max(2, max_branches))
+            k = rng.randint(2, max(2, max_branches))
             n_sub = max(2, initial_size // max(1, k * (depth_remaining + 1)))
-            new_subs = self._replace_node_with_gnp_branches(dag, v, k, n_sub)
+            new_subs = self._insert_unit(dag, self._replace_node_with_gnp_branches,
+                                         v, k, n_sub, rng)
             newly_added_at_next_depth.extend(new_subs)
 
         if newly_added_at_next_depth:
-            self._augment_gnp(dag, current_depth + 1, initial_size,
-                               candidate_filter=set(newly_added_at_next_depth))
+            self._augment_gnp(dag, rng, current_depth + 1, initial_size,
+                              candidate_filter=set(newly_added_at_next_depth))
         return dag
 
     def _replace_node_with_gnp_branches(self, dag: nx.DiGraph, v: int, k: int,
-                                         n_sub: int) -> list:
-        """Replace v with [v_ent, sub_DAG_1..k via branch heads, v_ext] in place.
-        Returns the list of newly added regular sub-nodes (branch heads + interior)."""
+                                        n_sub: int, rng: random.Random) -> Tuple[int, int, list]:
+        """Add [v_ent, sub_DAG_1..k via branch heads, v_ext] with the edges of v,
+        which is kept. Returns v_ent, v_ext and the list of newly added regular sub-nodes
+        (branch heads + interior)."""
         unit_id = self._take_unit_id()
         vent = self._take_node_id()
         vext = self._take_node_id()
@@ -170,56 +181,84 @@ class BranchingAugmentor:
         # Preserve in-edge / out-edge attributes
         in_edges = [(p, dict(dag.edges[p, v])) for p in dag.predecessors(v)]
         out_edges = [(s, dict(dag.edges[v, s])) for s in dag.successors(v)]
-        dag.remove_node(v)
         for p, attrs in in_edges:
             dag.add_edge(p, vent, **attrs)
         for s, attrs in out_edges:
             dag.add_edge(vext, s, **attrs)
 
-        probs = self._sample_categorical(k)
-        edge_prob = (Util.random_choice(self._config.probability_of_edge_existence)
+        probs = self._sample_categorical(k, rng)
+        edge_prob = (Util.random_choice(self._config.probability_of_edge_existence, rng)
                      if self._config.probability_of_edge_existence is not None
                      else 0.3)
 
-        new_subs = []
-        for j in range(k):
-            # Each branch gets its own internal Erdős-Rényi mini-DAG of n_sub nodes,
-            # plus a "branch head" node that receives the v_ent -> head edge with
-            # branch_id/firing_prob attributes (single edge from v_ent per branch,
-            # required for clean branch_id semantics).
-            head_id = self._take_node_id()
-            dag.add_node(head_id, node_type="regular", execution_time=0)
-            new_subs.append(head_id)
-
-            sub_node_ids = [self._take_node_id() for _ in range(n_sub)]
-            for n in sub_node_ids:
-                dag.add_node(n, node_type="regular", execution_time=0)
-                new_subs.append(n)
-            for ai in range(n_sub):
-                for bi in range(ai + 1, n_sub):
-                    if random.random() < edge_prob:
-                        dag.add_edge(sub_node_ids[ai], sub_node_ids[bi])
-
-            sub_subgraph = dag.subgraph(sub_node_ids)
-            sources = [n for n in sub_node_ids if sub_subgraph.in_degree(n) == 0]
-            sinks = [n for n in sub_node_ids if sub_subgraph.out_degree(n) == 0]
-            if not sources:
-                sources = [sub_node_ids[0]]
-            if not sinks:
-                sinks = [sub_node_ids[-1]]
+        # Each branch j gets its own internal Erdős-Rényi mini-DAG of n_sub nodes,
+        # plus a "branch head" node that receives the v_ent -> head edge with
+        # branch_id/firing_prob attributes (single edge from v_ent per branch,
+        # required for clean branch_id semantics). The nodes of branch j are
+        # [head, sub_0, ..., sub_{n_sub-1}] at offset j * (n_sub + 1), and the
+        # upper triangles of all k mini-DAGs are drawn in one Bernoulli batch.
+        first_id = self._next_node_id
+        block = n_sub + 1
+        self._next_node_id += k * block
+        new_subs = list(range(first_id, self._next_node_id))
+        dag.add_nodes_from(new_subs, node_type="regular", execution_time=0)
+
+        pair_src, pair_dst = Util.get_upper_triangle(n_sub)
+        exists = Util.create_numpy_rng(rng).random((k, pair_src.size)) < edge_prob
+        branch_i, pair_i = np.nonzero(exists)
+        src = branch_i * block + 1 + pair_src[pair_i]
+        dst = branch_i * block + 1 + pair_dst[pair_i]
+        dag.add_edges_from(zip((src + first_id).tolist(), (dst + first_id).tolist()))
 
+        # Every mini-DAG has a source and a sink, so each branch is non-empty.
+        in_degree = np.bincount(dst, minlength=k * block).reshape(k, block)[:, 1:]
+        out_degree = np.bincount(src, minlength=k * block).reshape(k, block)[:, 1:]
+        for j in range(k):
+            head_id = first_id + j * block
             attrs = {"branch_id": j}
             if self._config.firing == "probabilistic":
                 attrs["firing_prob"] = float(probs[j])
             dag.add_edge(vent, head_id, **attrs)
-            for src in sources:
-                dag.add_edge(head_id, src)
-            for sink in sinks:
-                dag.add_edge(sink, vext)
-        return new_subs
+            dag.add_edges_from(
+                (head_id, head_id + 1 + i) for i in np.flatnonzero(in_degree[j] == 0).tolist()
+            )
+            dag.add_edges_from(
+                (head_id + 1 + i, vext) for i in np.flatnonzero(out_degree[j] == 0).tolist()
+            )
+        return vent, vext, new_subs
 
     # ---------- common ----------
 
+    def _insert_unit(self, dag: nx.DiGraph, replace: Callable[..., Tuple[int, int, list]],
+                     v: int, *args) -> list:
+        """Replace v by a unit built by `replace` and validate only that unit.
+
+        `replace` adds the unit next to v, and v is removed only once the unit is valid.
+        The nodes and unit ids taken by a unit are contiguous, so on a violation
+        the attempt is undone by removing its nodes and restoring the id counters,
+        which leaves the graph, including its node and edge order, as before.
+        Returns the newly added regular sub-nodes.
+        """
+        first_node_id, first_unit_id = self._next_node_id, self._next_unit_id
+        for try_i in range(1, self._max_try + 1):
+            vent, vext, new_subs = replace(dag, v, *args)
+            try:
+                BranchingValidator.assert_valid_unit(dag, vent, vext, self._config.firing)
+            except BranchingConstraintError:
+                dag.remove_nodes_from(range(first_node_id, self._next_node_id))
+                self._next_node_id, self._next_unit_id = first_node_id, first_unit_id
+                if try_i == self._max_try:
+                    raise BuildFailedError(
+                        f"Branching augmentation failed after {self._max_try} tries"
+                    )
+                self.num_tries += 1
+                self.instrumentation.count("BranchingAugmentor.retries")
+                continue
+            dag.remove_node(v)
+            if isinstance(dag, ChainBasedDAG):
+                dag.replace_node(v, vent, new_subs)
+            return new_subs
+
     def _take_node_id(self) -> int:
         n = self._next_node_id
         self._next_node_id += 1
@@ -230,13 +269,13 @@ class BranchingAugmentor:
         self._next_unit_id += 1
         return u
 
-    def _sample_categorical(self, k: int) -> List[float]:
+    def _sample_categorical(self, k: int, rng: random.Random) -> List[float]:
         dist = self._config.probability_distribution
         if dist == "dirichlet":
             alpha = float(self._config.dirichlet_alpha)
-            return list(np.random.dirichlet([alpha] * k))
+            return list(Util.create_numpy_rng(rng).dirichlet([alpha] * k))
         elif dist == "uniform-normalize":
-            r = [random.uniform(0.0, 1.0) for _ in range(k)]
+            r = [rng.uniform(0.0, 1.0) for _ in range(k)]
             s = sum(r)
             return [x / s for x in r]
         else:
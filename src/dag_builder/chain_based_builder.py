@@ -1,5 +1,7 @@
+import bisect
+import itertools
 import random
-from typing import Generator, List, Optional
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
 
 import networkx as nx
 
@@ -9,8 +11,18 @@ from ..exceptions import BuildFailedError, InfeasibleConfigError
 from .dag_builder_base import DAGBuilderBase
 
 
-class Chain(nx.DiGraph):
-    """Chain class."""
+class Chain:
+    """Chain class.
+
+    A chain is represented by index ranges instead of a graph.
+    Its nodes are start_idx, ..., end_idx:
+    the main sequence is start_idx, ..., main_tail,
+    and the k-th sub sequence is sub_sequence_heads[k], ..., sub_sequence_tails[k],
+    branching from sub_sequence_srcs[k] in the main sequence.
+    If nodes are replaced by branching units (see replace_node()),
+    the nodes of the chain are the regular nodes of the units in place of them.
+
+    """
 
     def __init__(self, start_idx: int) -> None:
         """Constructor.
@@ -21,25 +33,72 @@ class Chain(nx.DiGraph):
             Index of chain head.
 
         """
-        super().__init__()
         self.start_idx: int = start_idx
         self.end_idx: int
         self.main_tail: int
+        self.sub_sequence_srcs: List[int] = []
+        self.sub_sequence_heads: List[int] = []
+        self.sub_sequence_tails: List[int] = []
+        self._replacements: Dict[int, List[int]] = {}
+        self._entry_idx: Optional[int] = None
 
     @property
     def head(self) -> int:
-        return self.start_idx
+        return self.start_idx if self._entry_idx is None else self._entry_idx
+
+    @property
+    def nodes(self) -> Sequence[int]:
+        if not self._replacements:
+            return range(self.start_idx, self.end_idx + 1)
+        return list(
+            itertools.chain.from_iterable(
+                self._expand(node_i) for node_i in range(self.start_idx, self.end_idx + 1)
+            )
+        )
 
     @property
-    def sub_sequence_tails(self) -> List[int]:
-        tails = Util.get_sink_nodes(self)
-        tails.remove(self.main_tail)
-        return tails
+    def edges(self) -> List[Tuple[int, int]]:
+        edges = [(i, i + 1) for i in range(self.start_idx, self.main_tail)]
+        for src_i, head_i, tail_i in zip(
+            self.sub_sequence_srcs, self.sub_sequence_heads, self.sub_sequence_tails
+        ):
+            edges.append((src_i, head_i))
+            edges += [(i, i + 1) for i in range(head_i, tail_i)]
+
+        return edges
+
+    def number_of_nodes(self) -> int:
+        return len(self.nodes)
+
+    def replace_node(self, node_i: int, entry_i: int, sub_nodes: List[int]) -> None:
+        """Record that a node of the chain has been replaced by a branching unit.
+
+        Parameters
+        ----------
+        node_i : int
+            Index of the replaced node.
+        entry_i : int
+            Index of the v_ent node of the unit, which becomes the head if node_i is the head.
+        sub_nodes : List[int]
+            Indices of the regular nodes of the unit.
+
+        """
+        self._replacements[node_i] = sub_nodes
+        if node_i == self.head:
+            self._entry_idx = entry_i
+
+    def _expand(self, node_i: int) -> Iterator[int]:
+        if node_i not in self._replacements:
+            yield node_i
+            return
+        for sub_node_i in self._replacements[node_i]:
+            yield from self._expand(sub_node_i)
 
     def build_chain(
         self,
         main_sequence_length: int,
         number_of_sub_sequence: Optional[int] = None,
+        rng: Optional[random.Random] = None,
     ) -> None:
         """Build chain.
 
@@ -51,28 +110,25 @@ class Chain(nx.DiGraph):
             Main sequence length
         number_of_sub_sequence : Optional[int], optional
             Number of sub sequence, by default None
+        rng : Optional[random.Random], optional
+            Random number generator, by default None (i.e., 'Util.DEFAULT_RNG')
 
         """
-
-        def create_sequence(start_idx: int, len_sequence: int) -> None:
-            self.add_node(start_idx)
-            for i in range(start_idx, start_idx + len_sequence - 1):
-                self.add_edge(i, i + 1)
+        rng = Util.get_rng(rng)
 
         # Build main sequence
-        main_seq_i = [i for i in range(self.start_idx, self.start_idx + main_sequence_length)]
-        self.main_tail = self.end_idx = main_seq_i[-1]
-        create_sequence(self.start_idx, main_sequence_length)
+        self.main_tail = self.end_idx = self.start_idx + main_sequence_length - 1
 
         # Build sub sequence (Optional)
         if number_of_sub_sequence:
             for _ in range(number_of_sub_sequence):
-                src_i = random.choice(main_seq_i[:-1])
-                sub_seq_len = main_sequence_length - main_seq_i.index(src_i) - 1
+                src_i = rng.choice(range(self.start_idx, self.main_tail))
+                sub_seq_len = self.main_tail - src_i
                 sub_seq_start_idx = self.end_idx + 1
-                create_sequence(sub_seq_start_idx, sub_seq_len)
-                self.add_edge(src_i, sub_seq_start_idx)
+                self.sub_sequence_srcs.append(src_i)
+                self.sub_sequence_heads.append(sub_seq_start_idx)
                 self.end_idx = sub_seq_start_idx + sub_seq_len - 1
+                self.sub_sequence_tails.append(self.end_idx)
 
 
 class ChainBasedDAG(nx.DiGraph):
@@ -81,16 +137,41 @@ class ChainBasedDAG(nx.DiGraph):
     def __init__(self, chains: List[Chain]) -> None:
         super().__init__()
         self.chains = chains
-        for chain in self.chains:
-            self.add_nodes_from(chain.nodes)
-            self.add_edges_from(chain.edges)
+        self._chain_starts = [chain.start_idx for chain in chains]
+        self._sub_node_to_chain: Dict[int, Chain] = {}
+        self.add_nodes_from(itertools.chain.from_iterable(chain.nodes for chain in chains))
+        self.add_edges_from(itertools.chain.from_iterable(chain.edges for chain in chains))
 
     @property
     def chain_heads(self) -> List[int]:
         return [chain.head for chain in self.chains]
 
+    def replace_node(self, node_i: int, entry_i: int, sub_nodes: List[int]) -> None:
+        """Record that a node has been replaced by a branching unit in its chain.
+
+        Parameters
+        ----------
+        node_i : int
+            Index of the replaced node.
+        entry_i : int
+            Index of the v_ent node of the unit.
+        sub_nodes : List[int]
+            Indices of the regular nodes of the unit.
+
+        """
+        chain = self._sub_node_to_chain.get(node_i)
+        if chain is None:
+            chain = self.chains[bisect.bisect_right(self._chain_starts, node_i) - 1]
+        chain.replace_node(node_i, entry_i, sub_nodes)
+        for sub_node_i in sub_nodes:
+            self._sub_node_to_chain[sub_node_i] = chain
+
     def vertically_link_chains(
-        self, number_of_source_nodes: int, link_main_tail: bool, link_sub_tail: bool
+        self,
+        number_of_source_nodes: int,
+        link_main_tail: bool,
+        link_sub_tail: bool,
+        rng: Optional[random.Random] = None,
     ) -> None:
         """Vertically link chains.
 
@@ -102,10 +183,14 @@ class ChainBasedDAG(nx.DiGraph):
             Allow link in main sequence tails.
         link_sub_tail : bool
             Allow link in sub sequence tails.
+        rng : Optional[random.Random], optional
+            Random number generator, by default None (i.e., 'Util.DEFAULT_RNG')
 
         """
         # Determine source option
-        src_chains = set(random.sample(self.chains, number_of_source_nodes))
+        # NOTE: Chains are kept in a list, because the iteration order of a set of chains
+        #       depends on their addresses and would make the result irreproducible.
+        src_chains = Util.get_rng(rng).sample(self.chains, number_of_source_nodes)
         src_option = []
         for chain in src_chains:
             if link_main_tail:
@@ -114,8 +199,7 @@ class ChainBasedDAG(nx.DiGraph):
                 src_option += chain.sub_sequence_tails
 
         # Determine targets
-        tgt_chains = set(self.chains) - src_chains
-        targets = [chain.head for chain in tgt_chains]
+        targets = [chain.head for chain in self.chains if chain not in src_chains]
 
         # Add edges
         for tgt_i in targets:
@@ -123,7 +207,11 @@ class ChainBasedDAG(nx.DiGraph):
             self.add_edge(src_i, tgt_i)
 
     def merge_chains(
-        self, number_of_sink_nodes: int, merge_middle: bool, merge_exit: bool
+        self,
+        number_of_sink_nodes: int,
+        merge_middle: bool,
+        merge_exit: bool,
+        rng: Optional[random.Random] = None,
     ) -> None:
         """Merge chains.
 
@@ -135,6 +223,8 @@ class ChainBasedDAG(nx.DiGraph):
             Allow merge to middle nodes.
         merge_exit : bool
             Allow merge to sink nodes.
+        rng : Optional[random.Random], optional
+            Random number generator, by default None (i.e., 'Util.DEFAULT_RNG')
 
         Raises
         ------
@@ -142,33 +232,70 @@ class ChainBasedDAG(nx.DiGraph):
             No merging is possible.
 
         """
-        selected_exits = set(random.sample(Util.get_sink_nodes(self), number_of_sink_nodes))
-        sources = set(Util.get_sink_nodes(self)) - set(selected_exits)
+        sink_nodes = Util.get_sink_nodes(self)
+        selected_exits = set(Util.get_rng(rng).sample(sink_nodes, number_of_sink_nodes))
+        sources = [node_i for node_i in sink_nodes if node_i not in selected_exits]
+        source_set = set(sources)
 
         # Determine target option
-        tgt_option = set(self.nodes()) - set(Util.get_source_nodes(self)) - sources
-        if not merge_exit:
-            tgt_option -= selected_exits
-        if not merge_middle:
-            tgt_option = selected_exits
-
-        def anc(dag, src_i: int) -> set:
-            tmp = nx.DiGraph()
-            tmp.add_nodes_from(dag.nodes)
-            tmp.add_edges_from(dag.edges)
-            return nx.ancestors(tmp, src_i)
+        if merge_middle:
+            tgt_option = [
+                node_i
+                for node_i in self.nodes
+                if self.in_degree(node_i) != 0
+                and node_i not in source_set
+                and (merge_exit or node_i not in selected_exits)
+            ]
+        else:
+            tgt_option = sorted(selected_exits)
+
+        # Bitsets of the target options grouped by in-degree,
+        # and bitsets of the ancestors of the sources.
+        in_degree_to_bits: Dict[int, int] = {}
+        for tgt_i in tgt_option:
+            in_degree = self.in_degree(tgt_i)
+            in_degree_to_bits[in_degree] = in_degree_to_bits.get(in_degree, 0) | 1 << tgt_i
+        ancestor_bits = self._get_ancestor_bits(sources)
 
         # Add edges
-        copy_dag = nx.DiGraph()  # Use a copy because of a bug in nx.ancestor function.
-        copy_dag.add_nodes_from(self.nodes)
-        copy_dag.add_edges_from(self.edges)
-        for src_i in sources:
-            _tgt_option = tgt_option - nx.ancestors(copy_dag, src_i)
-            if not _tgt_option:
+        for src_k, src_i in enumerate(sources):
+            # Merge into the node with the minimum in-degree (the smallest index among ties)
+            # that is not an ancestor of the source.
+            for in_degree in sorted(in_degree_to_bits):
+                candidates = in_degree_to_bits[in_degree] & ~ancestor_bits[src_i]
+                if candidates:
+                    break
+            else:
                 raise BuildFailedError("No merging is possible.")
-            tgt_i = Util.get_min_in_node(self, _tgt_option)
+            tgt_i = (candidates & -candidates).bit_length() - 1
             self.add_edge(src_i, tgt_i)
-            copy_dag.add_edge(src_i, tgt_i)
+
+            tgt_bit = 1 << tgt_i
+            in_degree_to_bits[in_degree] ^= tgt_bit
+            if not in_degree_to_bits[in_degree]:
+                del in_degree_to_bits[in_degree]
+            in_degree_to_bits[in_degree + 1] = in_degree_to_bits.get(in_degree + 1, 0) | tgt_bit
+
+            # The source and its ancestors become ancestors of the sources below the target.
+            new_ancestor_bits = ancestor_bits[src_i] | 1 << src_i
+            for later_src_i in sources[src_k + 1 :]:
+                if ancestor_bits[later_src_i] & tgt_bit:
+                    ancestor_bits[later_src_i] |= new_ancestor_bits
+
+    def _get_ancestor_bits(self, nodes: List[int]) -> Dict[int, int]:
+        """Get the ancestors of the nodes as bitsets.
+
+        Bit i of a bitset is set if node i is an ancestor.
+
+        """
+        ancestor_bits: Dict[int, int] = {}
+        for node_i in nx.topological_sort(self):
+            bits = 0
+            for pred_i in self.predecessors(node_i):
+                bits |= ancestor_bits[pred_i] | 1 << pred_i
+            ancestor_bits[node_i] = bits
+
+        return {node_i: ancestor_bits[node_i] for node_i in nodes}
 
 
 class ChainBasedBuilder(DAGBuilderBase):
@@ -228,13 +355,18 @@ class ChainBasedBuilder(DAGBuilderBase):
                     "'Number of chains' * 'Number of sub sequence' < 'Number of sink nodes.'"
                 )
 
-    def build(self) -> Generator[nx.DiGraph, None, None]:
+    def build_dag(self, rng: random.Random) -> nx.DiGraph:
         """Build DAG using chain-based method.
 
-        Yields
-        ------
-        Generator
-            DAG generator.
+        Parameters
+        ----------
+        rng : random.Random
+            Random number generator of the DAG.
+
+        Returns
+        -------
+        nx.DiGraph
+            Chain-based DAG.
 
         Raises
         ------
@@ -242,48 +374,52 @@ class ChainBasedBuilder(DAGBuilderBase):
             The number of build failures exceeded the maximum number of attempts.
 
         """
-        for _ in range(self._config.number_of_dags):
-            for try_i in range(1, self._max_try + 1):
-                # Build each chain
-                chains: List[Chain] = []
-                start_idx = 0
-                for _ in range(Util.random_choice(self._config.number_of_chains)):
-                    chain = Chain(start_idx)
-                    main_sequence_length = Util.random_choice(self._config.main_sequence_length)
-                    number_of_sub_sequence = (
-                        Util.random_choice(self._config.number_of_sub_sequences)
-                        if self._config.number_of_sub_sequences
-                        else None
-                    )
-                    chain.build_chain(main_sequence_length, number_of_sub_sequence)
-                    chains.append(chain)
-                    start_idx = chain.end_idx + 1
-
-                # Create chain-based DAG
-                chain_based_dag = ChainBasedDAG(chains)
-
-                # Vertically link chains (optional)
-                if self._config.vertically_link_chains:
-                    chain_based_dag.vertically_link_chains(
-                        Util.random_choice(self._config.number_of_source_nodes),
-                        self._config.main_sequence_tail,
-                        self._config.sub_sequence_tail,
-                    )
+        for try_i in range(1, self._max_try + 1):
+            self.num_tries = try_i
+            # Build each chain
+            chains: List[Chain] = []
+            start_idx = 0
+            for _ in range(Util.random_choice(self._config.number_of_chains, rng)):
+                chain = Chain(start_idx)
+                main_sequence_length = Util.random_choice(self._config.main_sequence_length, rng)
+                number_of_sub_sequence = (
+                    Util.random_choice(self._config.number_of_sub_sequences, rng)
+                    if self._config.number_of_sub_sequences
+                    else None
+                )
+                chain.build_chain(main_sequence_length, number_of_sub_sequence, rng)
+                chains.append(chain)
+                start_idx = chain.end_idx + 1
+
+            # Create chain-based DAG
+            chain_based_dag = ChainBasedDAG(chains)
+
+            # Vertically link chains (optional)
+            if self._config.vertically_link_chains:
+                chain_based_dag.vertically_link_chains(
+                    Util.random_choice(self._config.number_of_source_nodes, rng),
+                    self._config.main_sequence_tail,
+                    self._config.sub_sequence_tail,
+                    rng,
+                )
 
-                # Merge chains (optional)
-                if self._config.merge_chains:
-                    try:
-                        chain_based_dag.merge_chains(
-                            Util.random_choice(self._config.number_of_sink_nodes),
-                            self._config.middle_of_chain,
-                            self._config.sink_node,
+            # Merge chains (optional)
+            if self._config.merge_chains:
+                try:
+                    chain_based_dag.merge_chains(
+                        Util.random_choice(self._config.number_of_sink_nodes, rng),
+                        self._config.middle_of_chain,
+                        self._config.sink_node,
+                        rng,
+                    )
+                except BuildFailedError:
+                    if try_i == self._max_try:
+                        raise BuildFailedError(
+                            f"A DAG could not be built in {self._max_try} tries."
                         )
-                        break
-                    except BuildFailedError:
-                        if try_i == self._max_try:
-                            raise BuildFailedError(
-                                f"A DAG could not be built in {self._max_try} tries."
-                            )
-                        continue
-
-            yield chain_based_dag
+                    self.instrumentation.count(f"{self.name}.retries")
+                    continue
+
+            break
+
+        return chain_based_dag
@@ -1,15 +1,28 @@
+import heapq
+import random
 from abc import ABCMeta, abstractmethod
-from typing import Generator, List
+from typing import Dict, Generator, List
 
 import networkx as nx
 
-from ..common import Util
+from ..common import NULL_INSTRUMENTATION, Instrumentation, Util
 from ..config import Config
 from ..exceptions import BuildFailedError
 
 
 class DAGBuilderBase(metaclass=ABCMeta):
-    """DAG builder base class."""
+    """DAG builder base class.
+
+    Attributes
+    ----------
+    instrumentation : Instrumentation
+        Instrumentation that counts the retries of the builder, by default NULL_INSTRUMENTATION.
+    num_tries : int
+        Number of build attempts of the last build_dag() call, including a failed call.
+
+    """
+
+    instrumentation: Instrumentation = NULL_INSTRUMENTATION
 
     def __init__(self, config: Config, max_try: int = 100) -> None:
         """Constructor.
@@ -25,9 +38,39 @@ class DAGBuilderBase(metaclass=ABCMeta):
         self._validate_config(config)
         self._config = config
         self._max_try = max_try
+        self.num_tries = 0
 
-    @abstractmethod
     def build(self) -> Generator[nx.DiGraph, None, None]:
+        """Build 'Number of DAGs' DAGs.
+
+        Each DAG is built with its own random number generator
+        keyed by 'Seed', combination index and DAG index,
+        so a DAG does not depend on the other DAGs or on the execution order.
+
+        Yields
+        ------
+        Generator
+            DAG generator.
+
+        Raises
+        ------
+        BuildFailedError
+            The number of build failures exceeded the maximum number of attempts.
+
+        """
+        for dag_i in range(self._config.number_of_dags):
+            yield self.build_dag(self._config.create_structure_rng(dag_i))
+
+    @property
+    def name(self) -> str:
+        return type(self).__name__
+
+    @property
+    def max_try(self) -> int:
+        return self._max_try
+
+    @abstractmethod
+    def build_dag(self, rng: random.Random) -> nx.DiGraph:
         raise NotImplementedError
 
     @abstractmethod
@@ -84,6 +127,9 @@ class DAGBuilderBase(metaclass=ABCMeta):
         The function terminates
         when the out-degree of the source layer is greater than or equal to 1
         and the in-degree of the target layer is greater than or equal to 1.
+        Each edge connects the source node with the minimum out-degree
+        and the target node with the minimum in-degree.
+        Ties are broken by the order in the layers.
 
         Parameters
         ----------
@@ -95,26 +141,36 @@ class DAGBuilderBase(metaclass=ABCMeta):
             DAG.
 
         """
+        if not src_layer or not tgt_layer:
+            return None
 
-        def is_finish() -> bool:
-            for src_node_i in src_layer:
-                if G.out_degree(src_node_i) == 0:
-                    return False
-            for tgt_node_i in tgt_layer:
-                if G.in_degree(tgt_node_i) == 0:
-                    return False
-
-            return True
+        # Heaps of (degree, order in layer, node) and the number of nodes with degree 0.
+        src_heap = [(G.out_degree(node_i), k, node_i) for k, node_i in enumerate(src_layer)]
+        tgt_heap = [(G.in_degree(node_i), k, node_i) for k, node_i in enumerate(tgt_layer)]
+        heapq.heapify(src_heap)
+        heapq.heapify(tgt_heap)
+        num_unsatisfied = sum(d == 0 for d, _, _ in src_heap) + sum(d == 0 for d, _, _ in tgt_heap)
 
-        while not is_finish():
-            min_out_src_i = Util.get_min_out_node(G, src_layer)
-            min_in_tgt_i = Util.get_min_in_node(G, tgt_layer)
+        while num_unsatisfied:
+            out_degree, src_k, min_out_src_i = src_heap[0]
+            in_degree, tgt_k, min_in_tgt_i = tgt_heap[0]
             G.add_edge(min_out_src_i, min_in_tgt_i)
+            heapq.heapreplace(src_heap, (out_degree + 1, src_k, min_out_src_i))
+            heapq.heapreplace(tgt_heap, (in_degree + 1, tgt_k, min_in_tgt_i))
+            num_unsatisfied -= (out_degree == 0) + (in_degree == 0)
 
     @staticmethod
     def _ensure_weakly_connected(G: nx.DiGraph, keep_num_entry: bool, keep_num_exit: bool) -> None:
         """Ensure weakly connected.
 
+        Each component other than the biggest one is connected to the biggest one
+        by an edge from its node with the minimum out-degree
+        to the node of the biggest component with the minimum in-degree.
+        Ties are broken by the order of the nodes in G.
+        The components are found by union-find
+        and the in-degrees of the biggest component are kept in a heap,
+        so it runs in near-linear time.
+
         Parameters
         ----------
         G : nx.DiGraph
@@ -131,23 +187,73 @@ class DAGBuilderBase(metaclass=ABCMeta):
             cannot be kept because of the size 1 component.
 
         """
-        comps = list(nx.weakly_connected_components(G))
-        if len(comps) == 1:
+        nodes = list(G.nodes)
+        node_to_k = {node_i: k for k, node_i in enumerate(nodes)}
+        disjoint_set = _DisjointSet(len(nodes))
+        for src_i, tgt_i in G.edges:
+            disjoint_set.union(node_to_k[src_i], node_to_k[tgt_i])
+
+        # Components in order of their first node.
+        root_to_comp: Dict[int, List[int]] = {}
+        for k, node_i in enumerate(nodes):
+            root_to_comp.setdefault(disjoint_set.find(k), []).append(node_i)
+        if len(root_to_comp) <= 1:
             return None
 
-        comps.sort(key=lambda x: len(x))
+        comps = sorted(root_to_comp.values(), key=len)
         tgt_comp = comps.pop(-1)  # Most big component
 
-        source_nodes = set(Util.get_source_nodes(G))
-        sink_nodes = set(Util.get_sink_nodes(G))
-        if keep_num_entry and keep_num_exit and (source_nodes & sink_nodes):
+        if keep_num_entry and keep_num_exit and len(comps[0]) == 1:
             raise BuildFailedError(
                 "The number of source nodes and the number of sink nodes"
                 "cannot be maintained because of the size 1 component."
             )
+
+        # Heap of (in-degree, order, node) of the target options.
+        tgt_heap = [
+            (G.in_degree(node_i), k, node_i)
+            for k, node_i in enumerate(tgt_comp)
+            if not (keep_num_entry and G.in_degree(node_i) == 0)
+        ]
+        heapq.heapify(tgt_heap)
         for src_comp in comps:
-            src_option = src_comp - sink_nodes if keep_num_exit else src_comp
-            tgt_option = tgt_comp - source_nodes if keep_num_entry else tgt_comp
-            src_i = Util.get_min_out_node(G, src_option)
-            tgt_i = Util.get_min_in_node(G, tgt_option)
+            src_option = [
+                node_i
+                for node_i in src_comp
+                if not (keep_num_exit and G.out_degree(node_i) == 0)
+            ]
+            if not src_option or not tgt_heap:
+                raise BuildFailedError(
+                    "A component cannot be connected "
+                    "without changing the number of source nodes or sink nodes."
+                )
+            src_i = min(src_option, key=G.out_degree)
+            in_degree, tgt_k, tgt_i = tgt_heap[0]
             G.add_edge(src_i, tgt_i)
+            heapq.heapreplace(tgt_heap, (in_degree + 1, tgt_k, tgt_i))
+
+
+class _DisjointSet:
+    """Disjoint set of 0, ..., n - 1 with union by size and path halving."""
+
+    def __init__(self, n: int) -> None:
+        self._parent = list(range(n))
+        self._size = [1] * n
+
+    def find(self, k: int) -> int:
+        parent = self._parent
+        while parent[k] != k:
+            parent[k] = parent[parent[k]]
+            k = parent[k]
+
+        return k
+
+    def union(self, k: int, l: int) -> None:
+        root_k = self.find(k)
+        root_l = self.find(l)
+        if root_k == root_l:
+            return None
+        if self._size[root_k] < self._size[root_l]:
+            root_k, root_l = root_l, root_k
+        self._parent[root_l] = root_k
+        self._size[root_k] += self._size[root_l]
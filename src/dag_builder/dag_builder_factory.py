@@ -1,8 +1,8 @@
-from typing import Generator
+import random
 
 import networkx as nx
 
-from ..common import Util
+from ..common import Instrumentation, Util
 from ..config import Config
 from .branching_augmentor import BranchingAugmentor
 from .chain_based_builder import ChainBasedBuilder
@@ -22,13 +22,31 @@ class _AugmentedBuilder(DAGBuilderBase):
     def _validate_config(self, config: Config):
         pass  # base builder already validated
 
-    def build(self) -> Generator[nx.DiGraph, None, None]:
-        for g in self._base.build():
-            # BranchingAugmentor calls dag.copy() internally; subclasses like
-            # ChainBasedDAG cannot be copied via nx default path (constructor
-            # requires positional args), so normalise to a plain DiGraph first.
-            plain = nx.DiGraph(g)
-            yield self._augmentor.augment(plain, self._layout_hint)
+    @property
+    def name(self) -> str:
+        return f"{self._base.name}+BranchingAugmentor"
+
+    @property  # type: ignore[override]
+    def num_tries(self) -> int:
+        # The augmentor counts its first pass, which is part of the base attempt.
+        return self._base.num_tries + max(0, self._augmentor.num_tries - 1)
+
+    @property  # type: ignore[override]
+    def instrumentation(self) -> Instrumentation:
+        return self._augmentor.instrumentation
+
+    @instrumentation.setter
+    def instrumentation(self, instrumentation: Instrumentation) -> None:
+        self._base.instrumentation = instrumentation
+        self._augmentor.instrumentation = instrumentation
+
+    def build_dag(self, rng: random.Random) -> nx.DiGraph:
+        self._augmentor.num_tries = 0
+        g = self._base.build_dag(rng)
+        # The freshly built DAG is augmented in place, so a ChainBasedDAG
+        # keeps its type and chains for the chain utilization.
+        with self.instrumentation.measure("stages", "augment"):
+            return self._augmentor.augment(g, self._layout_hint, rng)
 
 
 class DAGBuilderFactory:
@@ -1,5 +1,6 @@
+import heapq
 import random
-from typing import Generator, Tuple
+from typing import Dict, List, Tuple
 
 import networkx as nx
 
@@ -47,89 +48,95 @@ class FanInFanOutBuilder(DAGBuilderBase):
                 "'Number of source nodes' + 'Number of sink nodes' > 'Number of nodes'"
             )
 
-    def build(self) -> Generator:
+    def build_dag(self, rng: random.Random) -> nx.DiGraph:
         """Build DAG using fan-in/fan-out method.
 
         See https://hal.archives-ouvertes.fr/hal-00471255/file/ggen.pdf.
+        The number of nodes added by a fan-out is drawn uniformly
+        from 1 to the smaller of the spare out-degree and the remaining number of nodes,
+        i.e., from the original distribution conditioned on not exceeding 'Number of nodes',
+        so the DAG is built in a single pass.
 
-        Yields
-        ------
-        Generator
-            DAG generator.
+        Parameters
+        ----------
+        rng : random.Random
+            Random number generator of the DAG.
+
+        Returns
+        -------
+        nx.DiGraph
+            DAG.
 
         Raises
         ------
         BuildFailedError
-            The number of build failures exceeded the maximum number of attempts.
+            'Number of source nodes' exceeds the number of nodes
+            or the DAG cannot be weakly connected.
 
         """
-        for _ in range(self._config.number_of_dags):
-            num_build_fail = 0
-
-            # Determine number_of_nodes (Loop finish condition)
-            num_nodes = Util.random_choice(self._config.number_of_nodes)
-            num_exit = self._config.number_of_sink_nodes
-            if num_exit:
-                num_exit = Util.random_choice(num_exit)
-                num_nodes -= num_exit
-
-            # Initialize dag
-            num_entry = Util.random_choice(self._config.number_of_source_nodes)
-            G = self._init_dag(num_entry)
-
-            while G.number_of_nodes() != num_nodes:
-                if Util.true_or_false():
-                    # Fan-out
-                    max_diff_node_i, diff = self._search_max_diff_node(G)
-                    num_add = random.randint(1, diff)
-                    add_node_i_list = [G.number_of_nodes() + i for i in range(num_add)]
-                    nx.add_star(G, [max_diff_node_i] + add_node_i_list)
-
-                else:
-                    # Fan-in
-                    num_sources = random.randint(1, self._max_in)
-                    nodes = list(G.nodes())
-                    random.shuffle(nodes)
-                    sources = []
-                    for node_i in nodes:
-                        if G.out_degree(node_i) < self._max_out:
-                            sources.append(node_i)
-                            if len(sources) == num_sources:
-                                break
-
-                    add_node_i = G.number_of_nodes()
-                    G.add_node(add_node_i)
-                    for source_node_i in sources:
-                        G.add_edge(source_node_i, add_node_i)
-
-                # Check build fail
-                if G.number_of_nodes() > num_nodes:
-                    num_build_fail += 1
-                    if num_build_fail == self._max_try:
-                        msg = (
-                            "A DAG satisfying 'Number of nodes' could not be built "
-                            f"in {self._max_try} tries."
-                        )
-                        raise BuildFailedError(msg)
-                    else:
-                        G = self._init_dag(num_entry)  # reset
-
-            # Add sink nodes (Optional)
-            if num_exit:
-                self._force_create_sink_nodes(G, num_exit)
-
-            # Ensure weakly connected (Optional)
-            if self._config.ensure_weakly_connected:
-                self._ensure_weakly_connected(G, True, bool(num_exit))
-
-            yield G
-
-    def _search_max_diff_node(self, G: nx.DiGraph) -> Tuple[int, int]:
+        self.num_tries = 1  # Built in a single pass
+
+        # Determine number_of_nodes (Loop finish condition)
+        num_nodes = Util.random_choice(self._config.number_of_nodes, rng)
+        num_exit = self._config.number_of_sink_nodes
+        if num_exit:
+            num_exit = Util.random_choice(num_exit, rng)
+            num_nodes -= num_exit
+
+        # Initialize dag
+        num_entry = Util.random_choice(self._config.number_of_source_nodes, rng)
+        if num_entry > num_nodes:
+            raise BuildFailedError(
+                f"{num_entry} source nodes exceed {num_nodes} nodes excluding sink nodes."
+            )
+        G, out_degree_index = self._init_dag(num_entry)
+
+        while (num_remaining := num_nodes - G.number_of_nodes()) > 0:
+            if Util.true_or_false(rng):
+                # Fan-out
+                max_diff_node_i, diff = self._search_max_diff_node(out_degree_index)
+                if diff > num_remaining:
+                    self.instrumentation.count(f"{self.name}.clamped_fan_outs")
+                num_add = rng.randint(1, min(diff, num_remaining))
+                add_node_i_list = [G.number_of_nodes() + i for i in range(num_add)]
+                nx.add_star(G, [max_diff_node_i] + add_node_i_list)
+                out_degree_index.add_out_edges(max_diff_node_i, num_add)
+                for add_node_i in add_node_i_list:
+                    out_degree_index.add_node(add_node_i)
+
+            else:
+                # Fan-in
+                num_sources = rng.randint(1, self._max_in)
+                sources = out_degree_index.sample_spare_nodes(num_sources, rng)
+
+                add_node_i = G.number_of_nodes()
+                G.add_node(add_node_i)
+                out_degree_index.add_node(add_node_i)
+                for source_node_i in sources:
+                    G.add_edge(source_node_i, add_node_i)
+                    out_degree_index.add_out_edges(source_node_i)
+
+        # Add sink nodes (Optional)
+        if num_exit:
+            self._force_create_sink_nodes(G, num_exit)
+
+        # Ensure weakly connected (Optional)
+        if self._config.ensure_weakly_connected:
+            self._ensure_weakly_connected(G, True, bool(num_exit))
+
+        return G
+
+    def _search_max_diff_node(self, out_degree_index: "_OutDegreeIndex") -> Tuple[int, int]:
         """Search max difference node.
 
         Find the node with the biggest difference
         between its out-degree and max value of 'out-degree' parameter.
 
+        Parameters
+        ----------
+        out_degree_index : _OutDegreeIndex
+            Out-degree index of the DAG.
+
         Returns
         -------
         Tuple[int, int]
@@ -137,14 +144,67 @@ class FanInFanOutBuilder(DAGBuilderBase):
             - Difference size
 
         """
-        min_out_i = Util.get_min_out_node(G, G.nodes)
-        max_diff = self._max_out - G.out_degree(min_out_i)
+        min_out_i, min_out = out_degree_index.get_min_out_node()
+        max_diff = self._max_out - min_out
 
         return min_out_i, max_diff
 
-    def _init_dag(self, num_entry: int) -> nx.DiGraph:
+    def _init_dag(self, num_entry: int) -> Tuple[nx.DiGraph, "_OutDegreeIndex"]:
         G = nx.DiGraph()
+        out_degree_index = _OutDegreeIndex(self._max_out)
         for _ in range(num_entry):
+            out_degree_index.add_node(G.number_of_nodes())
             G.add_node(G.number_of_nodes())
 
-        return G
+        return G, out_degree_index
+
+
+class _OutDegreeIndex:
+    """Out-degree index class.
+
+    Keep the out-degrees of the nodes of a DAG under construction,
+    updated as nodes and edges are added.
+    A heap of (out-degree, node) gives the node with the minimum out-degree
+    (the first added one among ties) in O(log n),
+    and the nodes whose out-degree is less than 'max_out' are kept in a list
+    so that they can be sampled without scanning all nodes.
+
+    """
+
+    def __init__(self, max_out: int) -> None:
+        self._max_out = max_out
+        self._out_degrees: Dict[int, int] = {}
+        self._heap: List[Tuple[int, int]] = []
+        self._spare_nodes: List[int] = []
+        self._spare_positions: Dict[int, int] = {}
+
+    def add_node(self, node_i: int) -> None:
+        self._out_degrees[node_i] = 0
+        heapq.heappush(self._heap, (0, node_i))
+        if self._max_out > 0:
+            self._spare_positions[node_i] = len(self._spare_nodes)
+            self._spare_nodes.append(node_i)
+
+    def add_out_edges(self, node_i: int, num_edges: int = 1) -> None:
+        out_degree = self._out_degrees[node_i] + num_edges
+        self._out_degrees[node_i] = out_degree
+        heapq.heappush(self._heap, (out_degree, node_i))
+        if out_degree >= self._max_out and node_i in self._spare_positions:
+            # Swap with the last spare node and remove it.
+            position = self._spare_positions.pop(node_i)
+            last_node_i = self._spare_nodes.pop()
+            if last_node_i != node_i:
+                self._spare_nodes[position] = last_node_i
+                self._spare_positions[last_node_i] = position
+
+    def get_min_out_node(self) -> Tuple[int, int]:
+        """Get the node with the minimum out-degree and its out-degree."""
+        while True:
+            out_degree, node_i = self._heap[0]
+            if self._out_degrees[node_i] == out_degree:
+                return node_i, out_degree
+            heapq.heappop(self._heap)  # Outdated entry
+
+    def sample_spare_nodes(self, k: int, rng: random.Random) -> List[int]:
+        """Sample up to k nodes whose out-degree is less than 'max_out' without replacement."""
+        return rng.sample(self._spare_nodes, min(k, len(self._spare_nodes)))
@@ -1,8 +1,9 @@
 import random
 from logging import getLogger
-from typing import Generator
+from typing import Tuple
 
 import networkx as nx
+import numpy as np
 
 from ..common import Util
 from ..config import Config
@@ -13,7 +14,15 @@ logger = getLogger(__name__)
 
 
 class GNPBuilder(DAGBuilderBase):
-    """G(n, p) class."""
+    """G(n, p) class.
+
+    Each DAG is sampled from its own random number generator,
+    so the DAGs of a combination are not sampled in batches.
+
+    """
+
+    # Maximum expected out-degree n·p for which the edges are sampled by geometric skipping.
+    SPARSE_EXPECTED_DEGREE = 16
 
     def __init__(self, config: Config) -> None:
         super().__init__(config)
@@ -43,15 +52,20 @@ class GNPBuilder(DAGBuilderBase):
         if Util.get_option_max(config.probability_of_edge_existence) > 1.0:  # type: ignore
             logger.warning("'Probability of edge existence' > 1.0")
 
-    def build(self) -> Generator[nx.DiGraph, None, None]:
+    def build_dag(self, rng: random.Random) -> nx.DiGraph:
         """Build DAG using G(n, p) method.
 
         See https://hal.archives-ouvertes.fr/hal-00471255/file/ggen.pdf.
 
-        Yields
-        ------
-        Generator
-            DAG generator.
+        Parameters
+        ----------
+        rng : random.Random
+            Random number generator of the DAG.
+
+        Returns
+        -------
+        nx.DiGraph
+            DAG.
 
         Raises
         ------
@@ -59,49 +73,135 @@ class GNPBuilder(DAGBuilderBase):
             The number of build failures exceeded the maximum number of attempts.
 
         """
-        for _ in range(self._config.number_of_dags):
-            for try_i in range(1, self._max_try + 1):
-                # Determine number_of_nodes
-                num_nodes = Util.random_choice(self._config.number_of_nodes)
-                num_entry = self._config.number_of_source_nodes
-                if num_entry:
-                    num_entry = Util.random_choice(num_entry)
-                    num_nodes -= num_entry
-                num_exit = self._config.number_of_sink_nodes
-                if num_exit:
-                    num_exit = Util.random_choice(num_exit)
-                    num_nodes -= num_exit
-
-                # Initialize DAG
-                G = nx.DiGraph()
-                for i in range(num_nodes):
-                    G.add_node(G.number_of_nodes())
-
-                # Add edge
-                prob_edge = Util.random_choice(self._config.probability_of_edge_existence)
-                for i in range(num_nodes):
-                    for j in range(num_nodes):
-                        if random.randint(1, 100) < prob_edge * 100 and i < j:
-                            G.add_edge(i, j)
-
-                # Add source nodes (Optional)
-                if num_entry:
-                    self._force_create_source_nodes(G, num_entry)
-
-                # Add sink nodes (Optional)
-                if num_exit:
-                    self._force_create_sink_nodes(G, num_exit)
-
-                # Ensure weakly connected (Optional)
-                if self._config.ensure_weakly_connected:
-                    try:
-                        self._ensure_weakly_connected(G, bool(num_entry), bool(num_exit))
-                        break
-                    except BuildFailedError:
-                        if try_i == self._max_try:
-                            raise BuildFailedError(
-                                f"A DAG could not be built in {self._max_try} tries."
-                            )
-                        continue
-
-            yield G
+        for try_i in range(1, self._max_try + 1):
+            self.num_tries = try_i
+            # Determine number_of_nodes
+            num_nodes = Util.random_choice(self._config.number_of_nodes, rng)
+            num_entry = self._config.number_of_source_nodes
+            if num_entry:
+                num_entry = Util.random_choice(num_entry, rng)
+                num_nodes -= num_entry
+            num_exit = self._config.number_of_sink_nodes
+            if num_exit:
+                num_exit = Util.random_choice(num_exit, rng)
+                num_nodes -= num_exit
+
+            # Initialize DAG
+            G = nx.DiGraph()
+            G.add_nodes_from(range(num_nodes))
+
+            # Add edge
+            prob_edge = Util.random_choice(self._config.probability_of_edge_existence, rng)
+            self._add_random_edges(G, num_nodes, prob_edge, Util.create_numpy_rng(rng))
+
+            # Add source nodes (Optional)
+            if num_entry:
+                self._force_create_source_nodes(G, num_entry)
+
+            # Add sink nodes (Optional)
+            if num_exit:
+                self._force_create_sink_nodes(G, num_exit)
+
+            # Ensure weakly connected (Optional)
+            if self._config.ensure_weakly_connected:
+                try:
+                    self._ensure_weakly_connected(G, bool(num_entry), bool(num_exit))
+                except BuildFailedError:
+                    if try_i == self._max_try:
+                        raise BuildFailedError(
+                            f"A DAG could not be built in {self._max_try} tries."
+                        )
+                    self.instrumentation.count(f"{self.name}.retries")
+                    continue
+
+            break
+
+        return G
+
+    @classmethod
+    def _add_random_edges(
+        cls, G: nx.DiGraph, num_nodes: int, prob_edge: float, np_rng: np.random.Generator
+    ) -> None:
+        """Add each edge (i, j) with i < j independently with probability 'prob_edge'.
+
+        If n·p is small, the edges are sampled in O(n + m) by skipping over the pairs
+        (see _sample_sparse_pairs()).
+        Otherwise, the strict upper triangle of the adjacency matrix is drawn
+        in one batched Bernoulli operation.
+        Both give the same distribution of graphs.
+
+        Parameters
+        ----------
+        G : nx.DiGraph
+            Graph whose nodes are 0, ..., num_nodes - 1.
+        num_nodes : int
+            Number of nodes.
+        prob_edge : float
+            Probability of edge existence. Values greater than 1.0 are treated as 1.0.
+        np_rng : np.random.Generator
+            NumPy random number generator of the DAG.
+
+        """
+        if 0.0 < prob_edge < 1.0 and num_nodes * prob_edge <= cls.SPARSE_EXPECTED_DEGREE:
+            src, dst = cls._pair_index_to_edge(
+                cls._sample_sparse_pairs(num_nodes * (num_nodes - 1) // 2, prob_edge, np_rng),
+                num_nodes,
+            )
+        else:
+            src, dst = Util.get_upper_triangle(num_nodes)
+            exists = np_rng.random(src.size) < prob_edge
+            src, dst = src[exists], dst[exists]
+        G.add_edges_from(zip(src.tolist(), dst.tolist()))
+
+    @staticmethod
+    def _sample_sparse_pairs(
+        num_pairs: int, prob_edge: float, np_rng: np.random.Generator
+    ) -> np.ndarray:
+        """Sample the indices of the pairs having an edge by geometric skipping.
+
+        The gap between two consecutive successes of Bernoulli trials
+        follows the geometric distribution,
+        so only the successes are drawn instead of all 'num_pairs' trials.
+
+        Parameters
+        ----------
+        num_pairs : int
+            Number of pairs.
+        prob_edge : float
+            Probability of edge existence, in (0.0, 1.0).
+        np_rng : np.random.Generator
+            NumPy random number generator of the DAG.
+
+        Returns
+        -------
+        np.ndarray
+            Sorted indices of the pairs.
+
+        """
+        indices = []
+        last = -1
+        while last < num_pairs:
+            expected = (num_pairs - last - 1) * prob_edge
+            batch_size = int(expected + 4 * np.sqrt(expected)) + 16
+            batch = last + np.cumsum(np_rng.geometric(prob_edge, batch_size))
+            indices.append(batch[batch < num_pairs])
+            last = int(batch[-1])
+
+        return np.concatenate(indices)
+
+    @staticmethod
+    def _pair_index_to_edge(indices: np.ndarray, num_nodes: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Convert indices of the strict upper triangle in row-major order to (i, j).
+
+        Row i starts at index i * (2n - i - 1) / 2.
+
+        """
+        indices = indices.astype(np.int64)
+        n2 = 2 * num_nodes - 1
+        src = ((n2 - np.sqrt(np.maximum(n2 * n2 - 8 * indices, 0))) // 2).astype(np.int64)
+        # Correct the rounding errors of sqrt().
+        src -= (src * (n2 - src)) // 2 > indices
+        src += ((src + 1) * (n2 - src - 1)) // 2 <= indices
+        dst = indices - (src * (n2 - src)) // 2 + src + 1
+
+        return src, dst
@@ -1,18 +1,28 @@
 import json
 import subprocess
+from typing import List
 
 import networkx as nx
 import yaml
 from networkx.readwrite import json_graph
 
+from ..common import NULL_INSTRUMENTATION
 from ..config import Config
 
 
 class DAGExporter:
-    """DAG exporter class."""
+    """DAG exporter class.
+
+    Attributes
+    ----------
+    instrumentation : Instrumentation
+        Instrumentation that measures each output format, by default NULL_INSTRUMENTATION.
+
+    """
 
     def __init__(self, config: Config) -> None:
         self._config = config
+        self.instrumentation = NULL_INSTRUMENTATION
 
     def export(self, dag: nx.DiGraph, dest_dir: str, file_name: str) -> None:
         """Export DAG.
@@ -31,7 +41,40 @@ class DAGExporter:
         if self._config.figure:
             self._export_fig(dag, dest_dir, file_name)
         if self._config.export_constraints:
-            self._export_constraints(dag, dest_dir, file_name)
+            with self.instrumentation.measure("formats", "txt"):
+                self._export_constraints(dag, dest_dir, file_name)
+
+    def get_file_names(self, file_name: str) -> List[str]:
+        """Get names of all files exported for a DAG.
+
+        Parameters
+        ----------
+        file_name : str
+            File name passed to export().
+
+        Returns
+        -------
+        List[str]
+            File names with extensions.
+
+        """
+        extensions = [
+            ext
+            for ext, enabled in [
+                ("yaml", self._config.yaml),
+                ("json", self._config.json),
+                ("dot", self._config.dot),
+                ("xml", self._config.xml),
+                ("png", self._config.png),
+                ("svg", self._config.svg),
+                ("pdf", self._config.pdf),
+                ("eps", self._config.eps),
+                ("txt", self._config.export_constraints),
+            ]
+            if enabled
+        ]
+
+        return [f"{file_name}.{ext}" for ext in extensions]
 
     def _export_dag(self, dag: nx.DiGraph, dest_dir: str, file_name: str) -> None:
         """Export DAG description file.
@@ -49,23 +92,27 @@ class DAGExporter:
 
         """
         if self._config.yaml:
-            data = json_graph.node_link_data(dag)
-            s = json.dumps(data)
-            dic = json.loads(s)
-            with open(f"{dest_dir}/{file_name}.yaml", "w") as f:
-                yaml.dump(dic, f)
+            with self.instrumentation.measure("formats", "yaml"):
+                data = json_graph.node_link_data(dag)
+                s = json.dumps(data)
+                dic = json.loads(s)
+                with open(f"{dest_dir}/{file_name}.yaml", "w") as f:
+                    yaml.dump(dic, f)
 
         if self._config.json:
-            data = json_graph.node_link_data(dag)
-            s = json.dumps(data)
-            with open(f"{dest_dir}/{file_name}.json", "w") as f:
-                json.dump(s, f)
+            with self.instrumentation.measure("formats", "json"):
+                data = json_graph.node_link_data(dag)
+                s = json.dumps(data)
+                with open(f"{dest_dir}/{file_name}.json", "w") as f:
+                    json.dump(s, f)
 
         if self._config.dot:
-            nx.drawing.nx_pydot.write_dot(dag, f"{dest_dir}/{file_name}.dot")
+            with self.instrumentation.measure("formats", "dot"):
+                nx.drawing.nx_pydot.write_dot(dag, f"{dest_dir}/{file_name}.dot")
 
         if self._config.xml:
-            nx.write_graphml_xml(dag, f"{dest_dir}/{file_name}.xml")
+            with self.instrumentation.measure("formats", "xml"):
+                nx.write_graphml_xml(dag, f"{dest_dir}/{file_name}.xml")
 
     def _export_fig(self, dag: nx.DiGraph, dest_dir: str, file_name: str) -> None:
         """Export DAG figure.
@@ -134,18 +181,22 @@ class DAGExporter:
         # Export
         pdot = nx.drawing.nx_pydot.to_pydot(dag)
         if self._config.png:
-            pdot.write_png(f"{dest_dir}/{file_name}.png")
+            with self.instrumentation.measure("formats", "png"):
+                pdot.write_png(f"{dest_dir}/{file_name}.png")
         if self._config.svg:
-            pdot.write_svg(f"{dest_dir}/{file_name}.svg")
+            with self.instrumentation.measure("formats", "svg"):
+                pdot.write_svg(f"{dest_dir}/{file_name}.svg")
         if self._config.pdf:
-            pdot.write_pdf(f"{dest_dir}/{file_name}.pdf")
+            with self.instrumentation.measure("formats", "pdf"):
+                pdot.write_pdf(f"{dest_dir}/{file_name}.pdf")
         if self._config.eps:
-            pdot.write_ps(f"{dest_dir}/{file_name}.ps")
-            subprocess.run(
-                f"eps2eps {dest_dir}/{file_name}.ps {dest_dir}/{file_name}.eps \
-                && rm {dest_dir}/{file_name}.ps",
-                shell=True,
-            )
+            with self.instrumentation.measure("formats", "eps"):
+                pdot.write_ps(f"{dest_dir}/{file_name}.ps")
+                subprocess.run(
+                    f"eps2eps {dest_dir}/{file_name}.ps {dest_dir}/{file_name}.eps \
+                    && rm {dest_dir}/{file_name}.ps",
+                    shell=True,
+                )
 
     def _export_constraints(self, dag: nx.DiGraph, dest_dir: str, file_name: str) -> None:
         """Export constraints.
@@ -0,0 +1,18 @@
+from .build_stats import BuildStats
+from .cost_estimator import CostEstimator
+from .dag_set_generator import DAGSetGenerator
+from .manifest import Manifest
+from .shard import Shard, ShardMerger
+from .stream import generate
+from .structure_cache import StructureCache
+
+__all__ = [
+    "BuildStats",
+    "CostEstimator",
+    "DAGSetGenerator",
+    "Manifest",
+    "Shard",
+    "ShardMerger",
+    "StructureCache",
+    "generate",
+]
@@ -0,0 +1,127 @@
+import math
+import threading
+from typing import Optional
+
+
+class BuildStats:
+    """Build statistics class.
+
+    Track the build attempts and failures of the DAGs of a combination
+    and estimate the probability that one attempt succeeds.
+    Since a DAG fails only when all of its 'max_try' attempts fail,
+    the probability that a DAG can be built is 1 - (1 - q)^max_try
+    for the success probability q of one attempt.
+    If its upper confidence bound falls below 'min_success_rate',
+    reaching 'Number of DAGs' is considered infeasible
+    and the remaining DAGs of the combination are skipped.
+
+    """
+
+    # z-score of the one-sided 95% confidence bound.
+    Z = 1.645
+
+    def __init__(self, max_try: int, min_success_rate: Optional[float] = None) -> None:
+        """Constructor.
+
+        Parameters
+        ----------
+        max_try : int
+            Maximum number of build attempts for a single DAG.
+        min_success_rate : Optional[float], optional
+            Minimum probability that a DAG can be built,
+            by default None (i.e., no DAG is skipped).
+
+        """
+        self._lock = threading.Lock()
+        self._max_try = max_try
+        self._min_success_rate = min_success_rate
+        self.num_dags = 0
+        self.num_failures = 0
+        self.num_attempts = 0
+        self.num_skipped = 0
+
+    def add(self, num_tries: int, succeeded: bool) -> None:
+        """Record a built or failed DAG.
+
+        Parameters
+        ----------
+        num_tries : int
+            Number of build attempts of the DAG.
+        succeeded : bool
+            Whether the DAG was built.
+
+        """
+        with self._lock:
+            self.num_dags += 1
+            self.num_attempts += num_tries
+            if not succeeded:
+                self.num_failures += 1
+
+    def skip(self) -> bool:
+        """Check whether the next DAG should be skipped, and count it if so.
+
+        Returns
+        -------
+        bool
+            Whether the combination was judged infeasible.
+
+        """
+        with self._lock:
+            if (
+                self._min_success_rate is None
+                or self.num_failures == 0
+                or self._get_success_rate_upper_bound() >= self._min_success_rate
+            ):
+                return False
+            self.num_skipped += 1
+            return True
+
+    @property
+    def expected_builds_per_success(self) -> Optional[float]:
+        """Observed number of build attempts per built DAG, or None if no DAG was built."""
+        num_successes = self.num_dags - self.num_failures
+        return self.num_attempts / num_successes if num_successes else None
+
+    def _get_success_rate_upper_bound(self) -> float:
+        # Wilson score upper bound of the success probability of one attempt.
+        n = self.num_attempts
+        q = (self.num_dags - self.num_failures) / n
+        z2 = self.Z**2
+        q_upper = (
+            q + z2 / (2 * n) + self.Z * math.sqrt(q * (1 - q) / n + z2 / (4 * n * n))
+        ) / (1 + z2 / n)
+
+        return 1 - (1 - min(q_upper, 1.0)) ** self._max_try
+
+    def merge(self, summary: dict) -> None:
+        """Add a summary created by to_dict().
+
+        Parameters
+        ----------
+        summary : dict
+            Summary of another DAG set generator of the same combination.
+
+        """
+        with self._lock:
+            self.num_dags += summary["dags"]
+            self.num_failures += summary["failures"]
+            self.num_attempts += summary["attempts"]
+            self.num_skipped += summary["skipped"]
+
+    def to_dict(self) -> dict:
+        """Get the machine-readable summary.
+
+        Returns
+        -------
+        dict
+            {'dags', 'failures', 'attempts', 'skipped', 'expected_builds_per_success'}
+
+        """
+        with self._lock:
+            return {
+                "dags": self.num_dags,
+                "failures": self.num_failures,
+                "attempts": self.num_attempts,
+                "skipped": self.num_skipped,
+                "expected_builds_per_success": self.expected_builds_per_success,
+            }
@@ -0,0 +1,232 @@
+import os
+import statistics
+import tempfile
+import time
+import tracemalloc
+from typing import Dict, List, Optional
+
+import networkx as nx
+
+from ..config import ComboGenerator, Config
+from ..dag_exporter import DAGExporter
+from ..exceptions import BuildFailedError
+from .dag_set_generator import DAGSetGenerator
+
+
+class CostEstimator:
+    """Cost estimator class.
+
+    Estimate the cost of a generation before running it,
+    by generating a few sample DAGs per combination and extrapolating to 'Number of DAGs'.
+    The number of paths enumerated by 'End-to-end deadline' and by the 'Pathways' constraint
+    grows exponentially with the density of the DAG,
+    so it is counted on the sample structures first,
+    and the property setting and export of pathological samples are skipped.
+
+    """
+
+    # Number of enumerated paths above which a setting is considered pathological.
+    PATH_LIMIT = 10**6
+
+    def __init__(self, config_raw: dict, num_samples: int = 3) -> None:
+        """Constructor.
+
+        Parameters
+        ----------
+        config_raw : dict
+            Validated raw config.
+        num_samples : int, optional
+            Number of sample DAGs per combination, by default 3.
+
+        """
+        self._combo_gen = ComboGenerator(config_raw)
+        self._num_samples = num_samples
+
+    def estimate(self, max_workers: int = 1) -> dict:
+        """Estimate the cost of the generation.
+
+        Parameters
+        ----------
+        max_workers : int, optional
+            Number of workers used to estimate the wall time, by default 1.
+
+        Returns
+        -------
+        dict
+            {'total': {...}, 'combinations': {combo_dir_name: {...}}, 'warnings': [...]}
+            Times are in seconds and sizes in bytes.
+            'serial_time' is the wall time on one worker, including Graphviz subprocesses.
+            'serial_time', 'wall_time' and 'disk' are None
+            if a pathological setting prevents the estimation.
+            'peak_memory' assumes that each worker generates one DAG at a time.
+
+        """
+        combinations: Dict[str, dict] = {}
+        warnings: List[str] = []
+        for combo_dir_name, _, config in self._combo_gen.get_combo_iter():
+            combinations[combo_dir_name] = self._estimate_combination(config, warnings)
+
+        return {
+            "total": {
+                "number_of_combinations": max(1, self._combo_gen.get_num_combos()),
+                "number_of_dags": sum(c["number_of_dags"] for c in combinations.values()),
+                "nodes": sum(c["nodes"] for c in combinations.values()),
+                "edges": sum(c["edges"] for c in combinations.values()),
+                "serial_time": self._sum_or_none(
+                    c["serial_time"] for c in combinations.values()
+                ),
+                "wall_time": self._div_or_none(
+                    self._sum_or_none(c["serial_time"] for c in combinations.values()),
+                    max_workers,
+                ),
+                "disk": self._sum_disk([c["disk"] for c in combinations.values()]),
+                "peak_memory": max_workers
+                * max((c["peak_memory_per_dag"] for c in combinations.values()), default=0),
+            },
+            "combinations": combinations,
+            "warnings": warnings,
+        }
+
+    def _estimate_combination(self, config: Config, warnings: List[str]) -> dict:
+        dag_set_generator = DAGSetGenerator(config)
+        dag_exporter = DAGExporter(config)
+        num_dags = config.number_of_dags
+
+        nodes: List[int] = []
+        edges: List[int] = []
+        times: List[float] = []
+        sizes: Dict[str, List[int]] = {}
+        max_paths = 0
+        max_pathways = 0
+        pathological = False
+        for dag_index in range(min(self._num_samples, num_dags)):
+            # Wall time, since figures are exported by Graphviz subprocesses.
+            start = time.perf_counter()
+            try:
+                dag = dag_set_generator.build(dag_index)
+            except BuildFailedError:
+                continue
+            build_time = time.perf_counter() - start
+            nodes.append(dag.number_of_nodes())
+            edges.append(dag.number_of_edges())
+
+            # Count the paths before they are enumerated.
+            paths = self._count_source_to_sink_paths(dag)
+            pathways = self._count_pathways(dag)
+            max_paths = max(max_paths, paths)
+            max_pathways = max(max_pathways, pathways)
+            if (config.end_to_end_deadline and paths > self.PATH_LIMIT) or (
+                self._has_pathways(config) and pathways > self.PATH_LIMIT
+            ):
+                pathological = True
+                continue
+
+            start = time.perf_counter()
+            dag_set_generator.set_properties(dag, dag_index)
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                # pydot raises OSError if Graphviz is missing
+                # and AssertionError if Graphviz fails.
+                try:
+                    dag_exporter.export(dag, tmp_dir, "dag")
+                except (OSError, AssertionError) as e:
+                    warnings.append(f"A sample DAG could not be exported: {e}")
+                for file_name in os.listdir(tmp_dir):
+                    ext = os.path.splitext(file_name)[1].lstrip(".")
+                    sizes.setdefault(ext, []).append(os.path.getsize(f"{tmp_dir}/{file_name}"))
+            times.append(build_time + time.perf_counter() - start)
+
+        if config.end_to_end_deadline and max_paths > self.PATH_LIMIT:
+            warnings.append(
+                f"'End-to-end deadline' enumerates up to {max_paths} paths per DAG "
+                f"(Number of nodes: {config.number_of_nodes}, "
+                f"Probability of edge existence: {config.probability_of_edge_existence})."
+            )
+        if self._has_pathways(config) and max_pathways > self.PATH_LIMIT:
+            warnings.append(
+                f"'Pathways' of 'Export constraints' enumerates up to {max_pathways} paths "
+                f"per DAG (Number of nodes: {config.number_of_nodes})."
+            )
+        if not nodes:
+            warnings.append(
+                f"No sample DAG could be built in combination {config.combination_index}."
+            )
+
+        peak_memory = 0 if pathological else self._measure_peak_memory(dag_set_generator)
+
+        return {
+            "number_of_dags": num_dags,
+            "nodes": round(statistics.mean(nodes) * num_dags) if nodes else 0,
+            "edges": round(statistics.mean(edges) * num_dags) if edges else 0,
+            "max_paths_per_dag": max_paths,
+            "serial_time": None
+            if pathological or not times
+            else statistics.mean(times) * num_dags,
+            "disk": None
+            if pathological
+            else {ext: round(statistics.mean(s) * num_dags) for ext, s in sorted(sizes.items())},
+            "peak_memory_per_dag": peak_memory,
+        }
+
+    def _measure_peak_memory(self, dag_set_generator: DAGSetGenerator) -> int:
+        """Measure the peak memory to generate the first DAG.
+
+        It is measured separately because tracemalloc slows down the generation.
+
+        """
+        tracemalloc.start()
+        try:
+            dag = dag_set_generator.build(0)
+            dag_set_generator.set_properties(dag, 0)
+        except BuildFailedError:
+            pass
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        return peak_memory
+
+    @staticmethod
+    def _has_pathways(config: Config) -> bool:
+        return bool(config.export_constraints and config.export_constraints.get("Pathways"))
+
+    @staticmethod
+    def _count_source_to_sink_paths(dag: nx.DiGraph) -> int:
+        """Count the paths from all source nodes to all sink nodes without enumerating them."""
+        num_paths: Dict[int, int] = {}
+        total = 0
+        for node_i in nx.topological_sort(dag):
+            num_paths[node_i] = sum(num_paths[pred_i] for pred_i in dag.predecessors(node_i)) or 1
+            if dag.out_degree(node_i) == 0:
+                total += num_paths[node_i]
+
+        return total
+
+    @staticmethod
+    def _count_pathways(dag: nx.DiGraph) -> int:
+        """Count the paths from all nodes to all sink nodes without enumerating them."""
+        num_paths: Dict[int, int] = {}
+        for node_i in reversed(list(nx.topological_sort(dag))):
+            num_paths[node_i] = sum(num_paths[succ_i] for succ_i in dag.successors(node_i)) or 1
+
+        return sum(num_paths.values())
+
+    @staticmethod
+    def _sum_or_none(values) -> Optional[float]:
+        values = list(values)
+        if any(v is None for v in values):
+            return None
+        return sum(values)
+
+    @staticmethod
+    def _div_or_none(value: Optional[float], divisor: int) -> Optional[float]:
+        return None if value is None else value / divisor
+
+    @staticmethod
+    def _sum_disk(all_disk: List[Optional[Dict[str, int]]]) -> Optional[Dict[str, int]]:
+        if any(disk is None for disk in all_disk):
+            return None
+        total: Dict[str, int] = {}
+        for disk in all_disk:
+            for ext, size in disk.items():  # type: ignore
+                total[ext] = total.get(ext, 0) + size
+
+        return total
@@ -0,0 +1,265 @@
+import threading
+from logging import getLogger
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import networkx as nx
+
+from ..common import NULL_INSTRUMENTATION, Instrumentation
+from ..config import Config
+from ..dag_builder import DAGBuilderBase, DAGBuilderFactory
+from ..dag_exporter import DAGExporter
+from ..exceptions import BuildFailedError
+from ..property_setter import PropertySetterBase, PropertySetterFactory
+from .build_stats import BuildStats
+from .pipeline import Pipeline
+from .structure_cache import BuiltStructure, StructureCache
+
+logger = getLogger(__name__)
+
+# (dag_index, DAG or None if it failed to build, whether it was skipped)
+_BuildResult = Tuple[int, Optional[nx.DiGraph], bool]
+
+
+class DAGSetGenerator:
+    """DAG set generator class.
+
+    Build all DAGs of one combination, set all properties and export them.
+    The i-th DAG depends only on the combination config and i,
+    so DAGs can be generated in any order and in any worker process.
+
+    """
+
+    def __init__(
+        self,
+        config: Config,
+        stage_workers: Optional[Sequence[int]] = None,
+        queue_size: int = 1,
+        structure_cache: Optional[StructureCache] = None,
+        instrumentation: Optional[Instrumentation] = None,
+        min_success_rate: Optional[float] = None,
+    ) -> None:
+        """Constructor.
+
+        Parameters
+        ----------
+        config : Config
+            Config of one combination.
+        stage_workers : Optional[Sequence[int]], optional
+            Number of worker threads for building, property setting and exporting.
+            If specified, export() runs the three stages concurrently as a pipeline,
+            by default None (i.e., each DAG is exported before the next one is built).
+        queue_size : int, optional
+            Maximum number of DAGs waiting in front of each pipeline stage, by default 1.
+        structure_cache : Optional[StructureCache], optional
+            Cache shared with the generators of combinations with the same structure index,
+            by default None (i.e., every structure is built).
+        instrumentation : Optional[Instrumentation], optional
+            Instrumentation that records the time of each stage, builder, setter and format,
+            by default None (i.e., nothing is recorded).
+        min_success_rate : Optional[float], optional
+            Minimum probability that a DAG can be built.
+            Once the observed failures show that the probability is lower,
+            the remaining DAGs are skipped and left out of the manifest,
+            by default None (i.e., every DAG is tried).
+
+        """
+        self._config = config
+        self._instrumentation = instrumentation or NULL_INSTRUMENTATION
+        self._dag_builder = self._create_dag_builder()
+        self.build_stats = BuildStats(self._dag_builder.max_try, min_success_rate)
+        self._all_setter = self._create_all_setter(config)
+        self._dag_exporter = DAGExporter(config)
+        self._dag_exporter.instrumentation = self._instrumentation
+        self._stage_workers = stage_workers
+        self._queue_size = queue_size
+        self._structure_cache = structure_cache
+        self._local = threading.local()
+
+    def generate(self, dag_index: int) -> nx.DiGraph:
+        """Build a DAG and set all properties.
+
+        Parameters
+        ----------
+        dag_index : int
+            Index of DAG in the combination.
+
+        Returns
+        -------
+        nx.DiGraph
+            DAG.
+
+        Raises
+        ------
+        BuildFailedError
+            The number of build failures exceeded the maximum number of attempts.
+
+        """
+        dag = self.build(dag_index)
+        self.set_properties(dag, dag_index)
+
+        return dag
+
+    def build(self, dag_index: int) -> nx.DiGraph:
+        """Build the structure of a DAG without properties.
+
+        Parameters
+        ----------
+        dag_index : int
+            Index of DAG in the combination.
+
+        Returns
+        -------
+        nx.DiGraph
+            DAG.
+
+        Raises
+        ------
+        BuildFailedError
+            The number of build failures exceeded the maximum number of attempts.
+
+        """
+        return self._dag_builder.build_dag(self._config.create_structure_rng(dag_index))
+
+    def set_properties(self, dag: nx.DiGraph, dag_index: int) -> None:
+        """Set all properties of a DAG.
+
+        Parameters
+        ----------
+        dag : nx.DiGraph
+            DAG built by build().
+        dag_index : int
+            Index of DAG in the combination.
+
+        """
+        self._set((dag_index, dag, False))
+
+    def export(
+        self, dest_dir: str, dag_indices: Optional[Iterable[int]] = None
+    ) -> Dict[int, Optional[List[str]]]:
+        """Generate and export DAGs.
+
+        Parameters
+        ----------
+        dest_dir : str
+            Destination directory of the combination.
+        dag_indices : Optional[Iterable[int]], optional
+            Indices of DAGs to be exported, by default all DAGs of the combination.
+
+        Returns
+        -------
+        Dict[int, Optional[List[str]]]
+            Names of the exported files for each DAG index.
+            The list is empty if the DAG failed to build,
+            and None if the DAG was skipped because of 'min_success_rate'.
+
+        """
+        if dag_indices is None:
+            dag_indices = range(self._config.number_of_dags)
+
+        def export_dag(item: _BuildResult) -> Tuple[int, Optional[List[str]]]:
+            i, dag, skipped = item
+            if skipped:
+                return i, None
+            if dag is None:
+                return i, []
+            with self._instrumentation.measure("stages", "export"):
+                self._dag_exporter.export(dag, dest_dir, f"dag_{i}")
+            self._instrumentation.count("dags")
+            return i, self._dag_exporter.get_file_names(f"dag_{i}")
+
+        if self._stage_workers:
+            stages = list(zip([self._build_in_thread, self._set, export_dag], self._stage_workers))
+            results = Pipeline(stages, self._queue_size).run(dag_indices)
+        else:
+            results = [export_dag(self._set(self._build(i))) for i in dag_indices]
+
+        return dict(sorted(results))
+
+    def _build(
+        self, dag_index: int, dag_builder: Optional[DAGBuilderBase] = None
+    ) -> _BuildResult:
+        if self.build_stats.skip():
+            self._instrumentation.count("build_skips")
+            if self._structure_cache is not None:
+                self._structure_cache.release(dag_index)
+            return dag_index, None, True
+
+        def build_structure() -> BuiltStructure:
+            builder = dag_builder or self._dag_builder
+            rng = self._config.create_structure_rng(dag_index)
+            try:
+                with self._instrumentation.measure("stages", "build"):
+                    with self._instrumentation.measure("builders", builder.name):
+                        dag = builder.build_dag(rng)
+            except BuildFailedError as e:
+                logger.warning(e.message)
+                return None, builder.num_tries
+
+            return dag, builder.num_tries
+
+        # A structure shared via the cache is built once,
+        # but its outcome is recorded by every combination that uses it.
+        if self._structure_cache is not None:
+            dag, num_tries = self._structure_cache.get(dag_index, build_structure)
+        else:
+            dag, num_tries = build_structure()
+        if dag is None:
+            self._instrumentation.count("build_failures")
+        self.build_stats.add(num_tries, dag is not None)
+
+        return dag_index, dag, False
+
+    def _build_in_thread(self, dag_index: int) -> _BuildResult:
+        # Builders keep state while building a DAG, so each thread has its own builder.
+        if not hasattr(self._local, "dag_builder"):
+            self._local.dag_builder = self._create_dag_builder()
+
+        return self._build(dag_index, self._local.dag_builder)
+
+    def _set(self, item: _BuildResult) -> _BuildResult:
+        dag_index, dag, _ = item
+        if dag is not None:
+            rng = self._config.create_property_rng(dag_index)
+            with self._instrumentation.measure("stages", "set"):
+                for setter in self._all_setter:
+                    with self._instrumentation.measure("setters", type(setter).__name__):
+                        setter.set(dag, rng)
+
+        return item
+
+    def _create_dag_builder(self) -> DAGBuilderBase:
+        dag_builder = DAGBuilderFactory.create_instance(self._config)
+        dag_builder.instrumentation = self._instrumentation
+
+        return dag_builder
+
+    @staticmethod
+    def _create_all_setter(config: Config) -> List[PropertySetterBase]:
+        all_setter: List[PropertySetterBase] = []
+        # Create setters for utilization, period, execution time and communication time.
+        if config.multi_rate:
+            all_setter.append(PropertySetterFactory.create_utilization_setter(config))
+        elif config.execution_time:
+            all_setter.append(
+                PropertySetterFactory.create_random_setter(config, "Execution time", "node")
+            )
+        # HACK: RD-Gen assumes that 'Multi-rate' and 'CCR' are never specified at the same time.
+        #       If 'Multi-rate' and 'CCR' are specified at the same time,
+        #       the utilization rate is not protected.
+        if config.ccr:
+            all_setter.append(PropertySetterFactory.create_ccr_setter(config))
+        elif config.communication_time:
+            all_setter.append(
+                PropertySetterFactory.create_random_setter(config, "Communication time", "edge")
+            )
+        # Create setter for end-to-end deadline.
+        if config.end_to_end_deadline:
+            all_setter.append(PropertySetterFactory.create_deadline_setter(config))
+        # Create setter for offset.
+        if config.offset:
+            all_setter.append(PropertySetterFactory.create_random_setter(config, "Offset", "node"))
+        # Create setter for additional properties.
+        if config.additional_properties:
+            all_setter.append(PropertySetterFactory.create_additional_setter(config))
+
+        return all_setter
@@ -0,0 +1,147 @@
+import glob
+import hashlib
+import json
+import os
+from typing import Dict, List, Optional, Tuple
+
+from .shard import Shard
+
+ManifestRecord = Tuple[str, int, Dict[str, str]]
+
+
+class Manifest:
+    """Manifest class.
+
+    Record the finished DAGs of a generation in dest_dir
+    so that an interrupted generation can be resumed.
+    Each line of the manifest is a JSON object of one finished DAG:
+    the combination directory, the DAG index and the SHA-256 of each exported file.
+    A DAG that failed to build is recorded without files,
+    since it fails again with the same random number stream.
+    A DAG skipped because of a low success rate is not recorded,
+    so a resumed generation tries it again.
+
+    """
+
+    def __init__(self, dest_dir: str, shard: Optional[Shard] = None) -> None:
+        """Constructor.
+
+        Parameters
+        ----------
+        dest_dir : str
+            Destination directory.
+        shard : Optional[Shard], optional
+            Shard to be generated.
+            Shards sharing dest_dir write to their own manifests.
+
+        """
+        self._dest_dir = dest_dir
+        file_name = f"manifest_{shard.index}_{shard.count}.jsonl" if shard else "manifest.jsonl"
+        self._path = f"{dest_dir}/{file_name}"
+        self._dags: Dict[Tuple[str, int], Dict[str, str]] = {}
+
+    def load(self) -> None:
+        """Load all manifests in dest_dir.
+
+        A line left incomplete by an interruption is ignored.
+
+        """
+        for path in sorted(glob.glob(f"{self._dest_dir}/manifest*.jsonl")):
+            with open(path) as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    self._dags[(record["combination"], record["dag"])] = record["files"]
+
+    def is_finished(self, combo_dir_name: str, dag_index: int) -> bool:
+        """Check whether a DAG has been exported and its files are unchanged.
+
+        Parameters
+        ----------
+        combo_dir_name : str
+            Name of the combination directory.
+        dag_index : int
+            Index of the DAG.
+
+        Returns
+        -------
+        bool
+            Whether the DAG can be skipped.
+
+        """
+        files = self._dags.get((combo_dir_name, dag_index))
+        if files is None:
+            return False
+
+        combo_dest_dir = f"{self._dest_dir}/{combo_dir_name}"
+        for file_name, digest in files.items():
+            path = f"{combo_dest_dir}/{file_name}"
+            if not os.path.isfile(path) or self.hash_file(path) != digest:
+                return False
+
+        return True
+
+    def add(self, records: List[ManifestRecord]) -> None:
+        """Append finished DAGs to the manifest.
+
+        Parameters
+        ----------
+        records : List[ManifestRecord]
+            (combo_dir_name, dag_index, {file_name: SHA-256})
+
+        """
+        with open(self._path, "a") as f:
+            for combo_dir_name, dag_index, files in records:
+                self._dags[(combo_dir_name, dag_index)] = files
+                f.write(
+                    json.dumps({"combination": combo_dir_name, "dag": dag_index, "files": files})
+                    + "\n"
+                )
+            f.flush()
+            os.fsync(f.fileno())
+
+    @staticmethod
+    def create_records(
+        combo_dest_dir: str, exported: Dict[int, Optional[List[str]]]
+    ) -> List[ManifestRecord]:
+        """Create manifest records of exported DAGs.
+
+        Parameters
+        ----------
+        combo_dest_dir : str
+            Destination directory of the combination.
+        exported : Dict[int, Optional[List[str]]]
+            Names of the exported files for each DAG index.
+            None if the DAG was skipped, which is not recorded.
+
+        Returns
+        -------
+        List[ManifestRecord]
+            (combo_dir_name, dag_index, {file_name: SHA-256})
+
+        """
+        combo_dir_name = os.path.basename(combo_dest_dir)
+        return [
+            (
+                combo_dir_name,
+                dag_index,
+                {
+                    file_name: Manifest.hash_file(f"{combo_dest_dir}/{file_name}")
+                    for file_name in file_names
+                    if os.path.isfile(f"{combo_dest_dir}/{file_name}")
+                },
+            )
+            for dag_index, file_names in exported.items()
+            if file_names is not None
+        ]
+
+    @staticmethod
+    def hash_file(path: str) -> str:
+        sha256 = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 16), b""):
+                sha256.update(block)
+
+        return sha256.hexdigest()
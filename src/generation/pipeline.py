@@ -0,0 +1,119 @@
+import queue
+import threading
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+
+_END = object()
+
+
+class Pipeline:
+    """Pipeline class.
+
+    Pass items through stages connected by bounded queues.
+    Each stage has its own pool of worker threads,
+    so that the stages run concurrently
+    (e.g., DAGs are exported by subprocesses while the next DAGs are being built).
+    Since the queues are bounded, a slow stage blocks the preceding stages
+    and the number of items in flight stays constant.
+
+    """
+
+    def __init__(self, stages: List[Tuple[Callable[[Any], Any], int]], queue_size: int = 1) -> None:
+        """Constructor.
+
+        Parameters
+        ----------
+        stages : List[Tuple[Callable[[Any], Any], int]]
+            (function, number_of_workers) of each stage.
+            The function receives the output of the previous stage.
+        queue_size : int, optional
+            Maximum number of items waiting in front of each stage, by default 1.
+
+        Raises
+        ------
+        ValueError
+            A stage has no worker or queue_size is less than 1.
+
+        """
+        if any(num_workers < 1 for _, num_workers in stages) or queue_size < 1:
+            raise ValueError("Each stage needs at least one worker and queue_size must be >= 1.")
+        self._stages = stages
+        self._queue_size = queue_size
+
+    def run(self, items: Iterable[Any]) -> List[Any]:
+        """Pass all items through the stages.
+
+        Parameters
+        ----------
+        items : Iterable[Any]
+            Inputs of the first stage.
+
+        Returns
+        -------
+        List[Any]
+            Outputs of the last stage in order of completion.
+
+        Raises
+        ------
+        BaseException
+            The first exception raised in a stage.
+            The remaining items are discarded.
+
+        """
+        queues: List[queue.Queue] = [
+            queue.Queue(maxsize=self._queue_size) for _ in range(len(self._stages))
+        ]
+        results: List[Any] = []
+        errors: List[BaseException] = []
+
+        all_workers = []
+        for stage_i, (func, num_workers) in enumerate(self._stages):
+            out_queue = queues[stage_i + 1] if stage_i + 1 < len(queues) else None
+            workers = [
+                threading.Thread(
+                    target=self._work,
+                    args=(func, queues[stage_i], out_queue, results, errors),
+                    daemon=True,
+                )
+                for _ in range(num_workers)
+            ]
+            for worker in workers:
+                worker.start()
+            all_workers.append(workers)
+
+        for item in items:
+            if errors:
+                break
+            queues[0].put(item)
+
+        # Close the stages in order.
+        for stage_i, workers in enumerate(all_workers):
+            for _ in workers:
+                queues[stage_i].put(_END)
+            for worker in workers:
+                worker.join()
+
+        if errors:
+            raise errors[0]
+
+        return results
+
+    @staticmethod
+    def _work(
+        func: Callable[[Any], Any],
+        in_queue: queue.Queue,
+        out_queue: Optional[queue.Queue],
+        results: List[Any],
+        errors: List[BaseException],
+    ) -> None:
+        while (item := in_queue.get()) is not _END:
+            if errors:
+                continue  # Drain the queue so that the preceding stages are not blocked.
+            try:
+                output = func(item)
+            except BaseException as e:
+                errors.append(e)
+                continue
+            if out_queue is None:
+                results.append(output)
+            else:
+                out_queue.put(output)
@@ -0,0 +1,256 @@
+import filecmp
+import json
+import os
+import re
+import shutil
+from typing import Dict, List, Set, Tuple
+
+from ..common import Instrumentation
+from ..config import ComboGenerator
+from .build_stats import BuildStats
+
+DAG_FILE_PATTERN = re.compile(r"^dag_(\d+)[._]")
+INSTRUMENTATION_FILE_NAME = "instrumentation.json"
+
+
+class Shard:
+    """Shard class.
+
+    Deterministically partition the (combination index, DAG index) space
+    so that independent nodes generate disjoint slices of the same directory layout.
+    The DAGs are numbered through all combinations
+    and dealt to the shards in turn, which balances the shards
+    even when the combinations differ in cost.
+
+    """
+
+    def __init__(self, index: int, count: int) -> None:
+        """Constructor.
+
+        Parameters
+        ----------
+        index : int
+            Index of this shard, starting from 0.
+        count : int
+            Number of shards.
+
+        Raises
+        ------
+        ValueError
+            The index is not in [0, count).
+
+        """
+        if count < 1 or not 0 <= index < count:
+            raise ValueError(f"Invalid shard: {index}/{count}. Specify 'K/N' with 0 <= K < N.")
+        self.index = index
+        self.count = count
+
+    @classmethod
+    def parse(cls, spec: str) -> "Shard":
+        """Create a shard from 'K/N' notation.
+
+        Parameters
+        ----------
+        spec : str
+            Shard specification, e.g. '0/4'.
+
+        Returns
+        -------
+        Shard
+            Shard.
+
+        Raises
+        ------
+        ValueError
+            The specification is not in 'K/N' notation.
+
+        """
+        match = re.fullmatch(r"\s*(\d+)\s*/\s*(\d+)\s*", spec)
+        if not match:
+            raise ValueError(f"Invalid shard: {spec}. Specify 'K/N' with 0 <= K < N.")
+
+        return cls(int(match.group(1)), int(match.group(2)))
+
+    def get_dag_indices(self, combination_index: int, number_of_dags: int) -> range:
+        """Get indices of DAGs of a combination assigned to this shard.
+
+        Parameters
+        ----------
+        combination_index : int
+            Index of the combination.
+        number_of_dags : int
+            Number of DAGs in the combination.
+
+        Returns
+        -------
+        range
+            Indices of DAGs.
+
+        """
+        first = (self.index - combination_index * number_of_dags) % self.count
+
+        return range(first, number_of_dags, self.count)
+
+
+class ShardMerger:
+    """Shard merger class.
+
+    Merge the outputs of shards into one directory
+    and verify that every expected DAG exists exactly once.
+
+    """
+
+    def __init__(self, config_raw: dict) -> None:
+        """Constructor.
+
+        Parameters
+        ----------
+        config_raw : dict
+            Raw config used to generate the shards.
+
+        """
+        self._combo_gen = ComboGenerator(config_raw)
+        self._number_of_dags = config_raw["Number of DAGs"]
+
+    def merge(self, shard_dirs: List[str], dest_dir: str) -> None:
+        """Move the outputs of shards into dest_dir.
+
+        The DAG files are moved as they are.
+        The instrumentation.json files of a combination are combined into one,
+        and any other file of a combination (e.g., combination_log.yaml)
+        must be identical in all shards.
+
+        Parameters
+        ----------
+        shard_dirs : List[str]
+            Destination directories of the shards.
+        dest_dir : str
+            Destination directory of the merged output.
+
+        Raises
+        ------
+        FileExistsError
+            The same DAG was generated by more than one shard,
+            or a file of a combination differs between shards.
+
+        """
+        owners: Dict[Tuple[str, int], str] = {}
+        side_files: Dict[Tuple[str, str], List[str]] = {}
+        for shard_dir in shard_dirs:
+            for combo_dir_name in self._get_combo_dir_names(shard_dir):
+                src_combo_dir = f"{shard_dir}/{combo_dir_name}"
+                for dag_index in self._get_dag_index_to_files(src_combo_dir):
+                    key = (combo_dir_name, dag_index)
+                    if key in owners and owners[key] != shard_dir:
+                        raise FileExistsError(
+                            f"dag_{dag_index} of {combo_dir_name} exists in "
+                            f"both {owners[key]} and {shard_dir}."
+                        )
+                    owners[key] = shard_dir
+                for file_name in sorted(os.listdir(src_combo_dir)):
+                    if not DAG_FILE_PATTERN.match(file_name):
+                        side_files.setdefault((combo_dir_name, file_name), []).append(
+                            f"{src_combo_dir}/{file_name}"
+                        )
+
+        for (combo_dir_name, file_name), paths in side_files.items():
+            if file_name == INSTRUMENTATION_FILE_NAME:
+                continue
+            for path in paths[1:]:
+                if not filecmp.cmp(paths[0], path, shallow=False):
+                    raise FileExistsError(
+                        f"{file_name} of {combo_dir_name} differs between {paths[0]} and {path}."
+                    )
+
+        for shard_dir in shard_dirs:
+            for combo_dir_name in self._get_combo_dir_names(shard_dir):
+                src_combo_dir = f"{shard_dir}/{combo_dir_name}"
+                dest_combo_dir = f"{dest_dir}/{combo_dir_name}"
+                os.makedirs(dest_combo_dir, exist_ok=True)
+                for files in self._get_dag_index_to_files(src_combo_dir).values():
+                    for file_name in files:
+                        shutil.move(
+                            f"{src_combo_dir}/{file_name}", f"{dest_combo_dir}/{file_name}"
+                        )
+
+        for (combo_dir_name, file_name), paths in side_files.items():
+            dest_path = f"{dest_dir}/{combo_dir_name}/{file_name}"
+            if file_name == INSTRUMENTATION_FILE_NAME:
+                self._combine_instrumentation(paths, dest_path)
+            else:
+                shutil.move(paths[0], dest_path)
+
+    def verify(self, dest_dir: str) -> List[str]:
+        """Verify that every expected DAG exists exactly once.
+
+        Parameters
+        ----------
+        dest_dir : str
+            Destination directory.
+
+        Returns
+        -------
+        List[str]
+            Error messages. Empty if the output is complete.
+
+        """
+        errors: List[str] = []
+        expected_dirs: Set[str] = set()
+        for combo_dir_name, _, _ in self._combo_gen.get_combo_iter():
+            expected_dirs.add(combo_dir_name)
+            combo_dir = f"{dest_dir}/{combo_dir_name}"
+            if not os.path.isdir(combo_dir):
+                errors.append(f"{combo_dir} not found.")
+                continue
+            if not os.path.isfile(f"{combo_dir}/combination_log.yaml"):
+                errors.append(f"{combo_dir}/combination_log.yaml not found.")
+
+            dag_index_to_files = self._get_dag_index_to_files(combo_dir)
+            for dag_index in range(self._number_of_dags):
+                if dag_index not in dag_index_to_files:
+                    errors.append(f"dag_{dag_index} of {combo_dir} not found.")
+            for dag_index in sorted(dag_index_to_files):
+                if dag_index >= self._number_of_dags:
+                    errors.append(f"Unexpected dag_{dag_index} in {combo_dir}.")
+                files = dag_index_to_files[dag_index]
+                extensions = [os.path.splitext(file_name)[1] for file_name in files]
+                if len(extensions) != len(set(extensions)):
+                    errors.append(f"dag_{dag_index} of {combo_dir} exists more than once.")
+
+        if os.path.isdir(dest_dir):
+            for dir_name in sorted(os.listdir(dest_dir)):
+                if os.path.isdir(f"{dest_dir}/{dir_name}") and dir_name not in expected_dirs:
+                    errors.append(f"Unexpected directory {dest_dir}/{dir_name}.")
+
+        return errors
+
+    @staticmethod
+    def _get_dag_index_to_files(combo_dir: str) -> Dict[int, List[str]]:
+        dag_index_to_files: Dict[int, List[str]] = {}
+        for file_name in sorted(os.listdir(combo_dir)):
+            if match := DAG_FILE_PATTERN.match(file_name):
+                dag_index_to_files.setdefault(int(match.group(1)), []).append(file_name)
+
+        return dag_index_to_files
+
+    @staticmethod
+    def _get_combo_dir_names(shard_dir: str) -> List[str]:
+        return [
+            dir_name
+            for dir_name in sorted(os.listdir(shard_dir))
+            if os.path.isdir(f"{shard_dir}/{dir_name}")
+        ]
+
+    @staticmethod
+    def _combine_instrumentation(paths: List[str], dest_path: str) -> None:
+        """Write the sum of the instrumentation summaries of a combination in the shards."""
+        instrumentation = Instrumentation()
+        build_stats = BuildStats(0)
+        for path in paths:
+            with open(path) as f:
+                summary = json.load(f)
+            instrumentation.merge(summary)
+            build_stats.merge(summary["build"])
+
+        with open(dest_path, "w") as f:
+            json.dump({**instrumentation.to_dict(), "build": build_stats.to_dict()}, f, indent=2)
@@ -0,0 +1,54 @@
+from logging import getLogger
+from typing import Iterator, Tuple, Union
+
+import networkx as nx
+
+from ..config import ComboGenerator, Config, ConfigValidator
+from ..exceptions import BuildFailedError
+from .dag_set_generator import DAGSetGenerator
+
+logger = getLogger(__name__)
+
+
+def generate(config: Union[dict, Config]) -> Iterator[Tuple[dict, int, nx.DiGraph]]:
+    """Generate DAGs in memory.
+
+    DAGs are built and all properties are set lazily, one at a time,
+    without writing any file. The DAGs are identical to those exported by run_generator.py.
+
+    Parameters
+    ----------
+    config : Union[dict, Config]
+        Raw config (i.e., the loaded config YAML) or config of one combination
+        (e.g., yielded by ComboGenerator.get_combo_iter).
+        A raw config is validated, and all its combinations are generated in order.
+
+    Yields
+    ------
+    Iterator[Tuple[dict, int, nx.DiGraph]]
+        (combo_log, dag_index, dag)
+        - combo_log:
+            Dictionary containing parameter names and chosen values
+            for which 'Combination' is specified. Empty if config is a Config.
+        - dag_index:
+            Index of DAG in the combination.
+        - dag:
+            DAG with all properties set.
+            DAGs that failed to build are skipped with a warning.
+
+    """
+    if isinstance(config, Config):
+        combo_iter = iter([("", {}, config)])
+    else:
+        ConfigValidator(config).validate()
+        combo_iter = ComboGenerator(config).get_combo_iter()
+
+    for _, combo_log, combo_config in combo_iter:
+        dag_set_generator = DAGSetGenerator(combo_config)
+        for dag_index in range(combo_config.number_of_dags):
+            try:
+                dag = dag_set_generator.generate(dag_index)
+            except BuildFailedError as e:
+                logger.warning(e.message)
+                continue
+            yield combo_log, dag_index, dag
@@ -0,0 +1,77 @@
+import copy
+from typing import Callable, Dict, Optional, Tuple
+
+import networkx as nx
+
+# (structure or None if it failed to build, number of build attempts)
+BuiltStructure = Tuple[Optional[nx.DiGraph], int]
+
+
+class StructureCache:
+    """Structure cache class.
+
+    Share the built structure of each DAG among combinations
+    that differ only in 'Properties' parameters.
+    Each structure is built on first use, and the users receive copies of it,
+    except for the last user, which receives the structure itself.
+    The number of build attempts is kept with the structure,
+    so every user can record the same build outcome.
+    The structure is then released, so only the DAGs in use are kept.
+
+    """
+
+    def __init__(self, num_uses: Dict[int, int]) -> None:
+        """Constructor.
+
+        Parameters
+        ----------
+        num_uses : Dict[int, int]
+            Number of combinations that use the structure of each DAG index.
+
+        """
+        self._num_uses = dict(num_uses)
+        self._structures: Dict[int, BuiltStructure] = {}
+
+    def get(self, dag_index: int, build: Callable[[], BuiltStructure]) -> BuiltStructure:
+        """Get the structure of a DAG.
+
+        Parameters
+        ----------
+        dag_index : int
+            Index of DAG.
+        build : Callable[[], BuiltStructure]
+            Function that builds the structure, called only on first use.
+            It returns the structure, or None if the DAG failed to build,
+            and the number of build attempts.
+
+        Returns
+        -------
+        BuiltStructure
+            Structure, which the caller may modify, and the number of build attempts.
+
+        """
+        if dag_index not in self._structures:
+            self._structures[dag_index] = build()
+
+        structure, num_tries = self._structures[dag_index]
+        self.release(dag_index)
+        if dag_index not in self._structures or structure is None:  # Last use or failed
+            return structure, num_tries
+
+        return copy.deepcopy(structure), num_tries
+
+    def release(self, dag_index: int) -> None:
+        """Give up one use of the structure of a DAG without getting it.
+
+        The structure is released after the last use.
+
+        Parameters
+        ----------
+        dag_index : int
+            Index of DAG.
+
+        """
+        self._num_uses[dag_index] = self._num_uses.get(dag_index, 1) - 1
+        if self._num_uses[dag_index] <= 0:
+            del self._num_uses[dag_index]
+            self._structures.pop(dag_index, None)
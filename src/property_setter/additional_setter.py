@@ -1,3 +1,6 @@
+import random
+from typing import Optional
+
 import networkx as nx
 
 from ..common import Util
@@ -26,23 +29,25 @@ class AdditionalSetter(PropertySetterBase):
     def _validate_config(self, config: Config) -> None:
         pass
 
-    def set(self, dag: nx.DiGraph) -> None:
+    def set(self, dag: nx.DiGraph, rng: Optional[random.Random] = None) -> None:
         """Completely random set additional properties.
 
         Parameters
         ----------
         dag : nx.DiGraph
             DAG
+        rng : Optional[random.Random], optional
+            Random number generator, by default None (i.e., 'Util.DEFAULT_RNG')
 
         """
         if node_properties := self._config.node_properties:
             for param_name, option in node_properties.items():
                 for node_i in Util.regular_nodes(dag):
-                    dag.nodes[node_i][param_name] = Util.random_choice(option)
+                    dag.nodes[node_i][param_name] = Util.random_choice(option, rng)
 
         if edge_properties := self._config.edge_properties:
             for param_name, option in edge_properties.items():
                 for src_i, tgt_i in dag.edges:
                     if (dag.nodes[src_i].get("node_type", "regular") == "regular"
                             and dag.nodes[tgt_i].get("node_type", "regular") == "regular"):
-                        dag.edges[src_i, tgt_i][param_name] = Util.random_choice(option)
+                        dag.edges[src_i, tgt_i][param_name] = Util.random_choice(option, rng)
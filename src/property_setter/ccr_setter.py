@@ -1,4 +1,6 @@
+import random
 from logging import getLogger
+from typing import Optional
 
 import networkx as nx
 
@@ -33,13 +35,15 @@ class CCRSetter(PropertySetterBase):
                 "So, the range of 'Communication time' entered is ignored."
             )
 
-    def set(self, dag: nx.DiGraph) -> None:
+    def set(self, dag: nx.DiGraph, rng: Optional[random.Random] = None) -> None:
         """Set CCR.
 
         Parameters
         ----------
         dag : nx.DiGraph
             DAG.
+        rng : Optional[random.Random], optional
+            Random number generator, by default None (i.e., 'Util.DEFAULT_RNG')
 
         Notes
         -----
@@ -49,17 +53,19 @@ class CCRSetter(PropertySetterBase):
         (i.e., the range of 'Communication time' specified is ignored).
 
         """
-        ccr = Util.random_choice(self._config.ccr)
+        ccr = Util.random_choice(self._config.ccr, rng)
         if self._config.execution_time:
-            self._set_by_exec(dag, ccr)
+            self._set_by_exec(dag, ccr, rng)
         else:
-            self._set_by_comm(dag, ccr)
+            self._set_by_comm(dag, ccr, rng)
 
-    def _set_by_exec(self, dag: nx.DiGraph, ccr: float) -> None:
+    def _set_by_exec(
+        self, dag: nx.DiGraph, ccr: float, rng: Optional[random.Random] = None
+    ) -> None:
         # Set execution time
         sum_exec = 0
         for node_i in Util.regular_nodes(dag):
-            exec = Util.random_choice(self._config.execution_time)
+            exec = Util.random_choice(self._config.execution_time, rng)
             dag.nodes[node_i]["execution_time"] = exec
             sum_exec += exec
 
@@ -72,14 +78,16 @@ class CCRSetter(PropertySetterBase):
             if (dag.nodes[s].get("node_type", "regular") == "regular"
                 and dag.nodes[t].get("node_type", "regular") == "regular")
         ]
-        comm_grouping = self._grouping(sum_comm, len(regular_edges))
+        comm_grouping = self._grouping(sum_comm, len(regular_edges), rng)
         if not comm_grouping:
             self._output_round_up_warning("Communication time", "CCR")
             comm_grouping = [1 for _ in range(len(regular_edges))]
         for edge, comm in zip(regular_edges, comm_grouping):
             dag.edges[edge[0], edge[1]]["communication_time"] = comm
 
-    def _set_by_comm(self, dag: nx.DiGraph, ccr: float) -> None:
+    def _set_by_comm(
+        self, dag: nx.DiGraph, ccr: float, rng: Optional[random.Random] = None
+    ) -> None:
         # Set communication time (only on regular-to-regular edges)
         sum_comm = 0
         regular_edges = [
@@ -88,7 +96,7 @@ class CCRSetter(PropertySetterBase):
                 and dag.nodes[t].get("node_type", "regular") == "regular")
         ]
         for src_i, tgt_i in regular_edges:
-            comm = Util.random_choice(self._config.communication_time)
+            comm = Util.random_choice(self._config.communication_time, rng)
             dag.edges[src_i, tgt_i]["communication_time"] = comm
             sum_comm += comm
 
@@ -97,7 +105,7 @@ class CCRSetter(PropertySetterBase):
 
         # Set execution time
         regular_node_list = Util.regular_nodes(dag)
-        exec_grouping = self._grouping(sum_exec, len(regular_node_list))
+        exec_grouping = self._grouping(sum_exec, len(regular_node_list), rng)
         if not exec_grouping:
             self._output_round_up_warning("Execution time", "CCR")
             exec_grouping = [1 for _ in range(len(regular_node_list))]
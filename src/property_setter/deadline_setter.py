@@ -1,3 +1,6 @@
+import random
+from typing import Optional
+
 import networkx as nx
 
 from ..common import Util
@@ -22,13 +25,15 @@ class DeadlineSetter(PropertySetterBase):
     def _validate_config(self, config: Config) -> None:
         pass
 
-    def set(self, dag: nx.DiGraph) -> None:
+    def set(self, dag: nx.DiGraph, rng: Optional[random.Random] = None) -> None:
         """Set end-to-end deadline based on critical path length.
 
         Parameters
         ----------
         dag : nx.DiGraph
             DAG.
+        rng : Optional[random.Random], optional
+            Random number generator, by default None (i.e., 'Util.DEFAULT_RNG')
 
         """
         for exit_i in Util.get_sink_nodes(dag):
@@ -38,9 +43,8 @@ class DeadlineSetter(PropertySetterBase):
                 if cp_len > max_cp_len:
                     max_cp_len = cp_len
 
-            dag.nodes[exit_i]["end_to_end_deadline"] = int(
-                max_cp_len * Util.random_choice(self._config.ratio_of_deadline_to_critical_path)
-            )
+            ratio = Util.random_choice(self._config.ratio_of_deadline_to_critical_path, rng)
+            dag.nodes[exit_i]["end_to_end_deadline"] = int(max_cp_len * ratio)
 
     @staticmethod
     def _get_cp_len(dag: nx.DiGraph, source: int, exit: int) -> int:
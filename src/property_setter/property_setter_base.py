@@ -5,6 +5,7 @@ from typing import List, Optional
 
 import networkx as nx
 
+from ..common import Util
 from ..config import Config
 
 logger = getLogger(__name__)
@@ -16,7 +17,7 @@ class PropertySetterBase(metaclass=ABCMeta):
         self._config = config
 
     @abstractmethod
-    def set(self, dag: nx.DiGraph) -> None:
+    def set(self, dag: nx.DiGraph, rng: Optional[random.Random] = None) -> None:
         raise NotImplementedError
 
     @abstractmethod
@@ -24,14 +25,18 @@ class PropertySetterBase(metaclass=ABCMeta):
         raise NotImplementedError
 
     @staticmethod
-    def _grouping(sum: int, num_groups: int) -> Optional[List[int]]:
+    def _grouping(
+        sum: int, num_groups: int, rng: Optional[random.Random] = None
+    ) -> Optional[List[int]]:
         # Check feasibility
         if (sum / num_groups) < 1.0:
             return None  # Infeasible
 
+        rng = Util.get_rng(rng)
+
         groups = [[0 for _ in range(sum)]]
         for _ in range(num_groups - 1):
-            random.shuffle(groups)
+            rng.shuffle(groups)
             choose_group = groups.pop(0)
             while len(choose_group) == 1:
                 groups.append(choose_group)
@@ -41,7 +46,7 @@ class PropertySetterBase(metaclass=ABCMeta):
                 groups.append([choose_group[0]])
                 groups.append([choose_group[-1]])
             else:
-                rand_idx = random.randint(1, len(choose_group) - 2)
+                rand_idx = rng.randint(1, len(choose_group) - 2)
                 groups.append(choose_group[:rand_idx])
                 groups.append(choose_group[rand_idx:])
 
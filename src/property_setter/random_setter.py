@@ -1,3 +1,6 @@
+import random
+from typing import Optional
+
 import networkx as nx
 
 from ..common import Util
@@ -33,22 +36,24 @@ class RandomSetter(PropertySetterBase):
     def _validate_config(self, config: Config) -> None:
         pass
 
-    def set(self, dag: nx.DiGraph) -> None:
+    def set(self, dag: nx.DiGraph, rng: Optional[random.Random] = None) -> None:
         """Completely random set.
 
         Parameters
         ----------
         dag : nx.DiGraph
             DAG
+        rng : Optional[random.Random], optional
+            Random number generator, by default None (i.e., 'Util.DEFAULT_RNG')
 
         """
         property_name = Util.convert_to_property(self._param_name)
         option = getattr(self._config, property_name)
         if self._target == "node":
             for node_i in Util.regular_nodes(dag):
-                dag.nodes[node_i][property_name] = Util.random_choice(option)
+                dag.nodes[node_i][property_name] = Util.random_choice(option, rng)
         else:
             for src_i, tgt_i in dag.edges():
                 if (dag.nodes[src_i].get("node_type", "regular") == "regular"
                         and dag.nodes[tgt_i].get("node_type", "regular") == "regular"):
-                    dag.edges[src_i, tgt_i][property_name] = Util.random_choice(option)
+                    dag.edges[src_i, tgt_i][property_name] = Util.random_choice(option, rng)
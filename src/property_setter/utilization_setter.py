@@ -38,13 +38,15 @@ class UtilizationSetter(PropertySetterBase):
                 "So, the range of 'Execution time' entered is ignored."
             )
 
-    def set(self, dag: nx.DiGraph) -> None:
+    def set(self, dag: nx.DiGraph, rng: Optional[random.Random] = None) -> None:
         """Set period and execution time based on utilization.
 
         Parameters
         ----------
         dag : nx.DiGraph
             DAG.
+        rng : Optional[random.Random], optional
+            Random number generator, by default None (i.e., 'Util.DEFAULT_RNG')
 
         Notes
         -----
@@ -58,40 +60,45 @@ class UtilizationSetter(PropertySetterBase):
         )
         if is_chain_case:
             if total_utilization:
-                self._set_by_total_utilization_chain(dag)
+                self._set_by_total_utilization_chain(dag, rng)
             else:
-                self._set_by_only_max_utilization_chain(dag)
+                self._set_by_only_max_utilization_chain(dag, rng)
         else:
             if total_utilization:
-                self._set_by_total_utilization(dag)
+                self._set_by_total_utilization(dag, rng)
             else:
-                self._set_by_only_max_utilization(dag)
+                self._set_by_only_max_utilization(dag, rng)
 
         # Set remain execution times
         for node_i in Util.regular_nodes(dag):
             if not dag.nodes[node_i].get("execution_time"):
                 dag.nodes[node_i]["execution_time"] = Util.random_choice(
-                    self._config.execution_time
+                    self._config.execution_time, rng
                 )
 
-    def _set_by_total_utilization(self, dag: nx.DiGraph) -> None:
+    def _set_by_total_utilization(
+        self, dag: nx.DiGraph, rng: Optional[random.Random] = None
+    ) -> None:
         """Set period and execution time based on total utilization.
 
         Parameters
         ----------
         dag : nx.DiGraph
             DAG.
+        rng : Optional[random.Random], optional
+            Random number generator, by default None (i.e., 'Util.DEFAULT_RNG')
 
         """
         timer_driven_nodes = self._get_timer_driven_nodes(dag)
         utilizations = self._UUniFast(
-            Util.random_choice(self._config.total_utilization),
+            Util.random_choice(self._config.total_utilization, rng),
             len(timer_driven_nodes),
             self._config.maximum_utilization,
+            rng,
         )
 
         for timer_i, utilization in zip(timer_driven_nodes, utilizations):
-            selected_period = self._choice_period(dag, timer_i)
+            selected_period = self._choice_period(dag, timer_i, rng)
             dag.nodes[timer_i]["period"] = selected_period
             exec = int(utilization * selected_period)
             if exec == 0:
@@ -99,33 +106,40 @@ class UtilizationSetter(PropertySetterBase):
                 exec = 1
             dag.nodes[timer_i]["execution_time"] = exec
 
-    def _set_by_total_utilization_chain(self, chain_based_dag: ChainBasedDAG) -> None:
+    def _set_by_total_utilization_chain(
+        self, chain_based_dag: ChainBasedDAG, rng: Optional[random.Random] = None
+    ) -> None:
         timer_driven_nodes = self._get_timer_driven_nodes(chain_based_dag)
         utilizations = self._UUniFast(
-            Util.random_choice(self._config.total_utilization),
+            Util.random_choice(self._config.total_utilization, rng),
             len(timer_driven_nodes),
             self._config.maximum_utilization,
+            rng,
         )
 
         for chain in chain_based_dag.chains:
-            selected_period = self._choice_period(chain_based_dag, chain.head)
+            selected_period = self._choice_period(chain_based_dag, chain.head, rng)
             chain_based_dag.nodes[chain.head]["period"] = selected_period
             utilization = utilizations[timer_driven_nodes.index(chain.head)]
             sum_exec = int(utilization * selected_period)
-            exec_grouping = self._grouping(sum_exec, chain.number_of_nodes())  # type: ignore
+            exec_grouping = self._grouping(sum_exec, chain.number_of_nodes(), rng)  # type: ignore
             if not exec_grouping:
                 self._output_round_up_warning("Execution time", "Utilization")
                 exec_grouping = [1 for _ in range(chain.number_of_nodes())]
             for node_i, exec in zip(chain.nodes, exec_grouping):
                 chain_based_dag.nodes[node_i]["execution_time"] = exec
 
-    def _set_by_only_max_utilization(self, dag: nx.DiGraph) -> None:
+    def _set_by_only_max_utilization(
+        self, dag: nx.DiGraph, rng: Optional[random.Random] = None
+    ) -> None:
         """Set period and execution time randomly by only maximum utilization.
 
         Parameters
         ----------
         dag : nx.DiGraph
             DAG.
+        rng : Optional[random.Random], optional
+            Random number generator, by default None (i.e., 'Util.DEFAULT_RNG')
 
         Notes
         -----
@@ -133,26 +147,31 @@ class UtilizationSetter(PropertySetterBase):
         'Maximum utilization' is set to 1.0.
 
         """
+        rng = Util.get_rng(rng)
         max_u = self._config.maximum_utilization or 1.0
         for node_i in self._get_timer_driven_nodes(dag):
-            selected_period = self._choice_period(dag, node_i)
+            selected_period = self._choice_period(dag, node_i, rng)
             dag.nodes[node_i]["period"] = selected_period
             min_u = 1 / selected_period  # Ensure 'Execution time' is at least 1.
             if min_u > max_u:
                 self._output_round_up_warning("Execution time", "Utilization")
                 exec = 1
             else:
-                utilization = random.uniform(min_u, max_u)
+                utilization = rng.uniform(min_u, max_u)
                 exec = int(utilization * selected_period)
             dag.nodes[node_i]["execution_time"] = exec
 
-    def _set_by_only_max_utilization_chain(self, chain_based_dag: ChainBasedDAG) -> None:
+    def _set_by_only_max_utilization_chain(
+        self, chain_based_dag: ChainBasedDAG, rng: Optional[random.Random] = None
+    ) -> None:
         """Set period and execution time randomly by only maximum utilization.
 
         Parameters
         ----------
         chain_based_dag: ChainBasedDAG
             Chain-based DAG.
+        rng : Optional[random.Random], optional
+            Random number generator, by default None (i.e., 'Util.DEFAULT_RNG')
 
         Notes
         -----
@@ -160,9 +179,10 @@ class UtilizationSetter(PropertySetterBase):
         'Maximum utilization' is set to 1.0.
 
         """
+        rng = Util.get_rng(rng)
         max_u = self._config.maximum_utilization or 1.0
         for chain in chain_based_dag.chains:
-            selected_period = self._choice_period(chain_based_dag, chain.head)
+            selected_period = self._choice_period(chain_based_dag, chain.head, rng)
             chain_based_dag.nodes[chain.head]["period"] = selected_period
             min_u = (
                 chain.number_of_nodes() / selected_period
@@ -171,9 +191,11 @@ class UtilizationSetter(PropertySetterBase):
                 self._output_round_up_warning("Execution time", "Utilization")
                 exec_grouping = [1 for _ in range(chain.number_of_nodes())]
             else:
-                utilization = random.uniform(min_u, max_u)
+                utilization = rng.uniform(min_u, max_u)
                 sum_exec = int(utilization * selected_period)
-                exec_grouping = self._grouping(sum_exec, chain.number_of_nodes())  # type: ignore
+                exec_grouping = self._grouping(
+                    sum_exec, chain.number_of_nodes(), rng  # type: ignore
+                )
                 if not exec_grouping:
                     self._output_round_up_warning("Execution time", "Utilization")
                     exec_grouping = [1 for _ in range(chain.number_of_nodes())]
@@ -181,7 +203,12 @@ class UtilizationSetter(PropertySetterBase):
                 chain_based_dag.nodes[node_i]["execution_time"] = exec
 
     @staticmethod
-    def _UUniFast(total_u: float, n: int, max_u: Optional[float] = None) -> List[float]:
+    def _UUniFast(
+        total_u: float,
+        n: int,
+        max_u: Optional[float] = None,
+        rng: Optional[random.Random] = None,
+    ) -> List[float]:
         """Determine utilization based on UUniFast method.
 
         For detail, see https://idp.springer.com/authorize/casa?redirect_uri=https://link.springer.com/content/pdf/10.1007/s11241-005-0507-9.pdf&casa_token=ILaVXw6_1aUAAAAA:KEgQ8Iv70JXyNHj7hs11YvW2KRIPm89ab_1bILtRZFI5sBU1A7QGYaNDMshx4up16pA4W2gDohyAQmJqWyc.
@@ -194,6 +221,8 @@ class UtilizationSetter(PropertySetterBase):
             Number of elements to distribute utilization.
         max_u : float
             Maximum utilization, by default None.
+        rng : Optional[random.Random], optional
+            Random number generator, by default None (i.e., 'Util.DEFAULT_RNG')
 
         Returns
         -------
@@ -221,14 +250,15 @@ class UtilizationSetter(PropertySetterBase):
                 )
                 utilizations = [max_u for _ in range(n)]
             else:
-                utilizations = UtilizationSetter._UUniFast_with_max_u(total_u, n, max_u)
+                utilizations = UtilizationSetter._UUniFast_with_max_u(total_u, n, max_u, rng)
 
         else:  # Original UUniFast method
+            rng = Util.get_rng(rng)
             remain_u = total_u
             utilizations: List[float] = []  # type: ignore
             for i in range(n - 1):
                 next_u = -sys.maxsize
-                next_u = remain_u * (random.uniform(0, 1) ** (1 / (n - i)))
+                next_u = remain_u * (rng.uniform(0, 1) ** (1 / (n - i)))
                 utilizations.append(remain_u - next_u)
                 remain_u = next_u
             utilizations.append(remain_u)
@@ -236,7 +266,9 @@ class UtilizationSetter(PropertySetterBase):
         return utilizations
 
     @staticmethod
-    def _UUniFast_with_max_u(total_u: float, n: int, max_u: float) -> List[float]:
+    def _UUniFast_with_max_u(
+        total_u: float, n: int, max_u: float, rng: Optional[random.Random] = None
+    ) -> List[float]:
         """Determine utilization based on UUniFast method not to exceed 'max_u'.
 
         Parameters
@@ -247,6 +279,8 @@ class UtilizationSetter(PropertySetterBase):
             Number of elements to distribute utilization.
         max_u : float
             Maximum utilization.
+        rng : Optional[random.Random], optional
+            Random number generator, by default None (i.e., 'Util.DEFAULT_RNG')
 
         Returns
         -------
@@ -261,6 +295,7 @@ class UtilizationSetter(PropertySetterBase):
         the utilization is distributed equally.
 
         """
+        rng = Util.get_rng(rng)
         max_try = 100  # HACK
         for try_i in range(1, max_try + 1):
             remain_u = total_u
@@ -268,7 +303,7 @@ class UtilizationSetter(PropertySetterBase):
             for i in range(n - 1):
                 next_u = -sys.maxsize
                 while remain_u - next_u >= max_u:
-                    next_u = remain_u * (random.uniform(0, 1) ** (1 / (n - i)))
+                    next_u = remain_u * (rng.uniform(0, 1) ** (1 / (n - i)))
                 utilizations.append(remain_u - next_u)
                 remain_u = next_u
 
@@ -282,12 +317,14 @@ class UtilizationSetter(PropertySetterBase):
 
         return utilizations
 
-    def _choice_period(self, dag: nx.DiGraph, node_i: int) -> int:
+    def _choice_period(
+        self, dag: nx.DiGraph, node_i: int, rng: Optional[random.Random] = None
+    ) -> int:
         if self._config.source_node_period and node_i in Util.get_source_nodes(dag):
-            return Util.random_choice(self._config.source_node_period)
+            return Util.random_choice(self._config.source_node_period, rng)
         if self._config.sink_node_period and node_i in Util.get_sink_nodes(dag):
-            return Util.random_choice(self._config.sink_node_period)
-        return Util.random_choice(self._config.period)
+            return Util.random_choice(self._config.sink_node_period, rng)
+        return Util.random_choice(self._config.period, rng)
 
     def _get_timer_driven_nodes(self, dag: nx.DiGraph) -> List[int]:
         """Get indices of timer-driven nodes according to 'Periodic type'.
@@ -0,0 +1,83 @@
+import json
+
+from src.common import NULL_INSTRUMENTATION, Instrumentation, Util
+from src.config import Config
+from src.dag_builder import DAGBuilderFactory
+
+
+class TestInstrumentation:
+    def test_measure(self):
+        instrumentation = Instrumentation()
+        for _ in range(3):
+            with instrumentation.measure("stages", "build"):
+                sum(range(1000))
+        summary = instrumentation.to_dict()
+
+        record = summary["timers"]["stages"]["build"]
+        assert record["calls"] == 3
+        assert record["wall_time"] > 0
+        assert record["cpu_time"] >= 0
+        json.dumps(summary)
+
+    def test_measure_exception(self):
+        instrumentation = Instrumentation()
+        try:
+            with instrumentation.measure("stages", "build"):
+                raise ValueError
+        except ValueError:
+            pass
+        assert instrumentation.to_dict()["timers"]["stages"]["build"]["calls"] == 1
+
+    def test_count(self):
+        instrumentation = Instrumentation()
+        instrumentation.count("dags")
+        instrumentation.count("dags", 2)
+        assert instrumentation.to_dict()["counters"] == {"dags": 3}
+
+    def test_merge(self):
+        instrumentation = Instrumentation()
+        other = Instrumentation()
+        for target in [instrumentation, other]:
+            with target.measure("formats", "yaml"):
+                pass
+            target.count("dags")
+        instrumentation.merge(other.to_dict())
+        summary = instrumentation.to_dict()
+
+        assert summary["timers"]["formats"]["yaml"]["calls"] == 2
+        assert summary["counters"] == {"dags": 2}
+
+    def test_null_instrumentation(self):
+        with NULL_INSTRUMENTATION.measure("stages", "build"):
+            pass
+        NULL_INSTRUMENTATION.count("dags")
+        assert not NULL_INSTRUMENTATION.enabled
+        assert NULL_INSTRUMENTATION.to_dict() == {"timers": {}, "counters": {}}
+
+    def test_builder_clamped_fan_outs(self):
+        config = Config(
+            {
+                "Seed": 0,
+                "Number of DAGs": 1,
+                "Graph structure": {
+                    "Generation method": "Fan-in/Fan-out",
+                    "Number of nodes": 20,
+                    "In-degree": 3,
+                    "Out-degree": 5,
+                    "Number of source nodes": 1,
+                    "Number of sink nodes": 1,
+                    "Ensure weakly connected": True,
+                },
+                "Properties": {},
+                "Output formats": {"DAG": {"YAML": True}},
+            }
+        )
+        dag_builder = DAGBuilderFactory.create_instance(config)
+        instrumentation = Instrumentation()
+        dag_builder.instrumentation = instrumentation
+        for dag_index in range(5):
+            dag_builder.build_dag(Util.create_rng(0, dag_index))
+
+        counters = instrumentation.to_dict()["counters"]
+        assert counters["FanInFanOutBuilder.clamped_fan_outs"] > 0
+        assert "FanInFanOutBuilder.retries" not in counters
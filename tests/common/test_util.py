@@ -1,4 +1,5 @@
 import networkx as nx
+import numpy as np
 
 from src.common import Util
 
@@ -16,6 +17,32 @@ class TestUtil:
     def test_random_choice_not_list(self):
         assert Util.random_choice(1) == 1
 
+    def test_random_choice_rng(self):
+        option = list(range(100))
+        chosen = Util.random_choice(option, Util.create_rng(0, 1))
+        assert Util.random_choice(option, Util.create_rng(0, 1)) == chosen
+
+    def test_get_rng_default(self):
+        rng = Util.create_rng(0)
+        assert Util.get_rng(rng) is rng
+        assert Util.get_rng() is Util.DEFAULT_RNG
+
+    def test_create_rng_same_keys(self):
+        assert Util.create_rng(0, 1, 2).random() == Util.create_rng(0, 1, 2).random()
+
+    def test_create_rng_negative_seed(self):
+        assert Util.create_rng(-1, 1, 2).random() == Util.create_rng(-1, 1, 2).random()
+        assert Util.create_rng(-1, 1, 2).random() != Util.create_rng(1, 1, 2).random()
+
+    def test_create_rng_different_keys(self):
+        values = {
+            Util.create_rng(0, 1, 2).random(),
+            Util.create_rng(0, 2, 1).random(),
+            Util.create_rng(1, 1, 2).random(),
+            Util.create_rng(0, 1, 2, 0).random(),
+        }
+        assert len(values) == 4
+
     def test_get_min_in_node_exist_0(self):
         G = nx.DiGraph()
         G.add_node(0)
@@ -45,3 +72,21 @@ class TestUtil:
         G.add_edges_from([(0, 3), (0, 4), (1, 3), (1, 4), (2, 3)])
 
         assert Util.get_min_out_node(G, [0, 1, 2]) == 2
+
+    def test_get_upper_triangle_cached(self):
+        src, dst = Util.get_upper_triangle(50)
+        expected_src, expected_dst = np.triu_indices(50, k=1)
+
+        assert src.tolist() == expected_src.tolist()
+        assert dst.tolist() == expected_dst.tolist()
+        assert Util.get_upper_triangle(50)[0] is src
+        assert not src.flags.writeable
+
+    def test_get_upper_triangle_not_cached_above_limit(self, mocker):
+        mocker.patch.object(Util, "MAX_CACHED_PAIRS", 10)
+        src, dst = Util.get_upper_triangle(6)
+        expected_src, expected_dst = np.triu_indices(6, k=1)
+
+        assert src.tolist() == expected_src.tolist()
+        assert dst.tolist() == expected_dst.tolist()
+        assert Util.get_upper_triangle(6)[0] is not src
@@ -48,6 +48,23 @@ class TestComboGenerator:
     def test_get_num_combos(self):
         config_raw = get_config_raw_base()
         assert ComboGenerator(config_raw).get_num_combos() == 4
+        config_raw["Graph structure"]["Number of nodes"] = {"Fixed": 1}
+        assert ComboGenerator(config_raw).get_num_combos() == 2
+
+    def test_get_num_structures(self):
+        config_raw = get_config_raw_base()
+        assert ComboGenerator(config_raw).get_num_structures() == 2
+        config_raw["Graph structure"]["Number of nodes"] = {"Fixed": 1}
+        assert ComboGenerator(config_raw).get_num_structures() == 1
+
+    def test_get_combo_iter_structure_index(self):
+        config_raw = get_config_raw_base()
+        combo_iter = ComboGenerator(config_raw).get_combo_iter()
+        indices = []
+        for _, log, config in combo_iter:
+            indices.append((log["Number of nodes"], config.combination_index, config.structure_index))
+
+        assert indices == [(1, 0, 0), (1, 1, 0), (2, 2, 1), (2, 3, 1)]
 
     def test_get_combo_iter_dir_name_abbreviation(self):
         config_raw = get_config_raw_base()
@@ -184,3 +184,76 @@ def test_gnp_augment_no_orphan_sources_at_depth_two():
             assert g.in_degree(n) >= 1 or n == min(g.nodes()), \
                 f"orphan v_ent found: {n}"
     BranchingValidator.assert_valid(g, "probabilistic")
+
+
+def test_remaining_chain_lengths():
+    g = _chain_dag(5)
+    g.add_edge(0, 5)
+    g.add_edge(5, 4)
+    lengths = BranchingAugmentor._remaining_chain_lengths(g, list(nx.topological_sort(g)))
+    assert lengths == {0: 4, 1: 3, 2: 2, 3: 1, 4: 0, 5: 1}
+
+
+def test_gnp_augment_complete_branch_bodies():
+    cfg = _chain_config(prob_b=1.0, max_depth=1, max_branches=3)
+    cfg.graph_structure["Probability of edge existence"] = 1.0
+    aug = BranchingAugmentor(cfg)
+    g = aug.augment(_gnp_dag(n=4, p=0.5, seed=5), layout_hint="gnp",
+                    rng=random.Random(0))
+    vexts = {a["branch_unit_id"]: n for n, a in g.nodes(data=True)
+             if a.get("node_type") == "v_ext"}
+    for n, a in g.nodes(data=True):
+        if a.get("node_type") != "v_ent":
+            continue
+        # A complete mini-DAG has exactly one source and one sink.
+        heads = list(g.successors(n))
+        assert all(g.out_degree(head) == 1 for head in heads)
+        assert g.in_degree(vexts[a["branch_unit_id"]]) == len(heads)
+    BranchingValidator.assert_valid(g, "probabilistic")
+
+
+def test_failed_unit_is_rolled_back_and_retried(monkeypatch):
+    from src.branching_validator import BranchingConstraintError
+
+    calls = []
+    assert_valid_unit = BranchingValidator.assert_valid_unit
+
+    def fail_first(dag, vent, vext, firing):
+        calls.append((vent, vext))
+        if len(calls) == 1:
+            raise BranchingConstraintError("injected")
+        assert_valid_unit(dag, vent, vext, firing)
+
+    monkeypatch.setattr(BranchingValidator, "assert_valid_unit", staticmethod(fail_first))
+    cfg = _chain_config(prob_b=1.0, max_depth=1, max_branches=2)
+    aug = BranchingAugmentor(cfg)
+    g = aug.augment(_chain_dag(3), layout_hint="chain", rng=random.Random(0))
+    assert aug.num_tries == 2
+    # The retried unit reuses the node ids of the rolled-back one.
+    assert calls[0] == calls[1]
+    assert len(calls) == 4
+    BranchingValidator.assert_valid(g, "probabilistic")
+    assert nx.is_weakly_connected(g)
+
+
+def test_rolled_back_unit_keeps_node_order(monkeypatch):
+    from src.branching_validator import BranchingConstraintError
+
+    def fail_first(dag, vent, vext, firing):
+        if len(states) == 1:
+            raise BranchingConstraintError("injected")
+
+    def replace(dag, v, *args):
+        states.append((list(dag), [(list(dag.successors(n)), list(dag.predecessors(n)))
+                                   for n in dag]))
+        return aug._replace_node_with_branches(dag, v, *args)
+
+    states = []
+    monkeypatch.setattr(BranchingValidator, "assert_valid_unit", staticmethod(fail_first))
+    aug = BranchingAugmentor(_chain_config())
+    g = _chain_dag(5)
+    aug._next_node_id = 5
+    aug._insert_unit(g, replace, 2, 2, 2, random.Random(0))
+    assert len(states) == 2
+    assert states[0] == states[1]
+    assert 2 not in g
@@ -17,15 +17,22 @@ class TestChain:
         chain = Chain(0)
         number_of_sub_sequence = random.randint(1, 5)
         chain.build_chain(main_sequence_length, number_of_sub_sequence)
+        G = nx.DiGraph()
+        G.add_nodes_from(chain.nodes)
+        G.add_edges_from(chain.edges)
 
-        assert nx.is_directed_acyclic_graph(chain)
-        assert len(list(nx.weakly_connected_components(chain))) == 1
+        assert nx.is_directed_acyclic_graph(G)
+        assert len(list(nx.weakly_connected_components(G))) == 1
         assert chain.main_tail == main_sequence_length - 1
         assert chain.end_idx == chain.number_of_nodes() - 1
+        assert G.number_of_nodes() == chain.number_of_nodes()
+        assert sorted(chain.sub_sequence_tails) == sorted(
+            set(Util.get_sink_nodes(G)) - {chain.main_tail}
+        )
 
         max_len = -1
-        for tail_i in Util.get_sink_nodes(chain):
-            paths = nx.all_simple_paths(chain, 0, tail_i)
+        for tail_i in Util.get_sink_nodes(G):
+            paths = nx.all_simple_paths(G, 0, tail_i)
             for path in paths:
                 if len(path) > max_len:
                     max_len = len(path)
@@ -132,6 +139,37 @@ class TestChainBasedDAG:
         assert nx.is_directed_acyclic_graph(chain_based_dag)
         assert len(Util.get_sink_nodes(chain_based_dag)) == number_of_sink_nodes
 
+    def test_merge_chains_min_in_degree_non_ancestor(self):
+        chains = get_chains(6, 4, 1)
+        chain_based_dag = ChainBasedDAG(chains)
+        chain_based_dag.vertically_link_chains(2, True, True, random.Random(0))
+        before = nx.DiGraph(chain_based_dag)
+        chain_based_dag.merge_chains(2, True, True, random.Random(0))
+
+        # Replay the merges: each target has the minimum in-degree among non-ancestors.
+        replay = nx.DiGraph(before)
+        tgt_option = set(replay.nodes()) - set(Util.get_source_nodes(before))
+        added_edges = [e for e in chain_based_dag.edges() if not before.has_edge(*e)]
+        tgt_option -= {src_i for src_i, _ in added_edges}
+        for src_i, tgt_i in sorted(added_edges):
+            option = tgt_option - nx.ancestors(replay, src_i)
+            min_in_degree = min(replay.in_degree(node_i) for node_i in option)
+            assert tgt_i == min(v for v in option if replay.in_degree(v) == min_in_degree)
+            replay.add_edge(src_i, tgt_i)
+
+    def test_replace_node(self):
+        chains = get_chains(3, 2, 0)
+        chain_based_dag = ChainBasedDAG(chains)
+        chain_based_dag.replace_node(2, 6, [8, 9])
+        chain_based_dag.replace_node(9, 10, [12])
+        chain_based_dag.replace_node(1, 13, [15])
+
+        assert chain_based_dag.chain_heads == [0, 6, 4]
+        assert list(chains[0].nodes) == [0, 15]
+        assert list(chains[1].nodes) == [8, 12, 3]
+        assert chains[1].number_of_nodes() == 3
+        assert list(chains[2].nodes) == [4, 5]
+
 
 class TestChainBasedBuilder:
     @pytest.mark.parametrize("number_of_chains", list(range(1, 20)))
@@ -5,6 +5,7 @@ import pytest
 
 from src.common import Util
 from src.dag_builder.dag_builder_base import DAGBuilderBase
+from src.exceptions import BuildFailedError
 
 
 class TestDAGBuilderBase:
@@ -30,6 +31,17 @@ class TestDAGBuilderBase:
         for tgt_i in tgt_layer:
             assert G.in_degree(tgt_i) != 0
 
+    def test_add_minimum_edges_tie_breaking(self):
+        G = nx.DiGraph()
+        G.add_nodes_from(range(6))
+        G.add_edge(0, 5)
+        DAGBuilderBase._add_minimum_edges([2, 0, 1], [4, 3], G)
+
+        # Minimum degree first, then the order in the layer.
+        assert set(G.edges()) == {(0, 5), (2, 4), (1, 3)}
+        DAGBuilderBase._add_minimum_edges([2, 0, 1], [], G)
+        assert G.number_of_edges() == 3
+
     @pytest.mark.parametrize("number_of_nodes", list(range(3, 20)))
     def test_ensure_weakly_connected_keep_entry_exit(self, number_of_nodes):
         G = nx.DiGraph()
@@ -86,6 +98,24 @@ class TestDAGBuilderBase:
         assert nx.is_directed_acyclic_graph(G)
         assert len(list(nx.weakly_connected_components(G))) == 1
 
+    def test_ensure_weakly_connected_isolated_nodes(self):
+        G = nx.DiGraph()
+        G.add_nodes_from(range(1000))
+        G.add_edges_from([(0, 1), (0, 2), (3, 2)])
+        DAGBuilderBase._ensure_weakly_connected(G, True, False)
+
+        assert nx.is_weakly_connected(G)
+        assert nx.is_directed_acyclic_graph(G)
+        assert len(Util.get_source_nodes(G)) == 998
+        # The in-degrees of the biggest component are balanced.
+        assert sorted(G.in_degree(v) for v in [1, 2]) == [499, 500]
+
+        G = nx.DiGraph()
+        G.add_nodes_from(range(4))
+        G.add_edge(0, 1)
+        with pytest.raises(BuildFailedError):
+            DAGBuilderBase._ensure_weakly_connected(G, True, True)
+
     @pytest.mark.parametrize("number_of_sink_nodes", list(range(1, 10)))
     def test_force_create_sink_nodes(self, number_of_sink_nodes):
         G = nx.DiGraph()
@@ -100,3 +100,31 @@ def test_factory_returns_augmented_builder_for_fanin_branching():
     for g in dags:
         BranchingValidator.assert_valid(g, "probabilistic")
         assert any(a.get("node_type") == "v_ent" for _, a in g.nodes(data=True))
+
+
+def test_augmented_builder_counts_clean_build_once():
+    raw = _fanin_branching_config()
+    ConfigValidator(raw).validate()
+    cfg = Config(raw)
+    cfg.optimize()
+    builder = DAGBuilderFactory.create_instance(cfg)
+    builder.build_dag(cfg.create_structure_rng(0))
+    assert builder._augmentor.num_tries == 1  # no unit retries
+    assert builder.num_tries == 1
+
+
+def test_chain_branching_keeps_chain_based_dag():
+    from src.dag_builder import ChainBasedDAG
+    from src.common import Util
+
+    raw = _chain_branching_config()
+    ConfigValidator(raw).validate()
+    cfg = Config(raw)
+    cfg.optimize()
+    cfg.set_random_seed()
+    builder = DAGBuilderFactory.create_instance(cfg)
+    for g in builder.build():
+        assert isinstance(g, ChainBasedDAG)
+        chain_nodes = [n for chain in g.chains for n in chain.nodes]
+        assert sorted(chain_nodes) == sorted(Util.regular_nodes(g))
+        assert all(g.in_degree(head) == 0 for head in g.chain_heads)
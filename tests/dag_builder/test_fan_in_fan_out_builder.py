@@ -6,6 +6,7 @@ import pytest
 from src.common import Util
 from src.config import Config
 from src.dag_builder import DAGBuilderFactory
+from src.dag_builder.fan_in_fan_out_builder import _OutDegreeIndex
 from src.exceptions import BuildFailedError, InfeasibleConfigError
 
 
@@ -134,3 +135,19 @@ class TestFanInFanOutBuilder:
                 assert len(Util.get_source_nodes(dag)) == number_of_source_nodes
         except BuildFailedError:
             return 0
+
+    def test_out_degree_index(self):
+        out_degree_index = _OutDegreeIndex(max_out=2)
+        for node_i in range(4):
+            out_degree_index.add_node(node_i)
+        out_degree_index.add_out_edges(0, 2)
+        out_degree_index.add_out_edges(1)
+        out_degree_index.add_out_edges(2)
+
+        assert out_degree_index.get_min_out_node() == (3, 0)
+        out_degree_index.add_out_edges(3)
+        assert out_degree_index.get_min_out_node() == (1, 1)
+        assert sorted(out_degree_index.sample_spare_nodes(5, random.Random(0))) == [1, 2, 3]
+        out_degree_index.add_out_edges(2)
+        assert sorted(out_degree_index.sample_spare_nodes(5, random.Random(0))) == [1, 3]
+        assert len(out_degree_index.sample_spare_nodes(1, random.Random(0))) == 1
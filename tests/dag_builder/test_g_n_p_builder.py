@@ -5,7 +5,7 @@ import numpy as np
 import pytest
 
 from src.config import Config
-from src.dag_builder import DAGBuilderFactory
+from src.dag_builder import DAGBuilderFactory, GNPBuilder
 from src.exceptions import BuildFailedError, InfeasibleConfigError
 
 
@@ -64,3 +64,47 @@ class TestGNPBuilder:
                 assert nx.is_directed_acyclic_graph(dag)
         except BuildFailedError:
             return 0
+
+    @pytest.mark.parametrize("prob_edge", [0.0, 0.125, 0.305, 1.0, 1.1])
+    def test_add_random_edges_exact_probability(self, prob_edge):
+        num_nodes = 1000
+        G = nx.DiGraph()
+        G.add_nodes_from(range(num_nodes))
+        GNPBuilder._add_random_edges(G, num_nodes, prob_edge, np.random.default_rng(0))
+
+        assert all(i < j for i, j in G.edges())
+        num_pairs = num_nodes * (num_nodes - 1) // 2
+        prob_edge = min(prob_edge, 1.0)
+        expected = prob_edge * num_pairs
+        assert abs(G.number_of_edges() - expected) <= 4 * np.sqrt(
+            num_pairs * prob_edge * (1 - prob_edge)
+        )
+
+    @pytest.mark.parametrize("num_nodes", [0, 1, 2, 3, 10, 2001])
+    def test_pair_index_to_edge(self, num_nodes):
+        src, dst = GNPBuilder._pair_index_to_edge(
+            np.arange(num_nodes * (num_nodes - 1) // 2), num_nodes
+        )
+        expected_src, expected_dst = np.triu_indices(num_nodes, k=1)
+
+        assert src.tolist() == expected_src.tolist()
+        assert dst.tolist() == expected_dst.tolist()
+
+    def test_add_random_edges_sparse(self):
+        num_nodes, prob_edge, num_samples = 20, 0.3, 2000
+        assert num_nodes * prob_edge <= GNPBuilder.SPARSE_EXPECTED_DEGREE
+
+        np_rng = np.random.default_rng(0)
+        frequency = np.zeros((num_nodes, num_nodes))
+        for _ in range(num_samples):
+            G = nx.DiGraph()
+            G.add_nodes_from(range(num_nodes))
+            GNPBuilder._add_random_edges(G, num_nodes, prob_edge, np_rng)
+            frequency += nx.to_numpy_array(G, nodelist=range(num_nodes))
+        frequency /= num_samples
+
+        # Each pair i < j has an edge with probability 'prob_edge'.
+        upper = np.triu_indices(num_nodes, k=1)
+        sigma = np.sqrt(prob_edge * (1 - prob_edge) / num_samples)
+        assert np.all(np.abs(frequency[upper] - prob_edge) <= 5 * sigma)
+        assert np.all(np.tril(frequency) == 0)
@@ -0,0 +1,55 @@
+from src.generation import BuildStats
+
+
+class TestBuildStats:
+    def test_expected_builds_per_success(self):
+        build_stats = BuildStats(100)
+        assert build_stats.expected_builds_per_success is None
+
+        build_stats.add(3, True)
+        build_stats.add(1, True)
+        build_stats.add(100, False)
+        assert build_stats.expected_builds_per_success == 52
+        assert build_stats.to_dict() == {
+            "dags": 3,
+            "failures": 1,
+            "attempts": 104,
+            "skipped": 0,
+            "expected_builds_per_success": 52,
+        }
+
+    def test_skip_infeasible(self):
+        build_stats = BuildStats(100, min_success_rate=0.5)
+        num_failures = 0
+        while not build_stats.skip():
+            build_stats.add(100, False)
+            num_failures += 1
+
+        # One failed DAG is not enough evidence, but a few are.
+        assert 1 < num_failures < 10
+        assert build_stats.skip()
+        assert build_stats.num_skipped == 2
+
+    def test_not_skip_feasible(self):
+        build_stats = BuildStats(100, min_success_rate=0.5)
+        for _ in range(50):
+            build_stats.add(2, True)
+        build_stats.add(100, False)
+        assert not build_stats.skip()
+
+        build_stats = BuildStats(100)
+        for _ in range(50):
+            build_stats.add(100, False)
+        assert not build_stats.skip()
+
+    def test_merge(self):
+        build_stats = BuildStats(100)
+        build_stats.add(4, True)
+        other = BuildStats(100)
+        other.add(100, False)
+        other.add(2, True)
+        build_stats.merge(other.to_dict())
+
+        assert build_stats.to_dict()["dags"] == 3
+        assert build_stats.to_dict()["failures"] == 1
+        assert build_stats.expected_builds_per_success == 53
@@ -0,0 +1,93 @@
+import networkx as nx
+import pytest
+
+from src.dag_exporter import DAGExporter
+from src.generation import CostEstimator
+
+
+def get_config_raw(number_of_dags: int = 4, deadline: bool = False) -> dict:
+    config_raw = {
+        "Seed": 0,
+        "Number of DAGs": number_of_dags,
+        "Graph structure": {
+            "Generation method": "G(n, p)",
+            "Number of nodes": {"Combination": [8, 10]},
+            "Probability of edge existence": {"Fixed": 0.3},
+            "Number of source nodes": {"Fixed": 1},
+            "Number of sink nodes": {"Fixed": 1},
+            "Ensure weakly connected": True,
+        },
+        "Properties": {"Execution time": {"Random": [1, 2, 3]}},
+        "Output formats": {
+            "Naming of combination directory": "Abbreviation",
+            "DAG": {"YAML": True, "JSON": True},
+        },
+    }
+    if deadline:
+        config_raw["Properties"]["End-to-end deadline"] = {
+            "Ratio of deadline to critical path": {"Fixed": 1.0}
+        }
+
+    return config_raw
+
+
+class TestCostEstimator:
+    def test_estimate(self):
+        estimate = CostEstimator(get_config_raw(), num_samples=2).estimate(max_workers=2)
+
+        total = estimate["total"]
+        assert total["number_of_combinations"] == 2
+        assert total["number_of_dags"] == 8
+        assert total["nodes"] == 4 * 8 + 4 * 10
+        assert total["edges"] > 0
+        assert total["wall_time"] == total["serial_time"] / 2
+        assert set(total["disk"]) == {"json", "yaml"}
+        assert total["peak_memory"] > 0
+        assert list(estimate["combinations"]) == ["NN_8", "NN_10"]
+        assert estimate["warnings"] == []
+
+    def test_estimate_scales_with_number_of_dags(self):
+        small = CostEstimator(get_config_raw(4), num_samples=2).estimate()
+        large = CostEstimator(get_config_raw(40), num_samples=2).estimate()
+
+        assert large["total"]["nodes"] == 10 * small["total"]["nodes"]
+        assert large["total"]["edges"] == 10 * small["total"]["edges"]
+        for ext in ["json", "yaml"]:
+            assert abs(large["total"]["disk"][ext] - 10 * small["total"]["disk"][ext]) <= 10
+
+    def test_estimate_pathological_deadline(self, monkeypatch):
+        monkeypatch.setattr(CostEstimator, "PATH_LIMIT", 1)
+        estimate = CostEstimator(get_config_raw(deadline=True), num_samples=2).estimate()
+
+        assert estimate["total"]["serial_time"] is None
+        assert estimate["total"]["disk"] is None
+        assert all(c["max_paths_per_dag"] > 1 for c in estimate["combinations"].values())
+        assert len(estimate["warnings"]) == 2
+        assert all("End-to-end deadline" in w for w in estimate["warnings"])
+
+    def test_estimate_export_error(self, monkeypatch):
+        def export(self, dag, dest_dir, file_name):
+            raise OSError("dot not found")
+
+        monkeypatch.setattr(DAGExporter, "export", export)
+        estimate = CostEstimator(get_config_raw(), num_samples=1).estimate()
+
+        assert estimate["total"]["disk"] == {}
+        assert all("dot not found" in w for w in estimate["warnings"])
+
+    def test_estimate_export_bug(self, monkeypatch):
+        def export(self, dag, dest_dir, file_name):
+            raise KeyError("execution_time")
+
+        monkeypatch.setattr(DAGExporter, "export", export)
+        with pytest.raises(KeyError):
+            CostEstimator(get_config_raw(), num_samples=1).estimate()
+
+    def test_count_paths(self):
+        # Two diamonds in series.
+        dag = nx.DiGraph([(0, 1), (0, 2), (1, 3), (2, 3), (3, 4), (3, 5), (4, 6), (5, 6)])
+
+        assert CostEstimator._count_source_to_sink_paths(dag) == len(
+            list(nx.all_simple_paths(dag, 0, 6))
+        )
+        assert CostEstimator._count_pathways(dag) == 4 + 2 + 2 + 2 + 1 + 1 + 1
@@ -0,0 +1,142 @@
+import os
+
+import networkx as nx
+import yaml
+
+from src.config import Config
+from src.dag_builder import GNPBuilder
+from src.exceptions import BuildFailedError
+from src.generation import DAGSetGenerator, StructureCache
+
+
+def get_config(number_of_dags: int = 3) -> Config:
+    config_raw = {
+        "Seed": 0,
+        "Number of DAGs": number_of_dags,
+        "Graph structure": {
+            "Generation method": "G(n, p)",
+            "Number of nodes": 10,
+            "Probability of edge existence": 0.3,
+            "Number of source nodes": 1,
+            "Number of sink nodes": 1,
+            "Ensure weakly connected": True,
+        },
+        "Properties": {
+            "Execution time": [1, 2, 3],
+        },
+        "Output formats": {
+            "Naming of combination directory": "Abbreviation",
+            "DAG": {"YAML": True},
+        },
+    }
+    return Config(config_raw)
+
+
+class TestDAGSetGenerator:
+    def test_export(self, tmp_path):
+        config = get_config()
+        DAGSetGenerator(config).export(str(tmp_path))
+
+        assert sorted(os.listdir(tmp_path)) == ["dag_0.yaml", "dag_1.yaml", "dag_2.yaml"]
+        for file_name in os.listdir(tmp_path):
+            with open(tmp_path / file_name) as f:
+                dag = yaml.safe_load(f)
+            for node in dag["nodes"]:
+                assert node["execution_time"] in [1, 2, 3]
+
+    def test_export_dag_indices(self, tmp_path):
+        config = get_config(number_of_dags=5)
+        DAGSetGenerator(config).export(str(tmp_path), range(3, 5))
+        DAGSetGenerator(config).export(str(tmp_path), range(0, 3))
+
+        assert sorted(os.listdir(tmp_path)) == [f"dag_{i}.yaml" for i in range(5)]
+
+    def test_export_pipeline(self, tmp_path):
+        config = get_config(number_of_dags=6)
+        (tmp_path / "serial").mkdir()
+        (tmp_path / "pipeline").mkdir()
+        serial = DAGSetGenerator(config).export(str(tmp_path / "serial"))
+        pipelined = DAGSetGenerator(config, [2, 2, 2], queue_size=1).export(
+            str(tmp_path / "pipeline")
+        )
+
+        assert serial == pipelined == {i: [f"dag_{i}.yaml"] for i in range(6)}
+        for i in range(6):
+            with open(tmp_path / "serial" / f"dag_{i}.yaml") as f, open(
+                tmp_path / "pipeline" / f"dag_{i}.yaml"
+            ) as g:
+                assert f.read() == g.read()
+
+    def test_export_structure_cache(self, tmp_path):
+        config = get_config()
+        other_config = get_config()
+        other_config.combination_index = 1
+        other_config.execution_time = [10, 20, 30]
+        structure_cache = StructureCache({i: 2 for i in range(3)})
+        for dest, combo_config in [("first", config), ("second", other_config)]:
+            (tmp_path / dest).mkdir()
+            DAGSetGenerator(combo_config, structure_cache=structure_cache).export(
+                str(tmp_path / dest)
+            )
+
+        for i in range(3):
+            with open(tmp_path / "first" / f"dag_{i}.yaml") as f:
+                first = yaml.safe_load(f)
+            with open(tmp_path / "second" / f"dag_{i}.yaml") as f:
+                second = yaml.safe_load(f)
+            assert first["edges"] == second["edges"]
+            assert all(node["execution_time"] >= 10 for node in second["nodes"])
+        assert list(DAGSetGenerator(config).generate(0).edges) == list(
+            DAGSetGenerator(other_config).generate(0).edges
+        )
+
+    def test_export_structure_cache_build_stats(self, tmp_path):
+        config = get_config()
+        other_config = get_config()
+        other_config.combination_index = 1
+        other_config.execution_time = [10, 20, 30]
+        structure_cache = StructureCache({i: 2 for i in range(3)})
+        all_build_stats = []
+        for dest, combo_config in [("first", config), ("second", other_config)]:
+            (tmp_path / dest).mkdir()
+            dag_set_generator = DAGSetGenerator(combo_config, structure_cache=structure_cache)
+            dag_set_generator.export(str(tmp_path / dest))
+            all_build_stats.append(dag_set_generator.build_stats.to_dict())
+
+        assert all_build_stats[0]["dags"] == 3
+        assert all_build_stats[0] == all_build_stats[1]
+
+    def test_create_all_setter(self):
+        config = get_config()
+        assert len(DAGSetGenerator._create_all_setter(config)) == 1
+
+    def test_generate_independent_of_order(self):
+        config = get_config(number_of_dags=5)
+        forward = [DAGSetGenerator(config).generate(i) for i in range(5)]
+        backward = [DAGSetGenerator(config).generate(i) for i in reversed(range(5))]
+        for dag, other in zip(forward, reversed(backward)):
+            assert nx.utils.graphs_equal(dag, other)
+
+    def test_generate_keyed_by_combination_index(self):
+        config = get_config()
+        dag = DAGSetGenerator(config).generate(0)
+        config.combination_index = 1
+        assert not nx.utils.graphs_equal(dag, DAGSetGenerator(config).generate(0))
+
+    def test_export_skips_infeasible_combination(self, tmp_path, monkeypatch):
+        def build_dag(self, rng):
+            self.num_tries = self.max_try
+            raise BuildFailedError("A DAG could not be built.")
+
+        monkeypatch.setattr(GNPBuilder, "build_dag", build_dag)
+        dag_set_generator = DAGSetGenerator(get_config(30), min_success_rate=0.5)
+        exported = dag_set_generator.export(str(tmp_path))
+
+        build_stats = dag_set_generator.build_stats.to_dict()
+        assert [i for i, files in exported.items() if files == []] == list(
+            range(build_stats["dags"])
+        )
+        assert all(exported[i] is None for i in range(build_stats["dags"], 30))
+        assert build_stats["skipped"] > 0
+        assert build_stats["dags"] + build_stats["skipped"] == 30
+        assert build_stats["expected_builds_per_success"] is None
@@ -0,0 +1,51 @@
+from src.generation import Manifest, Shard
+
+
+def create_manifest(dest_dir, shard=None):
+    (dest_dir / "NN_8").mkdir(exist_ok=True)
+    (dest_dir / "NN_8" / "dag_0.yaml").write_text("dag_0")
+    (dest_dir / "NN_8" / "dag_1.yaml").write_text("dag_1")
+    manifest = Manifest(str(dest_dir), shard)
+    manifest.add(
+        Manifest.create_records(
+            str(dest_dir / "NN_8"), {0: ["dag_0.yaml"], 1: ["dag_1.yaml"], 2: [], 3: None}
+        )
+    )
+    return manifest
+
+
+class TestManifest:
+    def test_load(self, tmp_path):
+        create_manifest(tmp_path)
+        manifest = Manifest(str(tmp_path))
+        manifest.load()
+        assert manifest.is_finished("NN_8", 0)
+        assert manifest.is_finished("NN_8", 1)
+        assert manifest.is_finished("NN_8", 2)  # failed to build
+        assert not manifest.is_finished("NN_8", 3)  # skipped
+        assert not manifest.is_finished("NN_8", 4)
+        assert not manifest.is_finished("NN_10", 0)
+
+    def test_load_shard_manifests(self, tmp_path):
+        create_manifest(tmp_path, Shard(1, 2))
+        assert (tmp_path / "manifest_1_2.jsonl").is_file()
+        manifest = Manifest(str(tmp_path), Shard(0, 2))
+        manifest.load()
+        assert manifest.is_finished("NN_8", 0)
+
+    def test_load_ignores_incomplete_line(self, tmp_path):
+        create_manifest(tmp_path)
+        with open(tmp_path / "manifest.jsonl", "a") as f:
+            f.write('{"combination": "NN_8", "da')
+        manifest = Manifest(str(tmp_path))
+        manifest.load()
+        assert manifest.is_finished("NN_8", 0)
+
+    def test_is_finished_changed_file(self, tmp_path):
+        create_manifest(tmp_path)
+        (tmp_path / "NN_8" / "dag_0.yaml").write_text("broken")
+        (tmp_path / "NN_8" / "dag_1.yaml").unlink()
+        manifest = Manifest(str(tmp_path))
+        manifest.load()
+        assert not manifest.is_finished("NN_8", 0)
+        assert not manifest.is_finished("NN_8", 1)
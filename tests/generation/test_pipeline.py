@@ -0,0 +1,57 @@
+import threading
+import time
+
+import pytest
+
+from src.generation.pipeline import Pipeline
+
+
+class TestPipeline:
+    @pytest.mark.parametrize("num_workers", [1, 3])
+    def test_run(self, num_workers):
+        pipeline = Pipeline(
+            [(lambda x: x + 1, num_workers), (lambda x: x * 2, num_workers), (str, 1)],
+            queue_size=2,
+        )
+        assert sorted(pipeline.run(range(20)), key=int) == [str((i + 1) * 2) for i in range(20)]
+
+    def test_run_empty(self):
+        assert Pipeline([(str, 2)]).run([]) == []
+
+    def test_backpressure(self):
+        lock = threading.Lock()
+        num_unconsumed = 0
+        max_unconsumed = 0
+
+        def produce(x):
+            nonlocal num_unconsumed, max_unconsumed
+            with lock:
+                num_unconsumed += 1
+                max_unconsumed = max(max_unconsumed, num_unconsumed)
+            return x
+
+        def consume(x):
+            nonlocal num_unconsumed
+            time.sleep(0.005)
+            with lock:
+                num_unconsumed -= 1
+            return x
+
+        Pipeline([(produce, 1), (consume, 1)], queue_size=2).run(range(30))
+        # One being consumed, queue_size waiting and one blocked in put().
+        assert max_unconsumed <= 1 + 2 + 1
+
+    def test_run_raises(self):
+        def fail(x):
+            if x == 5:
+                raise ValueError(x)
+            return x
+
+        with pytest.raises(ValueError):
+            Pipeline([(fail, 2), (str, 2)], queue_size=1).run(range(100))
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            Pipeline([(str, 0)])
+        with pytest.raises(ValueError):
+            Pipeline([(str, 1)], queue_size=0)
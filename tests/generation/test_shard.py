@@ -0,0 +1,130 @@
+import json
+import os
+
+import pytest
+
+from src.generation import Shard, ShardMerger
+
+
+def get_config_raw(number_of_dags: int = 3) -> dict:
+    return {
+        "Seed": 0,
+        "Number of DAGs": number_of_dags,
+        "Graph structure": {
+            "Generation method": "G(n, p)",
+            "Number of nodes": {"Combination": [8, 10]},
+            "Probability of edge existence": {"Fixed": 0.3},
+            "Number of source nodes": {"Fixed": 1},
+            "Number of sink nodes": {"Fixed": 1},
+            "Ensure weakly connected": True,
+        },
+        "Properties": {"Execution time": {"Fixed": 1}},
+        "Output formats": {
+            "Naming of combination directory": "Abbreviation",
+            "DAG": {"YAML": True},
+        },
+    }
+
+
+def create_output(dest_dir, combo_dir_names, dag_indices):
+    for combo_dir_name in combo_dir_names:
+        os.makedirs(dest_dir / combo_dir_name, exist_ok=True)
+        (dest_dir / combo_dir_name / "combination_log.yaml").write_text("")
+        for i in dag_indices:
+            (dest_dir / combo_dir_name / f"dag_{i}.yaml").write_text("")
+
+
+class TestShard:
+    def test_parse(self):
+        shard = Shard.parse("1/4")
+        assert (shard.index, shard.count) == (1, 4)
+
+    @pytest.mark.parametrize("spec", ["4/4", "-1/4", "1/0", "1", "a/b"])
+    def test_parse_invalid(self, spec):
+        with pytest.raises(ValueError):
+            Shard.parse(spec)
+
+    @pytest.mark.parametrize("count", [1, 2, 3, 7, 20])
+    def test_get_dag_indices_partition(self, count):
+        number_of_dags = 5
+        assigned = []
+        for index in range(count):
+            shard = Shard(index, count)
+            for combination_index in range(3):
+                for dag_index in shard.get_dag_indices(combination_index, number_of_dags):
+                    assigned.append((combination_index, dag_index))
+
+        assert sorted(assigned) == [(c, d) for c in range(3) for d in range(number_of_dags)]
+
+    def test_get_dag_indices_balanced(self):
+        sizes = [
+            sum(len(Shard(index, 4).get_dag_indices(c, 3)) for c in range(3))
+            for index in range(4)
+        ]
+        assert max(sizes) - min(sizes) <= 1
+
+
+class TestShardMerger:
+    def test_verify(self, tmp_path):
+        merger = ShardMerger(get_config_raw())
+        create_output(tmp_path, ["NN_8", "NN_10"], range(3))
+        assert merger.verify(str(tmp_path)) == []
+
+    def test_verify_missing(self, tmp_path):
+        merger = ShardMerger(get_config_raw())
+        create_output(tmp_path, ["NN_8", "NN_10"], range(3))
+        os.remove(tmp_path / "NN_10" / "dag_1.yaml")
+        assert merger.verify(str(tmp_path)) == [f"dag_1 of {tmp_path}/NN_10 not found."]
+
+    def test_verify_duplicated(self, tmp_path):
+        merger = ShardMerger(get_config_raw())
+        create_output(tmp_path, ["NN_8", "NN_10"], range(3))
+        (tmp_path / "NN_8" / "dag_01.yaml").write_text("")
+        assert merger.verify(str(tmp_path)) == [f"dag_1 of {tmp_path}/NN_8 exists more than once."]
+
+    def test_merge(self, tmp_path):
+        merger = ShardMerger(get_config_raw())
+        create_output(tmp_path / "shard_0", ["NN_8", "NN_10"], [0, 2])
+        create_output(tmp_path / "shard_1", ["NN_8", "NN_10"], [1])
+        merger.merge([str(tmp_path / "shard_0"), str(tmp_path / "shard_1")], str(tmp_path / "all"))
+        assert merger.verify(str(tmp_path / "all")) == []
+
+    def test_merge_overlapped(self, tmp_path):
+        merger = ShardMerger(get_config_raw())
+        create_output(tmp_path / "shard_0", ["NN_8", "NN_10"], [0, 1])
+        create_output(tmp_path / "shard_1", ["NN_8", "NN_10"], [1, 2])
+        with pytest.raises(FileExistsError):
+            merger.merge(
+                [str(tmp_path / "shard_0"), str(tmp_path / "shard_1")], str(tmp_path / "all")
+            )
+
+    def test_merge_combines_instrumentation(self, tmp_path):
+        merger = ShardMerger(get_config_raw())
+        create_output(tmp_path / "shard_0", ["NN_8", "NN_10"], [0, 2])
+        create_output(tmp_path / "shard_1", ["NN_8", "NN_10"], [1])
+        for shard_i, num_dags in [(0, 2), (1, 1)]:
+            summary = {
+                "counters": {"dags": num_dags},
+                "build": {"dags": num_dags, "failures": 0, "attempts": num_dags, "skipped": 0},
+            }
+            (tmp_path / f"shard_{shard_i}" / "NN_8" / "instrumentation.json").write_text(
+                json.dumps(summary)
+            )
+        merger.merge([str(tmp_path / "shard_0"), str(tmp_path / "shard_1")], str(tmp_path / "all"))
+
+        with open(tmp_path / "all" / "NN_8" / "instrumentation.json") as f:
+            summary = json.load(f)
+        assert summary["counters"] == {"dags": 3}
+        assert summary["build"]["dags"] == 3
+        assert merger.verify(str(tmp_path / "all")) == []
+
+    def test_merge_conflicting_side_file(self, tmp_path):
+        merger = ShardMerger(get_config_raw())
+        create_output(tmp_path / "shard_0", ["NN_8", "NN_10"], [0, 2])
+        create_output(tmp_path / "shard_1", ["NN_8", "NN_10"], [1])
+        (tmp_path / "shard_1" / "NN_8" / "combination_log.yaml").write_text("other")
+        with pytest.raises(FileExistsError):
+            merger.merge(
+                [str(tmp_path / "shard_0"), str(tmp_path / "shard_1")], str(tmp_path / "all")
+            )
+        assert not (tmp_path / "all").exists()
@@ -0,0 +1,68 @@
+import itertools
+import os
+
+import networkx as nx
+import pytest
+from schema import SchemaError
+
+from src import generate
+from src.config import ComboGenerator
+from src.generation import DAGSetGenerator
+
+
+def get_config_raw(number_of_dags: int = 3) -> dict:
+    return {
+        "Seed": 0,
+        "Number of DAGs": number_of_dags,
+        "Graph structure": {
+            "Generation method": "G(n, p)",
+            "Number of nodes": {"Combination": [8, 10]},
+            "Probability of edge existence": {"Fixed": 0.3},
+            "Number of source nodes": {"Fixed": 1},
+            "Number of sink nodes": {"Fixed": 1},
+            "Ensure weakly connected": True,
+        },
+        "Properties": {"Execution time": {"Random": [1, 2, 3]}},
+        "Output formats": {
+            "Naming of combination directory": "Abbreviation",
+            "DAG": {"YAML": True},
+        },
+    }
+
+
+class TestGenerate:
+    def test_generate_raw_config(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        results = list(generate(get_config_raw()))
+
+        assert [(log, i) for log, i, _ in results] == [
+            ({"Number of nodes": n}, i) for n in [8, 10] for i in range(3)
+        ]
+        for log, _, dag in results:
+            assert dag.number_of_nodes() == log["Number of nodes"]
+            assert all(dag.nodes[v]["execution_time"] in [1, 2, 3] for v in dag.nodes)
+        assert os.listdir(tmp_path) == []
+
+    def test_generate_matches_dag_set_generator(self):
+        config_raw = get_config_raw()
+        _, _, combo_config = list(ComboGenerator(config_raw).get_combo_iter())[1]
+        expected = DAGSetGenerator(combo_config).generate(2)
+
+        _, _, dag = list(generate(config_raw))[5]
+        assert nx.utils.graphs_equal(dag, expected)
+        assert dict(dag.nodes(data=True)) == dict(expected.nodes(data=True))
+
+    def test_generate_config(self):
+        _, _, combo_config = next(ComboGenerator(get_config_raw()).get_combo_iter())
+        results = list(generate(combo_config))
+        assert [(log, i) for log, i, _ in results] == [({}, i) for i in range(3)]
+
+    def test_generate_lazily(self):
+        results = list(itertools.islice(generate(get_config_raw(number_of_dags=10**9)), 2))
+        assert [i for _, i, _ in results] == [0, 1]
+
+    def test_generate_invalid_config(self):
+        config_raw = get_config_raw()
+        del config_raw["Seed"]
+        with pytest.raises(SchemaError):
+            next(generate(config_raw))
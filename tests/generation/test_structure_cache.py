@@ -0,0 +1,43 @@
+import networkx as nx
+
+from src.generation import StructureCache
+
+
+class TestStructureCache:
+    def test_get(self):
+        num_builds = []
+
+        def build():
+            num_builds.append(1)
+            return nx.DiGraph([(0, 1)]), 2
+
+        cache = StructureCache({0: 3})
+        first, _ = cache.get(0, build)
+        first.add_edge(1, 2)
+        second, _ = cache.get(0, build)
+        last, num_tries = cache.get(0, build)
+
+        assert len(num_builds) == 1
+        assert num_tries == 2
+        assert list(second.edges) == list(last.edges) == [(0, 1)]
+        assert second is not last
+        assert cache._structures == {} and cache._num_uses == {}
+
+    def test_get_failed(self):
+        cache = StructureCache({0: 2})
+        assert cache.get(0, lambda: (None, 3)) == (None, 3)
+        assert cache.get(0, lambda: (nx.DiGraph(), 1)) == (None, 3)
+
+    def test_get_unknown_index(self):
+        cache = StructureCache({})
+        assert cache.get(0, lambda: (nx.DiGraph([(0, 1)]), 1))[0] is not None
+        assert cache._structures == {}
+
+    def test_release(self):
+        cache = StructureCache({0: 2, 1: 2})
+        cache.get(0, lambda: (nx.DiGraph([(0, 1)]), 1))
+        cache.release(0)
+        cache.release(1)
+        assert cache._structures == {} and cache._num_uses == {1: 1}
+        assert cache.get(1, lambda: (nx.DiGraph([(0, 1)]), 1))[0] is not None
+        assert cache._structures == {} and cache._num_uses == {}
@@ -0,0 +1,205 @@
+import json
+import os
+import subprocess
+import sys
+
+import yaml
+
+RDGEN_ROOT = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", "..")
+)
+
+YAML_BODY = """\
+Seed: 0
+Number of DAGs: 3
+
+Graph structure:
+  Generation method: "G(n, p)"
+  Number of nodes: { Combination: [8, 10] }
+  Probability of edge existence: { Combination: [0.2, 0.4] }
+  Number of source nodes: { Fixed: 1 }
+  Number of sink nodes: { Fixed: 1 }
+  Ensure weakly connected: True
+
+Properties:
+  Execution time: { Random: "(1, 10, 1)" }
+
+Output formats:
+  Naming of combination directory: "Abbreviation"
+  DAG:
+    YAML: True
+"""
+
+
+def _read_outputs(dest):
+    outputs = {}
+    for root, _, files in os.walk(dest):
+        for fn in files:
+            if fn.startswith("manifest"):
+                continue
+            path = os.path.join(root, fn)
+            with open(path) as f:
+                outputs[os.path.relpath(path, dest)] = f.read()
+    return outputs
+
+
+def _run(cfg_path, dest, *options):
+    subprocess.run(
+        [sys.executable, "run_generator.py", "-c", str(cfg_path), "-d", str(dest), *options],
+        cwd=RDGEN_ROOT, check=True, timeout=60,
+    )
+
+
+def test_process_executor_matches_thread_executor(tmp_path):
+    cfg_path = tmp_path / "executor.yaml"
+    cfg_path.write_text(YAML_BODY)
+    thread_dest = tmp_path / "thread"
+    process_dest = tmp_path / "process"
+    _run(cfg_path, thread_dest, "-e", "thread", "-w", "4")
+    _run(cfg_path, process_dest, "-e", "process", "-w", "2", "--chunksize", "1")
+
+    thread_outputs = _read_outputs(thread_dest)
+    assert len(thread_outputs) == 4 * (3 + 1)  # DAGs and combination log per combination
+    assert thread_outputs == _read_outputs(process_dest)
+
+
+def test_dag_chunks_match_whole_combination(tmp_path):
+    cfg_path = tmp_path / "executor.yaml"
+    cfg_path.write_text(YAML_BODY)
+    whole_dest = tmp_path / "whole"
+    chunked_dest = tmp_path / "chunked"
+    _run(cfg_path, whole_dest, "-w", "1", "--dag_chunk_size", "3")
+    _run(cfg_path, chunked_dest, "-e", "process", "-w", "3", "--dag_chunk_size", "1")
+
+    assert _read_outputs(whole_dest) == _read_outputs(chunked_dest)
+
+
+def test_shards_match_whole_generation(tmp_path):
+    cfg_path = tmp_path / "executor.yaml"
+    cfg_path.write_text(YAML_BODY)
+    whole_dest = tmp_path / "whole"
+    shared_dest = tmp_path / "shared"
+    merged_dest = tmp_path / "merged"
+    _run(cfg_path, whole_dest, "-w", "2")
+    for k in range(5):
+        _run(cfg_path, shared_dest, "-w", "2", "--shard", f"{k}/5")
+        _run(cfg_path, tmp_path / f"shard_{k}", "-w", "2", "--shard", f"{k}/5")
+    _run(cfg_path, shared_dest, "--verify")
+    _run(cfg_path, merged_dest, "--merge", *[str(tmp_path / f"shard_{k}") for k in range(5)])
+
+    assert _read_outputs(whole_dest) == _read_outputs(shared_dest)
+    assert _read_outputs(whole_dest) == _read_outputs(merged_dest)
+
+
+def test_verify_detects_missing_dag(tmp_path):
+    cfg_path = tmp_path / "executor.yaml"
+    cfg_path.write_text(YAML_BODY)
+    dest = tmp_path / "shard"
+    _run(cfg_path, dest, "-w", "2", "--shard", "0/2")
+    result = subprocess.run(
+        [sys.executable, "run_generator.py", "-c", str(cfg_path), "-d", str(dest), "--verify"],
+        cwd=RDGEN_ROOT, timeout=60,
+    )
+    assert result.returncode == 1
+
+
+def test_resume_matches_uninterrupted_generation(tmp_path):
+    cfg_path = tmp_path / "executor.yaml"
+    cfg_path.write_text(YAML_BODY)
+    whole_dest = tmp_path / "whole"
+    resumed_dest = tmp_path / "resumed"
+    _run(cfg_path, whole_dest, "-w", "2")
+    _run(cfg_path, resumed_dest, "-w", "2", "--dag_chunk_size", "1")
+
+    # Simulate an interruption: the last record is cut off, a file is lost and another is broken.
+    manifest_path = resumed_dest / "manifest.jsonl"
+    lines = manifest_path.read_text().splitlines(keepends=True)
+    last = json.loads(lines[-1])
+    manifest_path.write_text("".join(lines[:-1]) + lines[-1][:10])
+    (resumed_dest / last["combination"] / f"dag_{last['dag']}.yaml").write_text("broken")
+    first = json.loads(lines[0])
+    (resumed_dest / first["combination"] / f"dag_{first['dag']}.yaml").unlink()
+    second = json.loads(lines[1])
+    (resumed_dest / second["combination"] / f"dag_{second['dag']}.yaml").write_text("broken")
+
+    _run(cfg_path, resumed_dest, "-w", "2", "--resume")
+
+    assert _read_outputs(whole_dest) == _read_outputs(resumed_dest)
+
+
+def test_stage_pipeline_matches_serial_generation(tmp_path):
+    cfg_path = tmp_path / "executor.yaml"
+    cfg_path.write_text(YAML_BODY)
+    serial_dest = tmp_path / "serial"
+    pipeline_dest = tmp_path / "pipeline"
+    _run(cfg_path, serial_dest, "-w", "2")
+    _run(cfg_path, pipeline_dest, "-w", "2", "--stage_workers", "2", "1", "2", "--queue_size", "2")
+
+    assert _read_outputs(serial_dest) == _read_outputs(pipeline_dest)
+
+
+PROPERTY_SWEEP_YAML_BODY = YAML_BODY.replace(
+    'Execution time: { Random: "(1, 10, 1)" }',
+    'Execution time: { Combination: [1, 5, 9] }',
+)
+
+
+def test_property_only_combinations_share_structures(tmp_path):
+    cfg_path = tmp_path / "property_sweep.yaml"
+    cfg_path.write_text(PROPERTY_SWEEP_YAML_BODY)
+    grouped_dest = tmp_path / "grouped"
+    chunked_dest = tmp_path / "chunked"
+    _run(cfg_path, grouped_dest, "-w", "1")
+    _run(cfg_path, chunked_dest, "-e", "process", "-w", "3", "--dag_chunk_size", "1")
+
+    outputs = _read_outputs(grouped_dest)
+    assert len(outputs) == 12 * (3 + 1)
+    assert outputs == _read_outputs(chunked_dest)
+
+    structures = {}
+    for path, text in outputs.items():
+        combo_dir, file_name = os.path.split(path)
+        if file_name == "combination_log.yaml":
+            continue
+        structure_key = combo_dir.split("_ET_")[0]
+        edges = [(e["source"], e["target"]) for e in yaml.safe_load(text)["edges"]]
+        structures.setdefault((structure_key, file_name), []).append(edges)
+    assert len(structures) == 4 * 3
+    for all_edges in structures.values():
+        assert len(all_edges) == 3
+        assert all(edges == all_edges[0] for edges in all_edges)
+
+
+def test_instrumentation_summaries(tmp_path):
+    cfg_path = tmp_path / "executor.yaml"
+    cfg_path.write_text(YAML_BODY)
+    dest = tmp_path / "instrumented"
+    _run(cfg_path, dest, "-e", "process", "-w", "2", "--instrument")
+
+    with open(dest / "instrumentation.json") as f:
+        run_summary = json.load(f)
+    assert run_summary["run"]["number_of_dags"] == 12
+    assert run_summary["counters"]["dags"] == 12
+    assert run_summary["timers"]["stages"]["build"]["calls"] == 12
+    assert run_summary["timers"]["builders"]["GNPBuilder"]["calls"] == 12
+    assert run_summary["timers"]["setters"]["RandomSetter"]["calls"] == 12
+    assert run_summary["timers"]["formats"]["yaml"]["calls"] == 12
+    for combo_dir in os.listdir(dest):
+        if os.path.isdir(dest / combo_dir):
+            with open(dest / combo_dir / "instrumentation.json") as f:
+                assert json.load(f)["counters"]["dags"] == 3
+
+
+def test_dry_run_creates_no_output(tmp_path):
+    cfg_path = tmp_path / "executor.yaml"
+    cfg_path.write_text(YAML_BODY)
+    dest = tmp_path / "dry_run"
+    result = subprocess.run(
+        [sys.executable, "run_generator.py", "-c", str(cfg_path), "-d", str(dest), "--dry_run"],
+        cwd=RDGEN_ROOT, check=True, timeout=60, capture_output=True, text=True,
+    )
+
+    estimate = yaml.safe_load(result.stdout)
+    assert estimate["total"]["number_of_dags"] == 12
+    assert len(estimate["combinations"]) == 4
+    assert not dest.exists()
@@ -45,9 +45,10 @@ Output formats:
 """
 
 
-def test_multi_rate_chain_with_branching_completes(tmp_path):
+@pytest.mark.parametrize("periodic_type", ["Entry", "Chain"])
+def test_multi_rate_chain_with_branching_completes(tmp_path, periodic_type):
     cfg_path = tmp_path / "smoke.yaml"
-    cfg_path.write_text(YAML_BODY)
+    cfg_path.write_text(YAML_BODY.replace("'Entry'", f"'{periodic_type}'"))
     dest = tmp_path / "out"
     subprocess.run(
         ["python", "run_generator.py", "-c", str(cfg_path), "-d", str(dest)],
@@ -80,3 +80,44 @@ def test_no_branching_dag_passes_trivially():
     g.add_edge(0, 1)
     BranchingValidator.assert_valid(g, "deterministic")
     BranchingValidator.assert_valid(g, "probabilistic")
+
+
+def _make_nested_pdag():
+    """Unit 0 whose branch 0 is unit 1 (nodes 2-5) and whose branch 1 is node 6."""
+    g = nx.DiGraph()
+    g.add_node(0, node_type="v_ent", branch_unit_id=0, execution_time=0)
+    g.add_node(1, node_type="v_ext", branch_unit_id=0, execution_time=0)
+    g.add_node(2, node_type="v_ent", branch_unit_id=1, execution_time=0)
+    g.add_node(3, node_type="regular", execution_time=5)
+    g.add_node(4, node_type="regular", execution_time=5)
+    g.add_node(5, node_type="v_ext", branch_unit_id=1, execution_time=0)
+    g.add_node(6, node_type="regular", execution_time=5)
+    g.add_edge(0, 2, branch_id=0, firing_prob=0.5)
+    g.add_edge(0, 6, branch_id=1, firing_prob=0.5)
+    g.add_edge(2, 3, branch_id=0, firing_prob=0.3)
+    g.add_edge(2, 4, branch_id=1, firing_prob=0.7)
+    g.add_edge(3, 5)
+    g.add_edge(4, 5)
+    g.add_edge(5, 1)
+    g.add_edge(6, 1)
+    return g
+
+
+def test_valid_nested_pdag_passes():
+    BranchingValidator.assert_valid(_make_nested_pdag(), "probabilistic")
+
+
+def test_overlap_through_nested_unit_is_rejected():
+    """A vertex of the inner unit reaches branch 1 of the outer unit."""
+    g = _make_nested_pdag()
+    g.add_edge(3, 6)
+    with pytest.raises(BranchingConstraintError):
+        BranchingValidator.assert_valid(g, "probabilistic")
+
+
+def test_overlap_into_nested_unit_is_rejected():
+    """Branch 1 of the outer unit enters the inner unit without its v_ent."""
+    g = _make_nested_pdag()
+    g.add_edge(6, 4)
+    with pytest.raises(BranchingConstraintError):
+        BranchingValidator.assert_valid(g, "probabilistic")